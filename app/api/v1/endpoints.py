@@ -1,12 +1,104 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
-from app.services.extractor import extract_all
+from functools import partial
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from app.api.v1.formats import FormatNotAvailable, negotiate, render
+from app.columnar import columnar_result
+from app.schemas.request_response import AggregateRequest, BatchValidationRequest, TextRequest
+from app.services.aggregation import aggregate_entities
+from app.services.events import ExtractionEventResponse
+from app.services.executor import extraction_executor
+from app.services.extractor import ENTITY_TYPES, extract_columnar
+from app.services.jobs import JobQueueClosed, JobQueueFull, extraction_jobs
+from app.services.streaming import ExtractionStreamResponse
+from app.validators.patterns import validate_batch
 
 router = APIRouter()
 
-class TextRequest(BaseModel):
-    text: str
+
+def _columnar(content, media_type):
+    try:
+        return render(content, media_type)
+    except FormatNotAvailable as exc:
+        raise HTTPException(status_code=406, detail=str(exc))
+
 
 @router.post("/extract")
-def extract(req: TextRequest):
-    return extract_all(req.text)
+async def extract(req: TextRequest, accept: Optional[str] = Header(None)):
+    # Formato columnar (JSON o MessagePack) si el cliente lo pide en Accept
+    media_type = negotiate(accept)
+    if media_type is None:
+        return await extraction_executor.extract(req.text)
+    return _columnar(await extraction_executor.run(extract_columnar, req.text), media_type)
+
+
+@router.post("/extract/aggregate")
+async def extract_aggregate(req: AggregateRequest):
+    # Valores distintos por tipo con su número de apariciones y los top_k
+    return await extraction_executor.run(partial(aggregate_entities, top_k=req.top_k), req.text)
+
+
+@router.post(
+    "/extract/stream",
+    response_class=ExtractionStreamResponse,
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"text/plain": {"schema": {"type": "string"}}},
+    }},
+)
+async def extract_stream():
+    # El cuerpo (texto plano UTF-8) lo lee la respuesta a medida que escanea
+    return ExtractionStreamResponse()
+
+
+@router.post("/extract/events", response_class=ExtractionEventResponse)
+async def extract_events(req: TextRequest):
+    # Server-Sent Events: entidades por tandas y progreso mientras se escanea
+    return ExtractionEventResponse(req.text)
+
+
+@router.post("/extract/jobs", status_code=202)
+def create_extraction_job(req: TextRequest):
+    try:
+        job = extraction_jobs.submit(req.text)
+    except JobQueueClosed as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    except JobQueueFull:
+        raise HTTPException(status_code=503, detail="Demasiados trabajos pendientes",
+                            headers={"Retry-After": "5"})
+    return job.to_dict()
+
+
+@router.get("/extract/jobs/{job_id}")
+def get_extraction_job(job_id: str, accept: Optional[str] = Header(None)):
+    job = extraction_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado o caducado")
+    data = job.to_dict()
+    media_type = negotiate(accept)
+    if media_type is None or "result" not in data:
+        return data
+    data["result"] = columnar_result(data["result"], ENTITY_TYPES)
+    return _columnar(data, media_type)
+
+
+@router.get("/registrations/exists")
+def registration_exists(email: Optional[str] = Query(None), dni: Optional[str] = Query(None)):
+    # La base de datos (SQLAlchemy) solo se importa si se usa
+    from app.db.dedup import DEDUP_FIELDS, get_registration_index
+
+    values = {"email": email, "dni": dni}
+    fields = {field: values[field] for field in DEDUP_FIELDS if values[field]}
+    if not fields:
+        raise HTTPException(status_code=400, detail="Indique email o dni")
+    index = get_registration_index()
+    found = {field: index.exists(field, value) for field, value in fields.items()}
+    return {"exists": any(found.values()), "fields": found}
+
+
+@router.post("/validate/batch")
+def validate_records(req: BatchValidationRequest):
+    from app.profiling import run_profiled
+
+    # Sin caché: las columnas de texto se validan en C y consultarla cuesta más
+    return run_profiled(validate_batch, req.records)
@@ -0,0 +1,88 @@
+"""
+Formatos de respuesta columnar de la API (ver `app.columnar`).
+
+El cliente lo pide con la cabecera `Accept`: `COLUMNAR_JSON` para JSON y
+`MSGPACK` para MessagePack (requiere el paquete `msgpack`).
+"""
+import json
+from typing import Any, Dict, Optional
+
+from starlette.responses import Response
+
+try:
+    import msgpack
+except ImportError:  # dependencia opcional: sin ella solo hay columnar JSON
+    msgpack = None
+
+
+COLUMNAR_JSON = "application/vnd.laborauq.columnar+json"
+MSGPACK = "application/msgpack"
+
+# Tipos MIME aceptados para cada formato columnar
+_MEDIA_TYPES = {
+    COLUMNAR_JSON: COLUMNAR_JSON,
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+
+class FormatNotAvailable(Exception):
+    """El formato pedido necesita una dependencia que no está instalada."""
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """
+    Elige el formato columnar según la cabecera `Accept`.
+
+    Args:
+        accept (str, optional): Valor de la cabecera
+
+    Returns:
+        Optional[str]: COLUMNAR_JSON o MSGPACK, o None si el cliente
+                       prefiere otro tipo (el JSON habitual)
+    """
+    if not accept:
+        return None
+    ranges = []
+    for position, item in enumerate(accept.split(",")):
+        media_type, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((-quality, position, media_type.strip().lower()))
+    # A igual calidad decide el orden de la cabecera
+    for _, _, media_type in sorted(ranges):
+        if media_type in _MEDIA_TYPES:
+            return _MEDIA_TYPES[media_type]
+        if media_type in ("application/json", "*/*", "application/*"):
+            return None
+    return None
+
+
+def render(content: Dict[str, Any], media_type: str) -> Response:
+    """
+    Serializa un resultado columnar.
+
+    Args:
+        content (Dict[str, Any]): Resultado en formato columnar
+        media_type (str): COLUMNAR_JSON o MSGPACK
+
+    Returns:
+        Response: Respuesta con el cuerpo ya serializado
+
+    Raises:
+        FormatNotAvailable: Si se pide MessagePack sin el paquete `msgpack`
+    """
+    if media_type == MSGPACK:
+        if msgpack is None:
+            raise FormatNotAvailable("MessagePack requiere el paquete msgpack")
+        return Response(msgpack.packb(content, use_bin_type=True), media_type=MSGPACK)
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+    return Response(body.encode("utf-8"), media_type=COLUMNAR_JSON)
@@ -0,0 +1,105 @@
+"""
+Línea de comandos para extraer entidades de ficheros grandes.
+
+Uso:
+    python -m app.cli registros.log -o entidades.jsonl --workers 8
+    python -m app.cli registros.log --top 20
+
+Escribe una línea JSON por entidad (`type`, `value`, `start`, `end`, con
+posiciones en bytes) y, al terminar, un resumen por la salida de errores.
+Con `--top K` escribe en su lugar un único JSON con los valores distintos de
+cada tipo, su número y los K más frecuentes (ver `app.services.aggregation`).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+from typing import List, Optional
+
+from app.services.aggregation import EntityAggregator
+from app.services.bulk import DEFAULT_CHUNK_SIZE, iter_file_entities, write_jsonl
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Extrae emails, teléfonos, fechas, DNIs, códigos postales y URLs "
+                    "de un fichero y los escribe como JSONL.",
+    )
+    parser.add_argument("input", help="Fichero de entrada (texto UTF-8 o ASCII)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Fichero JSONL de salida (por defecto, la salida estándar)")
+    parser.add_argument("-w", "--workers", type=int, default=0,
+                        help="Procesos en paralelo (0 = núcleos disponibles)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE >> 20,
+                        help="Tamaño de cada bloque en MiB (por defecto %(default)s)")
+    parser.add_argument("--top", type=int, default=0, metavar="K",
+                        help="Agregar: valores distintos por tipo y los K más frecuentes "
+                             "en lugar de una línea por entidad")
+    return parser
+
+
+def write_aggregate(entities, output, top_k: int, input_length: int) -> int:
+    """
+    Agrega las entidades y escribe el resumen como un único JSON.
+
+    Args:
+        entities: (tipo, valor, inicio, fin) de cada entidad, valor en bytes
+        output: Destino binario
+        top_k (int): Valores más frecuentes por tipo
+        input_length (int): Tamaño del fichero en bytes
+
+    Returns:
+        int: Número de entidades agregadas
+    """
+    aggregator = EntityAggregator(top_k)
+    add = aggregator.add
+    for kind, value, _, _ in entities:
+        add(kind, value.decode("ascii"))
+    summary = {"status": "ok", "input_length": input_length, "count": aggregator.count,
+               "types": aggregator.result()}
+    output.write((json.dumps(summary, ensure_ascii=False) + "\n").encode("utf-8"))
+    return aggregator.count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada de la línea de comandos.
+
+    Args:
+        argv (List[str], optional): Argumentos (por defecto los del proceso)
+
+    Returns:
+        int: Código de salida
+    """
+    args = build_parser().parse_args(argv)
+    if not os.path.isfile(args.input):
+        print(f"No existe el fichero: {args.input}", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    size = os.path.getsize(args.input)
+    entities = iter_file_entities(args.input, workers=args.workers,
+                                  chunk_size=args.chunk_size << 20)
+    if args.top > 0:
+        write = partial(write_aggregate, entities, top_k=args.top, input_length=size)
+    else:
+        write = partial(write_jsonl, entities)
+    if args.output == "-":
+        count = write(sys.stdout.buffer)
+        sys.stdout.flush()
+    else:
+        with open(args.output, "wb") as output:
+            count = write(output)
+    elapsed = time.perf_counter() - started
+
+    rate = size / elapsed / (1 << 20) if elapsed > 0 else 0.0
+    print(f"{count} entidades en {size} bytes ({elapsed:.2f} s, {rate:.1f} MiB/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Formato columnar compacto para resultados con muchas coincidencias.
+
+Con decenas de miles de entidades, serializar un diccionario por entidad
+domina el tiempo de respuesta. En el formato columnar cada campo es una
+lista paralela y los valores repetidos se guardan una sola vez:
+
+    {
+        "status": "ok", "input_length": 120, "count": 3,
+        "types": ["url", "email", "phone", "date", "postal_code", "dni"],
+        "strings": ["a@b.co", "+573001234567"],
+        "type": [1, 2, 1],          # índice en "types"
+        "value": [0, 1, 0],         # índice en "strings"
+        "start": [10, 30, 80],
+        "end": [16, 43, 86]
+    }
+
+La entidad i es (types[type[i]], strings[value[i]], start[i], end[i]).
+
+Este módulo solo construye las columnas y no depende del framework web: lo
+usan los validadores y el extractor. La elección del formato según la
+cabecera `Accept` y la serialización están en `app.api.v1.formats`.
+"""
+from typing import Any, Dict, Hashable, Iterable, List, Sequence, Tuple
+
+
+def string_table(values: Iterable[Hashable]) -> Tuple[List[Hashable], List[int]]:
+    """
+    Sustituye cada valor por su índice en una tabla sin repetidos.
+
+    Args:
+        values: Valores en orden (cadenas o tuplas de cadenas)
+
+    Returns:
+        Tuple[List, List[int]]: Tabla en orden de primera aparición e índice
+                                de cada valor
+    """
+    table: Dict[Hashable, int] = {}
+    codes = [table.setdefault(value, len(table)) for value in values]
+    return list(table), codes
+
+
+def entity_columns(entities: Iterable[Tuple[str, str, int, int]],
+                   type_names: Sequence[str]) -> Dict[str, Any]:
+    """
+    Construye las columnas de una secuencia de entidades.
+
+    Args:
+        entities: (tipo, valor, inicio, fin) de cada entidad
+        type_names: Tabla de tipos; cada tipo se sustituye por su índice
+
+    Returns:
+        Dict[str, Any]: Columnas "types", "strings", "type", "value",
+                        "start" y "end"
+    """
+    type_codes = {name: index for index, name in enumerate(type_names)}
+    kinds: List[int] = []
+    values: List[str] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    for kind, value, start, end in entities:
+        kinds.append(type_codes[kind])
+        values.append(value)
+        starts.append(start)
+        ends.append(end)
+    strings, codes = string_table(values)
+    return {
+        "types": list(type_names),
+        "strings": strings,
+        "type": kinds,
+        "value": codes,
+        "start": starts,
+        "end": ends,
+    }
+
+
+def columnar_result(result: Dict[str, Any], type_names: Sequence[str]) -> Dict[str, Any]:
+    """
+    Convierte un resultado de `extract_all` al formato columnar.
+
+    Args:
+        result (Dict[str, Any]): Resultado con la lista "entities"
+        type_names: Tabla de tipos
+
+    Returns:
+        Dict[str, Any]: El mismo resultado con las entidades en columnas
+    """
+    converted = {key: value for key, value in result.items() if key != "entities"}
+    converted.update(entity_columns(
+        ((entity["type"], entity["value"], entity["start"], entity["end"])
+         for entity in result["entities"]),
+        type_names,
+    ))
+    return converted
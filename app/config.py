@@ -0,0 +1,164 @@
+"""
+Configuración de la API leída desde variables de entorno.
+
+Todas las variables usan el prefijo PATRONES_. Los valores se leen una sola
+vez por proceso mediante `get_settings()`.
+"""
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_str(name: str, default: str) -> str:
+    value = os.getenv(name)
+    return value if value not in (None, "") else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Parámetros de ejecución de la API.
+
+    Attributes:
+        extraction_mode (str): "thread" ejecuta la extracción en el pool de
+            hilos de Starlette; "process" la envía a un pool de procesos
+        extraction_workers (int): Procesos del pool (0 = núcleos disponibles)
+        shared_memory_threshold (int): Tamaño en bytes a partir del cual el
+            texto se entrega a los procesos mediante memoria compartida
+        metrics_enabled (bool): Si se registran las métricas de validadores y
+            extractores expuestas en /metrics
+        profiling_enabled (bool): Si se instala el middleware de perfilado
+        profile_sample_rate (float): Fracción de peticiones perfiladas al
+            azar
+        profile_dir (str): Directorio donde se guardan los perfiles
+        profile_retention (int): Número máximo de perfiles conservados
+        profile_token (str): Valor de la cabecera X-Profile que pide un
+            perfil; vacío para ignorar la cabecera
+        database_url (str): URL de SQLAlchemy de la base de registros
+        write_batch_size (int): Registros por lote de la escritura diferida
+        write_flush_interval (float): Segundos máximos que un registro espera
+            en la cola antes de escribirse
+        write_max_pending (int): Capacidad de la cola de escritura diferida
+        write_dead_letter_path (str): Fichero JSON Lines para los registros que
+            no se pueden escribir ("" = solo en memoria y en el log)
+        dedup_capacity (int): Registros previstos en el índice de duplicados
+        dedup_error_rate (float): Tasa de falsos positivos del índice de
+            duplicados (cada uno cuesta una consulta a la base de datos)
+        dedup_refresh_interval (float): Segundos entre lecturas de los registros
+            nuevos de otros procesos en el índice de duplicados
+        job_workers (int): Trabajos de extracción asíncronos a la vez
+        job_max_pending (int): Trabajos en cola o en curso como máximo
+        job_ttl (float): Segundos que se conserva el resultado de un trabajo
+        job_max_stored (int): Trabajos terminados que se conservan como máximo
+        dfa_matchers (str): Motor de los patrones de forma fija: "off" (`re`),
+            "on" (DFA con tabla) o "auto" (el más rápido medido al arrancar)
+        warmup_enabled (bool): Si se precalientan patrones, validadores e
+            índice de duplicados antes de marcar la API como lista
+        server_workers (int): Workers de `python -m app.serve` (0 = núcleos
+            disponibles)
+        server_loop (str): Bucle de eventos: "auto", "uvloop" o "asyncio"
+        server_http (str): Protocolo HTTP: "auto", "httptools" o "h11"
+        server_graceful_timeout (float): Segundos que un worker tiene para
+            terminar sus peticiones al detenerse o reiniciarse
+    """
+    extraction_mode: str = "thread"
+    extraction_workers: int = 0
+    shared_memory_threshold: int = 1 << 20
+    metrics_enabled: bool = True
+    profiling_enabled: bool = False
+    profile_sample_rate: float = 0.0
+    profile_dir: str = "profiles"
+    profile_retention: int = 20
+    profile_token: str = ""
+    database_url: str = "sqlite:///laborauq.db"
+    write_batch_size: int = 500
+    write_flush_interval: float = 0.5
+    write_max_pending: int = 100_000
+    write_dead_letter_path: str = ""
+    dedup_capacity: int = 1_000_000
+    dedup_error_rate: float = 0.001
+    dedup_refresh_interval: float = 5.0
+    job_workers: int = 2
+    job_max_pending: int = 64
+    job_ttl: float = 600.0
+    job_max_stored: int = 1000
+    dfa_matchers: str = "off"
+    warmup_enabled: bool = True
+    server_workers: int = 0
+    server_loop: str = "auto"
+    server_http: str = "auto"
+    server_graceful_timeout: float = 30.0
+
+
+def load_settings() -> Settings:
+    """
+    Construye la configuración a partir de las variables de entorno.
+
+    Returns:
+        Settings: Configuración leída
+    """
+    defaults = Settings()
+    return Settings(
+        extraction_mode=_env_str("PATRONES_EXTRACTION_MODE", defaults.extraction_mode),
+        extraction_workers=_env_int("PATRONES_EXTRACTION_WORKERS", defaults.extraction_workers),
+        shared_memory_threshold=_env_int(
+            "PATRONES_SHARED_MEMORY_THRESHOLD", defaults.shared_memory_threshold
+        ),
+        metrics_enabled=_env_bool("PATRONES_METRICS_ENABLED", defaults.metrics_enabled),
+        profiling_enabled=_env_bool("PATRONES_PROFILING_ENABLED", defaults.profiling_enabled),
+        profile_sample_rate=_env_float(
+            "PATRONES_PROFILE_SAMPLE_RATE", defaults.profile_sample_rate
+        ),
+        profile_dir=_env_str("PATRONES_PROFILE_DIR", defaults.profile_dir),
+        profile_retention=_env_int("PATRONES_PROFILE_RETENTION", defaults.profile_retention),
+        profile_token=_env_str("PATRONES_PROFILE_TOKEN", defaults.profile_token),
+        database_url=_env_str("PATRONES_DATABASE_URL", defaults.database_url),
+        write_batch_size=_env_int("PATRONES_WRITE_BATCH_SIZE", defaults.write_batch_size),
+        write_flush_interval=_env_float(
+            "PATRONES_WRITE_FLUSH_INTERVAL", defaults.write_flush_interval
+        ),
+        write_max_pending=_env_int("PATRONES_WRITE_MAX_PENDING", defaults.write_max_pending),
+        write_dead_letter_path=_env_str(
+            "PATRONES_WRITE_DEAD_LETTER_PATH", defaults.write_dead_letter_path
+        ),
+        dedup_capacity=_env_int("PATRONES_DEDUP_CAPACITY", defaults.dedup_capacity),
+        dedup_error_rate=_env_float("PATRONES_DEDUP_ERROR_RATE", defaults.dedup_error_rate),
+        dedup_refresh_interval=_env_float(
+            "PATRONES_DEDUP_REFRESH_INTERVAL", defaults.dedup_refresh_interval
+        ),
+        job_workers=_env_int("PATRONES_JOB_WORKERS", defaults.job_workers),
+        job_max_pending=_env_int("PATRONES_JOB_MAX_PENDING", defaults.job_max_pending),
+        job_ttl=_env_float("PATRONES_JOB_TTL", defaults.job_ttl),
+        job_max_stored=_env_int("PATRONES_JOB_MAX_STORED", defaults.job_max_stored),
+        dfa_matchers=_env_str("PATRONES_DFA_MATCHERS", defaults.dfa_matchers),
+        warmup_enabled=_env_bool("PATRONES_WARMUP_ENABLED", defaults.warmup_enabled),
+        server_workers=_env_int("PATRONES_SERVER_WORKERS", defaults.server_workers),
+        server_loop=_env_str("PATRONES_SERVER_LOOP", defaults.server_loop),
+        server_http=_env_str("PATRONES_SERVER_HTTP", defaults.server_http),
+        server_graceful_timeout=_env_float(
+            "PATRONES_SERVER_GRACEFUL_TIMEOUT", defaults.server_graceful_timeout
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Retorna la configuración del proceso (leída una sola vez)."""
+    return load_settings()
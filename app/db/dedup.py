@@ -0,0 +1,288 @@
+"""
+Detección de registros duplicados por email o DNI.
+
+`RegistrationIndex` mantiene en memoria un filtro de Bloom por campo, cargado
+al arrancar desde la tabla `registrations` y actualizado con cada registro
+aceptado. Un filtro de Bloom no tiene falsos negativos: si el valor no está
+en el filtro es seguro que es nuevo y se responde sin ninguna E/S. Solo ante
+un posible acierto se consulta la base de datos con el índice de la columna.
+
+Los registros aceptados que el escritor diferido aún no ha insertado se
+guardan aparte como pendientes, para que un duplicado enviado antes de que
+se escriba el original también se detecte; los que el escritor descarta
+dejan de estar pendientes. Para ver las altas de otros procesos, el índice
+añade cada `refresh_interval` segundos las filas con un id mayor que el
+último cargado. La garantía final la dan los índices únicos de email y DNI:
+si dos procesos aceptan a la vez el mismo valor, la segunda inserción falla
+y el escritor la aparta.
+"""
+import hashlib
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+from app.db.models import Registration, normalize_dni, normalize_email
+from app.db.writer import get_registration_writer
+
+
+# Campos en los que se buscan duplicados y su normalización
+DEDUP_FIELDS: Dict[str, Callable[[str], str]] = {
+    "email": normalize_email,
+    "dni": normalize_dni,
+}
+
+_LOAD_BATCH = 10_000
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre un `bytearray`, con doble hash derivado de BLAKE2b.
+
+    Args:
+        capacity (int): Número de elementos previsto
+        error_rate (float): Tasa de falsos positivos con `capacity` elementos
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.capacity = capacity
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return [(first + index * second) % size for index in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        positions = self._positions(value)
+        bits = self._bits
+        # La escritura de un byte no es atómica entre hilos: perder un bit
+        # sería un falso negativo
+        with self._lock:
+            for position in positions:
+                bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        bits = self._bits
+        for position in self._positions(value):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RegistrationIndex:
+    """
+    Índice en memoria de los emails y DNIs registrados.
+
+    Args:
+        engine (Engine): Motor de la base de registros
+        capacity (int): Registros previstos por filtro (se amplía al cargar
+                        si la tabla ya tiene más)
+        error_rate (float): Tasa de falsos positivos de los filtros
+        refresh_interval (float): Segundos entre lecturas de las filas nuevas
+                                  de la tabla (0 = en cada consulta negativa)
+    """
+
+    def __init__(self, engine: Engine, capacity: int = 1_000_000, error_rate: float = 0.001,
+                 refresh_interval: float = 5.0):
+        self.engine = engine
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.lookups = 0
+        self.db_queries = 0
+        self._filters = {field: BloomFilter(capacity, error_rate) for field in DEDUP_FIELDS}
+        self._last_id = 0
+        self._refreshed = time.monotonic()
+        self._refresh_lock = threading.Lock()
+        self._pending: Set[Tuple[str, str]] = set()
+        self._pending_lock = threading.Lock()
+        self._reserve_lock = threading.Lock()
+
+    def load(self) -> "RegistrationIndex":
+        """
+        Carga en los filtros los valores existentes de la tabla. Los valores
+        pendientes de escribir se copian a los filtros nuevos al sustituir los
+        anteriores, para que una recarga no los pierda.
+
+        Returns:
+            RegistrationIndex: El propio índice
+        """
+        table = Registration.__table__
+        with self.engine.connect() as connection:
+            rows = connection.execute(select(func.count()).select_from(table)).scalar_one()
+            # Con más elementos que su capacidad la tasa de falsos positivos
+            # crece; se deja margen para los registros nuevos
+            capacity = max(self.capacity, 2 * rows)
+            filters = {field: BloomFilter(capacity, self.error_rate) for field in DEDUP_FIELDS}
+            last_id = self._add_rows(connection, filters, 0)
+        # `add` escribe bajo el mismo lock: ningún valor nuevo puede quedar
+        # solo en los filtros anteriores
+        with self._pending_lock:
+            for field, value in self._pending:
+                filters[field].add(value)
+            self._filters, self._last_id = filters, last_id
+        self._refreshed = time.monotonic()
+        return self
+
+    @staticmethod
+    def _add_rows(connection, filters: Dict[str, BloomFilter], after: int) -> int:
+        table = Registration.__table__
+        columns = [table.c[field] for field in DEDUP_FIELDS]
+        statement = select(table.c.id, *columns).where(table.c.id > after)
+        result = connection.execution_options(yield_per=_LOAD_BATCH).execute(statement)
+        for row in result:
+            after = max(after, row[0])
+            for field, value in zip(DEDUP_FIELDS, row[1:]):
+                if value:
+                    filters[field].add(value)
+        return after
+
+    def refresh(self) -> None:
+        """
+        Añade a los filtros las filas insertadas desde la última carga, también
+        las de otros procesos. Si los filtros superan su capacidad se vuelven a
+        cargar completos con una mayor.
+        """
+        with self._refresh_lock:
+            with self.engine.connect() as connection:
+                self._last_id = self._add_rows(connection, self._filters, self._last_id)
+            self._refreshed = time.monotonic()
+            if any(bloom.count > bloom.capacity for bloom in self._filters.values()):
+                self.load()
+
+    def _refresh_due(self) -> bool:
+        if time.monotonic() - self._refreshed < self.refresh_interval:
+            return False
+        if self._refresh_lock.locked():
+            # Otro hilo ya está leyendo las filas nuevas
+            return False
+        self.refresh()
+        return True
+
+    def add(self, record: Mapping[str, Any]) -> None:
+        """
+        Añade los valores de un registro aceptado, aún pendiente de escribir.
+
+        Args:
+            record (Mapping[str, Any]): Registro con las claves de DEDUP_FIELDS
+        """
+        for field, normalize in DEDUP_FIELDS.items():
+            value = record.get(field)
+            if not value:
+                continue
+            value = normalize(value)
+            with self._pending_lock:
+                self._filters[field].add(value)
+                self._pending.add((field, value))
+
+    def reserve(self, record: Mapping[str, Any]) -> List[str]:
+        """
+        Comprueba los duplicados de un registro y, si no tiene, lo añade como
+        pendiente en la misma operación: dos envíos simultáneos del mismo
+        valor en este proceso no pueden pasar ambos la comprobación.
+
+        Args:
+            record (Mapping[str, Any]): Registro con las claves de DEDUP_FIELDS
+
+        Returns:
+            List[str]: Campos duplicados; vacía si el registro quedó reservado
+        """
+        with self._reserve_lock:
+            duplicates = self.duplicates(record)
+            if not duplicates:
+                self.add(record)
+        return duplicates
+
+    def release(self, record: Mapping[str, Any]) -> None:
+        """
+        Deshace `reserve` para un registro que finalmente no se envía.
+
+        Args:
+            record (Mapping[str, Any]): Registro con las claves de DEDUP_FIELDS
+        """
+        self.written([{field: normalize(record[field])
+                       for field, normalize in DEDUP_FIELDS.items() if record.get(field)}])
+
+    def written(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Olvida como pendientes los registros ya insertados o descartados. Se
+        registra como observador del escritor diferido para ambos casos.
+
+        Args:
+            rows (List[Dict[str, Any]]): Filas escritas
+        """
+        with self._pending_lock:
+            for row in rows:
+                for field in DEDUP_FIELDS:
+                    self._pending.discard((field, row.get(field)))
+
+    def exists(self, field: str, value: Optional[str]) -> bool:
+        """
+        Indica si ya hay un registro con ese valor.
+
+        Args:
+            field (str): "email" o "dni"
+            value (str): Valor a comprobar (se normaliza)
+
+        Returns:
+            bool: True si el valor ya está registrado
+        """
+        if not value or not value.strip():
+            return False
+        value = DEDUP_FIELDS[field](value)
+        self.lookups += 1
+        if (field, value) in self._pending:
+            return True
+        if value not in self._filters[field]:
+            # Antes de responder que es nuevo se leen las altas de otros
+            # procesos si ha pasado el intervalo
+            if not self._refresh_due() or value not in self._filters[field]:
+                return False
+        self.db_queries += 1
+        column = Registration.__table__.c[field]
+        with self.engine.connect() as connection:
+            found = connection.execute(select(column).where(column == value).limit(1)).first()
+        return found is not None
+
+    def duplicates(self, record: Mapping[str, Any]) -> List[str]:
+        """
+        Retorna los campos del registro cuyo valor ya está registrado.
+
+        Args:
+            record (Mapping[str, Any]): Registro con las claves de DEDUP_FIELDS
+
+        Returns:
+            List[str]: Campos duplicados, en el orden de DEDUP_FIELDS
+        """
+        return [field for field in DEDUP_FIELDS if self.exists(field, record.get(field))]
+
+
+@lru_cache(maxsize=1)
+def get_registration_index() -> RegistrationIndex:
+    """
+    Retorna el índice del proceso, cargado desde la base de datos en la
+    primera llamada y enlazado con el escritor diferido.
+    """
+    settings = get_settings()
+    writer = get_registration_writer()
+    index = RegistrationIndex(writer.engine, capacity=settings.dedup_capacity,
+                              error_rate=settings.dedup_error_rate,
+                              refresh_interval=settings.dedup_refresh_interval)
+    index.load()
+    writer.add_listener(index.written)
+    writer.add_failure_listener(index.written)
+    return index
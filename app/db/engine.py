@@ -0,0 +1,49 @@
+"""
+Creación del motor de base de datos.
+
+Por defecto se usa un fichero SQLite local. En SQLite se activa el modo WAL
+con `synchronous=NORMAL`: las escrituras no esperan un fsync por transacción
+(solo en los checkpoints) y los lectores no bloquean al escritor.
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
+
+from app.db.models import Base
+
+
+def _configure_sqlite(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str, pool_size: int = 5) -> Engine:
+    """
+    Crea el motor con pool de conexiones y las tablas si no existen.
+
+    Args:
+        url (str): URL de conexión de SQLAlchemy
+        pool_size (int): Conexiones que mantiene abiertas el pool
+
+    Returns:
+        Engine: Motor configurado
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            # Una base en memoria solo existe dentro de su conexión: todos los
+            # hilos deben compartir la misma
+            engine = create_engine(url, poolclass=StaticPool,
+                                   connect_args={"check_same_thread": False})
+        else:
+            engine = create_engine(url, pool_size=pool_size)
+        event.listen(engine, "connect", _configure_sqlite)
+    else:
+        engine = create_engine(url, pool_size=pool_size, pool_pre_ping=True)
+    Base.metadata.create_all(engine)
+    return engine
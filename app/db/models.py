@@ -0,0 +1,52 @@
+"""
+Modelos de la base de datos de registros.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Boolean, DateTime, Integer, String, Text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def normalize_email(value: str) -> str:
+    """Forma canónica de un email para detectar duplicados."""
+    return value.strip().lower()
+
+
+def normalize_dni(value: str) -> str:
+    """Forma canónica de un DNI para detectar duplicados."""
+    return value.strip().upper()
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Registration(Base):
+    """Registro profesional enviado desde el formulario."""
+
+    __tablename__ = "registrations"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
+    name: Mapped[str] = mapped_column(String(200))
+    # email y dni se guardan normalizados y con índice único: además de
+    # buscar duplicados, impiden que dos procesos guarden el mismo valor
+    email: Mapped[str] = mapped_column(String(254), index=True, unique=True)
+    phone: Mapped[str] = mapped_column(String(32))
+    # PATTERN_DATE no acota los dígitos del año y PATTERN_DNI admite hasta 18
+    # caracteres: las columnas no pueden ser más estrechas que lo que se valida
+    birth_date: Mapped[str] = mapped_column(Text)
+    dni: Mapped[str] = mapped_column(String(18), index=True, unique=True)
+    postal_code: Mapped[str] = mapped_column(String(16))
+    profession: Mapped[str] = mapped_column(String(200))
+    company: Mapped[str] = mapped_column(String(200), default="")
+    experience: Mapped[str] = mapped_column(String(32))
+    location: Mapped[str] = mapped_column(String(200), default="")
+    portfolio_urls: Mapped[list] = mapped_column(JSON, default=list)
+    bio: Mapped[str] = mapped_column(Text, default="")
+    skills: Mapped[str] = mapped_column(Text, default="")
+    notifications: Mapped[bool] = mapped_column(Boolean, default=False)
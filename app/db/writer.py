@@ -0,0 +1,295 @@
+"""
+Escritura diferida (write-behind) de registros.
+
+El formulario no escribe en la base de datos: `RegistrationWriter.submit`
+deja el registro en una cola en memoria y retorna de inmediato. Un hilo en
+segundo plano agrupa los registros y los inserta con un único `INSERT`
+por lotes (executemany) en una sola transacción cuando se reúnen
+`batch_size` registros o pasan `flush_interval` segundos desde el primero
+pendiente. Así un pico de altas produce pocas transacciones grandes en lugar
+de un commit por envío, y ninguna petición espera a la base de datos.
+
+Si un lote falla tras sus reintentos se inserta fila a fila: las filas
+válidas se guardan y solo las que siguen fallando se apartan como "dead
+letter" (en memoria y, si se configura `dead_letter_path`, en un fichero
+JSON Lines del que se pueden reprocesar).
+
+Los registros aún en la cola se pierden si el proceso termina de forma
+abrupta; al salir de forma ordenada `stop()` (registrado con atexit) escribe
+los pendientes.
+"""
+import atexit
+import collections
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.config import get_settings
+from app.db.engine import create_db_engine
+from app.db.models import Registration, normalize_dni, normalize_email
+
+
+logger = logging.getLogger(__name__)
+
+# Columnas de un registro; todas las filas de un lote llevan las mismas claves
+REGISTRATION_FIELDS = (
+    "name", "email", "phone", "birth_date", "dni", "postal_code", "profession",
+    "company", "experience", "location", "portfolio_urls", "bio", "skills",
+    "notifications",
+)
+
+# Filas descartadas que se conservan en memoria como máximo
+DEAD_LETTER_LIMIT = 1000
+
+_STOP = object()
+
+
+def registration_row(record: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Normaliza un registro del formulario a una fila de `registrations`.
+
+    Args:
+        record (Mapping[str, Any]): Valores del formulario por columna
+
+    Returns:
+        Dict[str, Any]: Fila con todas las columnas y la fecha de envío
+    """
+    row = {name: record.get(name) for name in REGISTRATION_FIELDS}
+    for name in ("company", "location", "bio", "skills"):
+        row[name] = row[name] or ""
+    row["portfolio_urls"] = [url for url in row["portfolio_urls"] or () if url]
+    row["notifications"] = bool(row["notifications"])
+    if row["email"]:
+        row["email"] = normalize_email(row["email"])
+    if row["dni"]:
+        row["dni"] = normalize_dni(row["dni"])
+    row["created_at"] = record.get("created_at") or datetime.now(timezone.utc)
+    return row
+
+
+class RegistrationWriter:
+    """
+    Cola de registros con un hilo escritor que inserta por lotes.
+
+    Args:
+        engine (Engine): Motor de base de datos
+        batch_size (int): Registros por lote como máximo
+        flush_interval (float): Segundos que un registro puede esperar en la
+                                cola antes de escribir un lote incompleto
+        max_pending (int): Capacidad de la cola; con la cola llena `submit`
+                           rechaza el registro en lugar de bloquear
+        retries (int): Reintentos de un lote que falla antes de escribirlo
+                       fila a fila
+        dead_letter_path (str, optional): Fichero JSON Lines al que se añaden
+                                          las filas que no se pueden escribir
+    """
+
+    def __init__(self, engine: Engine, batch_size: int = 500, flush_interval: float = 0.5,
+                 max_pending: int = 100_000, retries: int = 3,
+                 dead_letter_path: Optional[str] = None):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.dead_letter_path = dead_letter_path
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.dead_letters: "collections.deque[Dict[str, Any]]" = collections.deque(
+            maxlen=DEAD_LETTER_LIMIT)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._failure_listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> "RegistrationWriter":
+        """Arranca el hilo escritor (si no está ya en marcha)."""
+        with self._lock:
+            if not self.running:
+                self._thread = threading.Thread(target=self._run, name="registration-writer",
+                                                daemon=True)
+                self._thread.start()
+        return self
+
+    def add_listener(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """
+        Registra una función que se llama desde el hilo escritor con cada
+        lote ya confirmado en la base de datos.
+
+        Args:
+            callback: Función que recibe la lista de filas escritas
+        """
+        self._listeners.append(callback)
+
+    def add_failure_listener(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """
+        Registra una función que se llama desde el hilo escritor con las filas
+        de cada lote que no se pudieron escribir.
+
+        Args:
+            callback: Función que recibe la lista de filas descartadas
+        """
+        self._failure_listeners.append(callback)
+
+    def submit(self, record: Mapping[str, Any]) -> bool:
+        """
+        Encola un registro para su escritura. No bloquea.
+
+        Args:
+            record (Mapping[str, Any]): Valores del formulario por columna
+
+        Returns:
+            bool: True si se encoló; False si la cola está llena
+        """
+        try:
+            self._queue.put_nowait(registration_row(record))
+        except queue.Full:
+            return False
+        return True
+
+    def flush(self) -> None:
+        """
+        Espera a que se escriban todos los registros encolados. Sin el hilo
+        escritor en marcha (antes de `start` o tras `stop`) retorna sin
+        esperar: nadie los escribiría, y quedan en la cola hasta `start`.
+        """
+        if not self.running:
+            return
+        self._queue.join()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Escribe los registros pendientes y detiene el hilo escritor.
+
+        Args:
+            timeout (float, optional): Segundos máximos de espera
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch: List[Dict[str, Any]] = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 \
+                        else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _insert(self, rows: List[Dict[str, Any]], retries: int) -> None:
+        statement = insert(Registration.__table__)
+        for attempt in range(retries + 1):
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(statement, rows)
+                return
+            except (IntegrityError, DataError):
+                # Un dato rechazado falla igual en cada reintento
+                raise
+            except Exception:
+                if attempt == retries:
+                    raise
+                time.sleep(min(0.1 * 2 ** attempt, 2.0))
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self._insert(batch, self.retries)
+            written = batch
+        except Exception:
+            logger.warning("No se pudo escribir un lote de %d registros; se escribe fila a fila",
+                           len(batch), exc_info=True)
+            written, discarded = [], []
+            for row in batch:
+                try:
+                    self._insert([row], 0)
+                except Exception as error:
+                    self._dead_letter(row, error)
+                    discarded.append(row)
+                else:
+                    written.append(row)
+            self._notify(self._failure_listeners, discarded)
+        if written:
+            self.written += len(written)
+            self.batches += 1
+            self._notify(self._listeners, written)
+
+    @staticmethod
+    def _notify(listeners: List[Callable[[List[Dict[str, Any]]], None]],
+                rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        for callback in listeners:
+            try:
+                callback(rows)
+            except Exception:
+                logger.exception("Error en un observador de la escritura diferida")
+
+    def _dead_letter(self, row: Dict[str, Any], error: Exception) -> None:
+        self.failed += 1
+        self.dead_letters.append(row)
+        logger.error("Registro descartado por la escritura diferida: %s: %s",
+                     type(error).__name__, error)
+        if not self.dead_letter_path:
+            return
+        try:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(row, default=str, ensure_ascii=False) + "\n")
+        except OSError:
+            logger.exception("No se pudo guardar un registro descartado en %s",
+                             self.dead_letter_path)
+
+
+@lru_cache(maxsize=1)
+def get_registration_writer() -> RegistrationWriter:
+    """
+    Retorna el escritor del proceso, creado y arrancado en la primera
+    llamada con la configuración de `get_settings()`.
+    """
+    settings = get_settings()
+    writer = RegistrationWriter(
+        create_db_engine(settings.database_url),
+        batch_size=settings.write_batch_size,
+        flush_interval=settings.write_flush_interval,
+        max_pending=settings.write_max_pending,
+        dead_letter_path=settings.write_dead_letter_path or None,
+    )
+    atexit.register(writer.stop)
+    return writer.start()
@@ -1,19 +1,114 @@
-from fastapi import FastAPI
+"""
+Aplicación FastAPI.
+
+`create_app` construye la aplicación. Las rutas, los servicios y el arranque
+(`app.startup`, que carga los patrones) se importan dentro de la fábrica
+(fase "import" de `StartupReport`), el perfilado solo al atender una
+petición y la base de datos solo al precalentar o al usar los endpoints que
+la necesitan, así que importar este módulo es barato. `app` se crea la primera vez que se pide,
+de modo que siguen funcionando tanto
+
+    uvicorn app.main:app
+
+como
+
+    uvicorn --factory app.main:create_app
+"""
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.endpoints import router as v1_router
+from fastapi.responses import JSONResponse
+from app.config import Settings, get_settings
+from app.metrics import CONTENT_TYPE, metrics
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Construye la aplicación.
+
+    Args:
+        settings (Settings, optional): Configuración (por defecto la del
+                                       entorno)
+
+    Returns:
+        FastAPI: Aplicación con su informe de arranque en `app.state.startup`
+    """
+    # El arranque importa el registro de patrones y el extractor
+    from app.startup import StartupReport, warm_up
+
+    settings = settings if settings is not None else get_settings()
+    report = StartupReport()
+
+    with report.phase("import"):
+        from app.api.v1.endpoints import router as v1_router
+        from app.services.executor import extraction_executor
+        from app.services.jobs import extraction_jobs
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Compila patrones, elige motores y carga el índice de duplicados
+        # antes de aceptar tráfico
+        warm_up(report, settings)
+        with report.phase("extraction_executor"):
+            # Arranca y precalienta el pool de procesos (solo en modo "process")
+            extraction_executor.start()
+        extraction_jobs.start()
+        # Las llamadas del precalentamiento no cuentan en las métricas
+        metrics.enabled = settings.metrics_enabled
+        report.ready = True
+        report.log()
+        yield
+        report.ready = False
+        extraction_jobs.shutdown()
+        extraction_executor.shutdown()
+
+    with report.phase("create_app"):
+        app = FastAPI(title="Patrones API", lifespan=lifespan)
+        app.state.startup = report
+        app.include_router(v1_router, prefix="/api/v1")
+
+        @app.get("/")
+        def root():
+            return {"message": "Bienvenido a la API de búsqueda y validación de patrones"}
+
+        @app.get("/metrics", include_in_schema=False)
+        def prometheus_metrics():
+            return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+        @app.get("/health/live", include_in_schema=False)
+        def health_live():
+            return {"status": "ok"}
+
+        @app.get("/health/ready", include_in_schema=False)
+        def health_ready():
+            return JSONResponse(report.to_dict(), status_code=200 if report.ready else 503)
+
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["http://localhost:4200"],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
 
-app = FastAPI(title="Patrones API")
-app.include_router(v1_router, prefix="/api/v1")
+        if settings.profiling_enabled:
+            from app.profiling import ProfilingMiddleware
+            app.add_middleware(
+                ProfilingMiddleware,
+                directory=settings.profile_dir,
+                sample_rate=settings.profile_sample_rate,
+                retention=settings.profile_retention,
+                token=settings.profile_token,
+            )
 
+    return app
 
-@app.get("/")
-def root():
-    return {"message": "Bienvenido a la API de búsqueda y validación de patrones"}
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:4200"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
\ No newline at end of file
+def __getattr__(name: str):
+    # `app` se crea al pedirlo (uvicorn app.main:app, from app.main import app)
+    if name == "app":
+        globals()["app"] = application = create_app()
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,294 @@
+"""
+Métricas de validadores y extractores en formato de texto de Prometheus.
+
+Cada función decorada con `instrumented` registra, por llamada, su duración y
+la longitud de la entrada en histogramas de intervalos fijos, y cuántas
+llamadas aceptaron el valor o encontraron coincidencias. Las métricas están
+desactivadas por defecto (el formulario de Streamlit no las usa); la API las
+activa al arrancar.
+
+Si la configuración del proceso las desactiva (`PATRONES_METRICS_ENABLED=0`)
+el decorador retorna la función original al decorar, sin ningún coste por
+llamada; `metrics.enabled` solo activa o pausa el registro en las funciones
+ya instrumentadas.
+
+La acumulación es por hilo: cada hilo escribe solo en sus propios contadores,
+sin locks, y `Metrics.render()` suma los de todos los hilos al exportar.
+Cuando un hilo termina, sus contadores se suman a un agregado de hilos
+retirados y su fragmento se descarta, así que la memoria no crece con los
+hilos que han pasado por el proceso. Las
+métricas son del proceso: en modo de extracción "process" las llamadas que se
+ejecutan dentro de los procesos del pool no aparecen, y con `app.serve` cada
+worker expone en /metrics solo sus propias llamadas. Prometheus debe raspar
+cada worker por separado o sumar las series por instancia; una petición a
+/metrics a través del socket compartido devuelve las de un worker cualquiera.
+"""
+import threading
+import weakref
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.config import get_settings
+
+
+# Límites superiores (inclusive) de los intervalos de duración, en segundos
+DURATION_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001,
+    0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+    0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Límites superiores (inclusive) de los intervalos de longitud, en caracteres.
+# Son potencias de dos: el intervalo se obtiene de `bit_length` sin búsqueda
+LENGTH_BUCKETS = (
+    8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536, 262144, 1048576,
+    4194304, 16777216,
+)
+
+# Tipo de contenido de la exposición de texto de Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Posiciones dentro de la lista de cada serie exportada por `snapshot`
+_CALLS, _SECONDS, _MATCHES, _DURATIONS, _LENGTHS = range(5)
+
+# Cada hilo acumula en una lista plana: segundos, coincidencias, intervalos de
+# duración e intervalos de longitud. Las llamadas son la suma de los
+# intervalos de duración y no se cuentan aparte
+_FLAT_SECONDS, _FLAT_MATCHES, _FLAT_DURATIONS = range(3)
+_FLAT_LENGTHS = _FLAT_DURATIONS + len(DURATION_BUCKETS) + 1
+_FLAT_SIZE = _FLAT_LENGTHS + len(LENGTH_BUCKETS) + 1
+
+# Posición en la lista plana del intervalo de una longitud n, indexada por
+# (n - 1).bit_length(): entre 2**(k-1) y 2**k no hay ningún otro límite
+_LENGTH_SLOTS = tuple(_FLAT_LENGTHS + bisect_left(LENGTH_BUCKETS, 1 << bits)
+                      for bits in range(65))
+
+
+def _new_series() -> List[Any]:
+    return [0, 0.0, 0, [0] * (len(DURATION_BUCKETS) + 1), [0] * (len(LENGTH_BUCKETS) + 1)]
+
+
+def _new_flat_series() -> List[Any]:
+    return [0.0] + [0] * (_FLAT_SIZE - 1)
+
+
+class _ThreadSentinel:
+    """Objeto que vive lo mismo que el hilo que lo guarda."""
+
+    __slots__ = ("__weakref__",)
+
+
+class Metrics:
+    """
+    Acumulador de métricas por función con un fragmento por hilo.
+
+    Args:
+        enabled (bool): Si las funciones instrumentadas registran llamadas
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        # Por hilo, un atributo por función con su serie plana
+        self._local = threading.local()
+        self._shards: List[Dict[str, List[Any]]] = []
+        # Series planas acumuladas por los hilos que ya terminaron
+        self._retired: Dict[str, List[Any]] = {}
+        self._shards_lock = threading.Lock()
+
+    def series(self, name: str) -> List[Any]:
+        """
+        Retorna la serie plana de una función en el fragmento del hilo actual.
+
+        Args:
+            name (str): Nombre de la función
+
+        Returns:
+            List[Any]: Segundos, coincidencias e intervalos de duración y de
+                       longitud
+        """
+        series = getattr(self._local, name, None)
+        if series is None:
+            series = _new_flat_series()
+            setattr(self._local, name, series)
+            with self._shards_lock:
+                shard = getattr(self._local, "__shard__", None)
+                if shard is None:
+                    # Solo la primera serie de cada hilo registra su fragmento
+                    shard = {}
+                    setattr(self._local, "__shard__", shard)
+                    self._shards.append(shard)
+                    # El centinela solo lo referencia el hilo: se libera
+                    # cuando termina y entonces se retira su fragmento
+                    sentinel = _ThreadSentinel()
+                    setattr(self._local, "__sentinel__", sentinel)
+                    weakref.finalize(sentinel, self._retire, shard)
+                shard[name] = series
+        return series
+
+    def _retire(self, shard: Dict[str, List[Any]]) -> None:
+        """Suma el fragmento de un hilo terminado al agregado y lo descarta."""
+        with self._shards_lock:
+            for name, series in shard.items():
+                retired = self._retired.get(name)
+                if retired is None:
+                    self._retired[name] = list(series)
+                else:
+                    for index, value in enumerate(series):
+                        retired[index] += value
+            self._shards = [other for other in self._shards if other is not shard]
+
+    def observe(self, name: str, seconds: float, length: int, matches: int) -> None:
+        """
+        Registra una llamada.
+
+        Args:
+            name (str): Nombre de la función
+            seconds (float): Duración de la llamada
+            length (int): Longitud de la entrada
+            matches (int): Coincidencias encontradas (1/0 en validadores)
+        """
+        series = getattr(self._local, name, None) or self.series(name)
+        series[_FLAT_SECONDS] += seconds
+        series[_FLAT_MATCHES] += matches
+        series[_FLAT_DURATIONS + bisect_left(DURATION_BUCKETS, seconds)] += 1
+        series[_LENGTH_SLOTS[(length - 1).bit_length()]] += 1
+
+    def snapshot(self) -> Dict[str, List[Any]]:
+        """
+        Suma los fragmentos de todos los hilos.
+
+        Returns:
+            Dict[str, List[Any]]: Por función, [llamadas, segundos,
+                                  coincidencias, intervalos de duración,
+                                  intervalos de longitud]
+        """
+        with self._shards_lock:
+            series_list = [(name, list(series))
+                           for shard in self._shards for name, series in shard.items()]
+            series_list.extend((name, list(series)) for name, series in self._retired.items())
+        totals: Dict[str, List[Any]] = {}
+        for name, series in series_list:
+            durations = series[_FLAT_DURATIONS:_FLAT_LENGTHS]
+            calls = sum(durations)
+            if not calls:
+                continue
+            total = totals.get(name)
+            if total is None:
+                total = totals[name] = _new_series()
+            total[_CALLS] += calls
+            total[_SECONDS] += series[_FLAT_SECONDS]
+            total[_MATCHES] += series[_FLAT_MATCHES]
+            for index, count in enumerate(durations):
+                total[_DURATIONS][index] += count
+            for index, count in enumerate(series[_FLAT_LENGTHS:]):
+                total[_LENGTHS][index] += count
+        return totals
+
+    def reset(self) -> None:
+        """Pone a cero todos los contadores."""
+        # Las series se vacían en su sitio: los hilos conservan su referencia
+        with self._shards_lock:
+            for shard in self._shards:
+                for series in shard.values():
+                    series[:] = _new_flat_series()
+            self._retired.clear()
+
+    def render(self) -> str:
+        """
+        Exporta las métricas en formato de texto de Prometheus.
+
+        Returns:
+            str: Exposición con los histogramas de duración y longitud y los
+                 contadores de coincidencias por función
+        """
+        totals = sorted(self.snapshot().items())
+        lines: List[str] = []
+        _render_histogram(
+            lines, "patrones_call_duration_seconds",
+            "Duración de las llamadas a validadores y extractores.",
+            totals, _DURATIONS, _SECONDS, DURATION_BUCKETS,
+        )
+        _render_histogram(
+            lines, "patrones_input_length_chars",
+            "Longitud de la entrada de cada llamada, en caracteres.",
+            totals, _LENGTHS, None, LENGTH_BUCKETS,
+        )
+        lines.append("# HELP patrones_matches_total Valores aceptados (validadores) "
+                     "o coincidencias encontradas (extractores).")
+        lines.append("# TYPE patrones_matches_total counter")
+        for name, series in totals:
+            lines.append(f'patrones_matches_total{{function="{name}"}} {series[_MATCHES]}')
+        return "\n".join(lines) + "\n"
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound)) if isinstance(bound, float) else str(bound)
+
+
+def _render_histogram(lines: List[str], metric: str, help_text: str, totals,
+                      buckets_index: int, sum_index: Optional[int],
+                      bounds: Sequence[float]) -> None:
+    lines.append(f"# HELP {metric} {help_text}")
+    lines.append(f"# TYPE {metric} histogram")
+    for name, series in totals:
+        label = f'function="{name}"'
+        cumulative = 0
+        counts = series[buckets_index]
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            lines.append(f'{metric}_bucket{{{label},le="{_format_bound(bound)}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {series[_CALLS]}')
+        if sum_index is not None:
+            lines.append(f"{metric}_sum{{{label}}} {series[sum_index]!r}")
+        lines.append(f"{metric}_count{{{label}}} {series[_CALLS]}")
+
+
+# Métricas del proceso
+metrics = Metrics()
+
+
+def instrumented(name: str, matches: Optional[Callable[[Any], int]] = None):
+    """
+    Decorador que registra cada llamada de la función en `metrics`.
+
+    La longitud se toma del primer argumento. Si la configuración del proceso
+    desactiva las métricas se retorna la propia función; si no, con
+    `metrics.enabled` a False la función se llama tras una única comprobación.
+
+    Args:
+        name (str): Nombre de la función en las métricas
+        matches: Función que obtiene las coincidencias del resultado (por
+                 defecto 1 si el resultado es verdadero)
+
+    Returns:
+        Callable: Decorador
+    """
+    def decorator(func: Callable) -> Callable:
+        if not get_settings().metrics_enabled:
+            return func
+        local = metrics._local
+
+        @wraps(func)
+        def wrapper(value, *args, **kwargs):
+            if not metrics.enabled:
+                return func(value, *args, **kwargs)
+            start = perf_counter()
+            result = func(value, *args, **kwargs)
+            elapsed = perf_counter() - start
+            # Igual que `Metrics.observe`, sin sus llamadas intermedias
+            series = getattr(local, name, None) or metrics.series(name)
+            series[_FLAT_SECONDS] += elapsed
+            if matches is None:
+                if result:
+                    series[_FLAT_MATCHES] += 1
+            else:
+                series[_FLAT_MATCHES] += matches(result)
+            series[_FLAT_DURATIONS + bisect_left(DURATION_BUCKETS, elapsed)] += 1
+            series[_LENGTH_SLOTS[(len(value) - 1).bit_length() if value else 0]] += 1
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,226 @@
+"""
+Perfilado bajo demanda de peticiones individuales.
+
+`ProfilingMiddleware` está desactivado por defecto. Cuando se activa
+(PATRONES_PROFILING_ENABLED), perfila con cProfile una fracción aleatoria de
+las peticiones (PATRONES_PROFILE_SAMPLE_RATE) y las que llevan la cabecera
+`X-Profile` con el token configurado (PATRONES_PROFILE_TOKEN). Sin token la
+cabecera se ignora: cualquier cliente podría cargar el servidor pidiendo
+perfiles. Cada perfil se guarda como fichero `.prof` de pstats en un
+directorio local que conserva solo los más recientes, y su nombre se devuelve
+en la cabecera `X-Profile-Id` de la respuesta:
+
+    python -m pstats profiles/<X-Profile-Id>
+
+cProfile solo observa el hilo en el que se activa, y el bucle de eventos
+alterna entre peticiones, así que no se perfila el bucle: la petición
+activa se publica en una variable de contexto y `run_profiled` perfila el
+trabajo que se envía al pool de hilos (la extracción, el escaneo por bloques
+y la validación por lotes), que es donde se ejecutan los `validate_*` y las
+llamadas a `re`. Los perfiles de varios hilos de una misma petición se suman.
+
+Los perfiles se capturan de uno en uno en todo el proceso: desde Python 3.12
+cProfile no admite dos perfiladores activos a la vez, aunque sea en hilos
+distintos, así que el trabajo perfilado de peticiones concurrentes se
+serializa (el resto no se ve afectado).
+"""
+import cProfile
+import os
+import pstats
+import random
+import re
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Cabecera que solicita el perfilado de una petición
+PROFILE_HEADER = "x-profile"
+# Cabecera de la respuesta con el nombre del fichero del perfil
+PROFILE_ID_HEADER = "x-profile-id"
+PROFILE_SUFFIX = ".prof"
+
+# Solo un perfilador activo a la vez en el proceso, y ninguno anidado en un
+# hilo que ya se está perfilando
+_profiler_lock = threading.Lock()
+_profiling_thread = threading.local()
+
+
+class RequestProfile:
+    """Perfiles cProfile acumulados durante una petición."""
+
+    def __init__(self):
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Ejecuta `func(*args, **kwargs)` perfilándola en el hilo actual.
+
+        Returns:
+            Any: Resultado de `func`
+        """
+        if getattr(_profiling_thread, "active", False):
+            # Ya lo observa el perfilador de una llamada exterior
+            return func(*args, **kwargs)
+        with _profiler_lock:
+            profiler = cProfile.Profile()
+            _profiling_thread.active = True
+            profiler.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                _profiling_thread.active = False
+                with self._lock:
+                    self._profiles.append(profiler)
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """
+        Suma los perfiles capturados.
+
+        Returns:
+            Optional[pstats.Stats]: Estadísticas combinadas, o None si la
+                                    petición no ejecutó nada perfilado
+        """
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profiler in profiles[1:]:
+            stats.add(profiler)
+        return stats
+
+
+_active_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "patrones_active_profile", default=None
+)
+
+
+def active_profile() -> Optional[RequestProfile]:
+    """Retorna el perfil de la petición en curso, si se está perfilando."""
+    return _active_profile.get()
+
+
+def run_profiled(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Ejecuta `func(*args, **kwargs)`, perfilándola si la petición en curso se
+    está perfilando. Debe llamarse dentro del hilo que hace el trabajo (el
+    pool de hilos copia la variable de contexto de la petición).
+
+    Returns:
+        Any: Resultado de `func`
+    """
+    profile = _active_profile.get()
+    if profile is None:
+        return func(*args, **kwargs)
+    return profile.call(func, *args, **kwargs)
+
+
+# =============================================================================
+# ALMACENAMIENTO DE PERFILES
+# =============================================================================
+
+def profile_name(method: str, path: str) -> str:
+    """
+    Nombre del fichero de un perfil. Empieza por la marca de tiempo en ns,
+    de modo que el orden alfabético es el orden de creación.
+
+    Args:
+        method (str): Método HTTP
+        path (str): Ruta de la petición
+
+    Returns:
+        str: Nombre del fichero
+    """
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+    return f"{time.time_ns()}-{method.lower()}-{slug}{PROFILE_SUFFIX}"
+
+
+def write_profile(stats: pstats.Stats, directory: str, name: str, retention: int) -> str:
+    """
+    Guarda el perfil y elimina los más antiguos por encima de `retention`.
+
+    Args:
+        stats (pstats.Stats): Estadísticas a guardar
+        directory (str): Directorio de perfiles
+        name (str): Nombre del fichero
+        retention (int): Número máximo de perfiles que se conservan
+
+    Returns:
+        str: Ruta del fichero escrito
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    stats.dump_stats(path)
+    profiles = sorted(entry for entry in os.listdir(directory) if entry.endswith(PROFILE_SUFFIX))
+    for stale in profiles[:max(len(profiles) - retention, 0)]:
+        try:
+            os.remove(os.path.join(directory, stale))
+        except OSError:
+            pass
+    return path
+
+
+# =============================================================================
+# MIDDLEWARE
+# =============================================================================
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que perfila peticiones seleccionadas.
+
+    Args:
+        app (ASGIApp): Aplicación envuelta
+        directory (str): Directorio donde se guardan los perfiles
+        sample_rate (float): Fracción de peticiones perfiladas al azar
+        retention (int): Número máximo de perfiles que se conservan
+        token (str): Valor de la cabecera `X-Profile` que pide un perfil
+                     (vacío = la cabecera se ignora)
+    """
+
+    def __init__(self, app: ASGIApp, directory: str = "profiles",
+                 sample_rate: float = 0.0, retention: int = 20, token: str = ""):
+        self.app = app
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.retention = retention
+        self.token = token
+
+    def should_profile(self, scope: Scope) -> bool:
+        if self.token:
+            requested = Headers(scope=scope).get(PROFILE_HEADER)
+            if requested is not None and secrets.compare_digest(
+                    requested.strip().encode(), self.token.encode()):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        name = profile_name(scope["method"], scope["path"])
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = name
+            await send(message)
+
+        profile = RequestProfile()
+        token = _active_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _active_profile.reset(token)
+            stats = profile.stats()
+            if stats is not None:
+                await run_in_threadpool(write_profile, stats, self.directory, name,
+                                        self.retention)
@@ -1 +1,22 @@
+from typing import Dict, List, Optional
 
+from pydantic import BaseModel, Field
+
+
+# Número máximo de registros aceptados en una validación por lotes
+MAX_BATCH_RECORDS = 100_000
+# Valores más frecuentes por tipo que se pueden pedir en una agregación
+MAX_TOP_K = 1000
+
+
+class TextRequest(BaseModel):
+    text: str
+
+
+class AggregateRequest(BaseModel):
+    text: str
+    top_k: int = Field(10, ge=1, le=MAX_TOP_K)
+
+
+class BatchValidationRequest(BaseModel):
+    records: List[Dict[str, Optional[str]]] = Field(..., max_length=MAX_BATCH_RECORDS)
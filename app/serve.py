@@ -0,0 +1,469 @@
+"""
+Servidor de producción con workers preforkados.
+
+    python -m app.serve --host 0.0.0.0 --port 8000
+
+El proceso maestro construye la aplicación (`create_app`), compila los
+patrones, elige sus motores y ejecuta cada validador una vez
+(`warm_patterns`). Después congela el recolector de basura (`gc.freeze`),
+abre el socket y crea los workers con `fork`. Así cada worker hereda el
+registro ya compilado y lo comparte con los demás copy-on-write: la
+colección de basura no vuelve a tocar los objetos congelados, de modo que
+sus páginas no se copian. Cada worker sirve el mismo socket con uvicorn y
+ejecuta su propio lifespan, que solo carga el índice de duplicados (las
+conexiones a la base de datos no se comparten entre procesos) y arranca el
+ejecutor de extracción.
+
+Con el escaneo de `re` reteniendo el GIL, un único proceso usa un núcleo; con
+un worker por núcleo (`PATRONES_SERVER_WORKERS=0`, el valor por defecto) la
+máquina entera atiende peticiones. En este modo conviene dejar
+`PATRONES_EXTRACTION_MODE=thread`: el pool de procesos de cada worker
+multiplicaría los procesos por núcleo.
+
+Señales del maestro:
+
+- `SIGTERM` / `SIGINT`: parada ordenada; cada worker deja de aceptar
+  conexiones y termina sus peticiones en `server_graceful_timeout` segundos.
+- `SIGHUP`: reinicio escalonado. Los workers se sustituyen de uno en uno: se
+  crea el nuevo y, cuando su lifespan termina, se detiene uno antiguo, de
+  modo que siempre hay workers atendiendo. Los nuevos parten del estado del
+  maestro: recargan la base de datos, no el código.
+
+Un worker que muere se sustituye. Si el sustituto no llega a estar listo, el
+siguiente intento espera el doble que el anterior (desde `RESPAWN_BACKOFF`
+hasta `RESPAWN_BACKOFF_MAX` segundos) y, tras `MAX_STARTUP_FAILURES` fallos
+seguidos, el maestro detiene los workers y termina con código 1 para que lo
+reinicie su supervisor. Requiere `fork` (Linux o macOS).
+"""
+import argparse
+import gc
+import importlib.util
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional, Set
+
+import uvicorn
+from fastapi import FastAPI
+
+from app.config import Settings, get_settings
+
+
+logger = logging.getLogger(__name__)
+
+LOOPS = ("auto", "uvloop", "asyncio")
+HTTP_PROTOCOLS = ("auto", "httptools", "h11")
+
+# Segundos que el maestro espera a que un worker nuevo esté listo
+WORKER_START_TIMEOUT = 120.0
+
+# Espera antes de reintentar tras un arranque fallido (se dobla con cada
+# fallo seguido) y su máximo, en segundos
+RESPAWN_BACKOFF = 0.5
+RESPAWN_BACKOFF_MAX = 30.0
+
+# Arranques fallidos seguidos tras los cuales el maestro termina
+MAX_STARTUP_FAILURES = 5
+
+
+def available_cores() -> int:
+    """Núcleos que puede usar el proceso (respeta la afinidad de CPU)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS
+        return os.cpu_count() or 1
+
+
+def resolve_loop(loop: str) -> str:
+    """
+    Elige el bucle de eventos: "auto" usa uvloop si está instalado.
+
+    Raises:
+        ValueError: Si el bucle no existe o no está instalado
+    """
+    if loop not in LOOPS:
+        raise ValueError(f"Bucle de eventos desconocido: {loop}")
+    installed = importlib.util.find_spec("uvloop") is not None
+    if loop == "auto":
+        return "uvloop" if installed else "asyncio"
+    if loop == "uvloop" and not installed:
+        raise ValueError("El bucle uvloop requiere el paquete uvloop")
+    return loop
+
+
+def resolve_http(http: str) -> str:
+    """
+    Elige el protocolo HTTP: "auto" usa httptools si está instalado.
+
+    Raises:
+        ValueError: Si el protocolo no existe o no está instalado
+    """
+    if http not in HTTP_PROTOCOLS:
+        raise ValueError(f"Protocolo HTTP desconocido: {http}")
+    installed = importlib.util.find_spec("httptools") is not None
+    if http == "auto":
+        return "httptools" if installed else "h11"
+    if http == "httptools" and not installed:
+        raise ValueError("El protocolo httptools requiere el paquete httptools")
+    return http
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Abre el socket de escucha que comparten todos los workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class _WorkerServer(uvicorn.Server):
+    """Servidor uvicorn que avisa al maestro cuando termina su lifespan."""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        await super().startup(sockets)
+        if self.started:
+            os.write(self.ready_fd, b"1")
+        os.close(self.ready_fd)
+
+
+class PreforkServer:
+    """
+    Proceso maestro que crea, vigila y reinicia los workers.
+
+    Args:
+        app (FastAPI): Aplicación ya construida (y precalentada)
+        sock (socket.socket): Socket de escucha compartido
+        workers (int): Workers que se mantienen en marcha
+        loop (str): Bucle de eventos de uvicorn ("uvloop" o "asyncio")
+        http (str): Protocolo HTTP de uvicorn ("httptools" o "h11")
+        graceful_timeout (float): Segundos que un worker tiene para terminar
+                                  sus peticiones al detenerse
+        backoff (float): Espera tras el primer arranque fallido seguido
+        max_backoff (float): Espera máxima entre arranques fallidos
+        max_startup_failures (int): Arranques fallidos seguidos tras los
+                                    cuales el maestro termina
+    """
+
+    def __init__(self, app: FastAPI, sock: socket.socket, workers: int,
+                 loop: str = "asyncio", http: str = "h11", graceful_timeout: float = 30.0,
+                 backoff: float = RESPAWN_BACKOFF, max_backoff: float = RESPAWN_BACKOFF_MAX,
+                 max_startup_failures: int = MAX_STARTUP_FAILURES):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.loop = loop
+        self.http = http
+        self.graceful_timeout = graceful_timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_startup_failures = max_startup_failures
+        # Arranques fallidos seguidos al sustituir workers
+        self.startup_failures = 0
+        # pid -> descriptor de lectura del aviso de arranque
+        self.children: Dict[int, int] = {}
+        # Workers detenidos por el maestro (su salida no es un fallo)
+        self._retiring: Set[int] = set()
+        self._stopping = False
+        self._restart = False
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+
+    # -------------------------------------------------------------------------
+    # WORKERS
+    # -------------------------------------------------------------------------
+
+    def spawn(self) -> int:
+        """Crea un worker y retorna su pid (sin esperar a que arranque)."""
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            code = 1
+            try:
+                self._run_worker(ready_w)
+                code = 0
+            except BaseException:
+                logger.exception("El worker %s terminó con un error", os.getpid())
+            finally:
+                os._exit(code)
+        os.close(ready_w)
+        self.children[pid] = ready_r
+        return pid
+
+    def _run_worker(self, ready_fd: int) -> None:
+        # Las señales del maestro no aplican al worker: uvicorn instala las suyas
+        signal.set_wakeup_fd(-1)
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+        for fd in self.children.values():
+            os.close(fd)
+        self.children = {}
+        config = uvicorn.Config(
+            self.app,
+            loop=self.loop,
+            http=self.http,
+            lifespan="on",
+            timeout_graceful_shutdown=self.graceful_timeout,
+        )
+        _WorkerServer(config, ready_fd).run(sockets=[self.sock])
+
+    def wait_ready(self, pid: int, timeout: float = WORKER_START_TIMEOUT) -> bool:
+        """
+        Espera a que el worker termine su lifespan.
+
+        Returns:
+            bool: False si murió o no arrancó a tiempo
+        """
+        fd = self.children.get(pid)
+        if fd is None:
+            return False
+        deadline = time.monotonic() + timeout
+        while not self._stopping:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([fd], [], [], min(remaining, 1.0))
+            if readable:
+                return os.read(fd, 1) == b"1"
+        return False
+
+    def stop_worker(self, pid: int, timeout: Optional[float] = None) -> None:
+        """Detiene un worker con SIGTERM y, si no termina a tiempo, SIGKILL."""
+        self._retiring.add(pid)
+        self._signal(pid, signal.SIGTERM)
+        if not self._wait_exit([pid], self.graceful_timeout + 5 if timeout is None else timeout):
+            self._signal(pid, signal.SIGKILL)
+            self._wait_exit([pid], None)
+
+    def reap(self) -> List[int]:
+        """Recoge los workers terminados y retorna sus pids."""
+        reaped = []
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            fd = self.children.pop(pid, None)
+            if fd is not None:
+                os.close(fd)
+                reaped.append(pid)
+                if not self._stopping and pid not in self._retiring:
+                    logger.warning("El worker %s terminó con el estado %s",
+                                   pid, os.waitstatus_to_exitcode(status))
+                self._retiring.discard(pid)
+        return reaped
+
+    def _wait_exit(self, pids: List[int], timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while any(pid in self.children for pid in pids):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self.reap()
+            time.sleep(0.05)
+        return True
+
+    def _signal(self, pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    # -------------------------------------------------------------------------
+    # MAESTRO
+    # -------------------------------------------------------------------------
+
+    def rolling_restart(self) -> bool:
+        """
+        Sustituye los workers de uno en uno.
+
+        Returns:
+            bool: False si un worker nuevo no arrancó (los antiguos que
+                  quedan siguen en marcha)
+        """
+        for old in list(self.children):
+            if self._stopping:
+                return False
+            new = self.spawn()
+            if not self.wait_ready(new):
+                logger.error("El worker %s no arrancó; se cancela el reinicio", new)
+                self.stop_worker(new, timeout=5)
+                return False
+            self.stop_worker(old)
+        logger.info("Reinicio escalonado completado: %s workers", len(self.children))
+        return True
+
+    def run(self) -> int:
+        """
+        Arranca los workers y los vigila hasta recibir SIGTERM o SIGINT.
+
+        Returns:
+            int: Código de salida del maestro
+        """
+        signal.set_wakeup_fd(self._wakeup_w)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_restart)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+        started = [self.spawn() for _ in range(self.workers)]
+        if not all(self.wait_ready(pid) for pid in started):
+            logger.error("No arrancaron todos los workers")
+            self.shutdown()
+            return 1
+        logger.info("Maestro %s con %s workers (loop=%s, http=%s)",
+                    os.getpid(), self.workers, self.loop, self.http)
+
+        while not self._stopping:
+            select.select([self._wakeup_r], [], [], 1.0)
+            self._drain_wakeup()
+            self.reap()
+            if self._restart:
+                self._restart = False
+                self.rolling_restart()
+            if not self.respawn():
+                logger.error("%s arranques fallidos seguidos; el maestro termina",
+                             self.startup_failures)
+                self.shutdown()
+                return 1
+        self.shutdown()
+        return 0
+
+    def respawn(self) -> bool:
+        """
+        Crea workers hasta volver a tener `workers`, esperando cada vez más
+        entre arranques fallidos seguidos.
+
+        Returns:
+            bool: False si se alcanzó `max_startup_failures`
+        """
+        while not self._stopping and len(self.children) < self.workers:
+            if self.startup_failures:
+                delay = min(self.backoff * 2 ** (self.startup_failures - 1), self.max_backoff)
+                logger.warning("Nuevo intento de arranque en %.1f s", delay)
+                self._pause(delay)
+                if self._stopping:
+                    break
+            pid = self.spawn()
+            logger.info("Worker %s creado para sustituir a uno terminado", pid)
+            if self.wait_ready(pid):
+                self.startup_failures = 0
+                continue
+            if self._stopping:
+                break
+            self.startup_failures += 1
+            logger.error("El worker %s no arrancó (%s fallos seguidos)",
+                         pid, self.startup_failures)
+            # Si no murió, no llegó a estar listo a tiempo
+            self.stop_worker(pid, timeout=5)
+            if self.startup_failures >= self.max_startup_failures:
+                return False
+        return True
+
+    def _pause(self, seconds: float) -> None:
+        # Espera interrumpible por SIGTERM; las demás señales no la acortan
+        deadline = time.monotonic() + seconds
+        while not self._stopping:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            select.select([self._wakeup_r], [], [], remaining)
+            self._drain_wakeup()
+
+    def shutdown(self) -> None:
+        """Detiene todos los workers de forma ordenada."""
+        self._stopping = True
+        pids = list(self.children)
+        for pid in pids:
+            self._signal(pid, signal.SIGTERM)
+        if not self._wait_exit(pids, self.graceful_timeout + 5):
+            for pid in list(self.children):
+                self._signal(pid, signal.SIGKILL)
+            self._wait_exit(pids, None)
+
+    def _drain_wakeup(self) -> None:
+        try:
+            while os.read(self._wakeup_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _handle_restart(self, signum, frame) -> None:
+        self._restart = True
+
+
+def prepare_app(settings: Settings) -> FastAPI:
+    """
+    Construye y precalienta la aplicación en el maestro, y congela el
+    recolector para que los workers compartan ese estado.
+
+    Args:
+        settings (Settings): Configuración
+
+    Returns:
+        FastAPI: Aplicación lista para servirse desde los workers
+    """
+    from app.main import create_app
+    from app.startup import warm_patterns
+
+    app = create_app(settings)
+    if settings.warmup_enabled:
+        warm_patterns(app.state.startup)
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="python -m app.serve",
+        description="Sirve la API con workers preforkados que comparten los patrones compilados.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.server_workers,
+                        help="Workers (0 = núcleos disponibles; por defecto %(default)s)")
+    parser.add_argument("--loop", choices=LOOPS, default=settings.server_loop)
+    parser.add_argument("--http", choices=HTTP_PROTOCOLS, default=settings.server_http)
+    parser.add_argument("--graceful-timeout", type=float, default=settings.server_graceful_timeout,
+                        help="Segundos para terminar las peticiones al detener un worker")
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "fork"):
+        parser.error("app.serve requiere fork; en este sistema use uvicorn app.main:app")
+    try:
+        loop = resolve_loop(args.loop)
+        http = resolve_http(args.http)
+    except ValueError as exc:
+        parser.error(str(exc))
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     [%(process)d] %(message)s")
+
+    app = prepare_app(settings)
+    sock = bind_socket(args.host, args.port)
+    workers = args.workers if args.workers > 0 else available_cores()
+    logger.info("Sirviendo en http://%s:%s", *sock.getsockname()[:2])
+    return PreforkServer(app, sock, workers, loop=loop, http=http,
+                         graceful_timeout=args.graceful_timeout).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Agregación de entidades: valores distintos con su número de apariciones.
+
+`EntityAggregator` cuenta cada entidad normalizada a medida que el escáner
+la encuentra y nunca guarda la lista de coincidencias: la memoria depende de
+los valores distintos, no del total. Además de los tipos del escáner cuenta
+los dominios de los emails (`email_domain`) y los hosts de las URLs
+(`url_host`). El resultado incluye, por tipo, los `top_k` valores más
+frecuentes, elegidos con un heap acotado (`heapq.nlargest`); a igual número
+de apariciones va antes el que apareció primero.
+
+Normalización: emails, dominios y hosts en minúsculas, DNIs en mayúsculas y
+en las URLs el esquema y el host en minúsculas (la ruta distingue
+mayúsculas). El resto se cuenta tal cual.
+"""
+import heapq
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.metrics import instrumented
+from app.services.extractor import ENTITY_TYPES, iter_entities
+
+
+DEFAULT_TOP_K = 10
+
+
+def email_domain(email: str) -> str:
+    """Dominio de un email, en minúsculas."""
+    return email.rpartition("@")[2].lower()
+
+
+def url_host(url: str) -> str:
+    """Host de una URL, en minúsculas y sin usuario ni puerto."""
+    rest = url.partition("://")[2]
+    for separator in "/?#":
+        rest = rest.partition(separator)[0]
+    return rest.rpartition("@")[2].partition(":")[0].lower()
+
+
+def normalize_url(url: str) -> str:
+    """URL con el esquema y el host (con usuario y puerto) en minúsculas."""
+    scheme, _, rest = url.partition("://")
+    cut = min((index for index in map(rest.find, "/?#") if index >= 0), default=len(rest))
+    return f"{scheme.lower()}://{rest[:cut].lower()}{rest[cut:]}"
+
+
+NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    "email": str.lower,
+    "url": normalize_url,
+    "dni": str.upper,
+}
+
+# Tipos derivados: (tipo de origen, función que extrae el valor)
+DERIVED_TYPES: Dict[str, Tuple[str, Callable[[str], str]]] = {
+    "email_domain": ("email", email_domain),
+    "url_host": ("url", url_host),
+}
+
+
+class EntityAggregator:
+    """
+    Contadores de valores distintos por tipo de entidad.
+
+    Args:
+        top_k (int): Valores más frecuentes que se retornan por tipo
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        self.top_k = top_k
+        self.count = 0
+        self.counters: Dict[str, Counter] = {
+            kind: Counter() for kind in ENTITY_TYPES + tuple(DERIVED_TYPES)
+        }
+        # Por tipo de origen: (tipo derivado, extractor) que se cuentan con él
+        self._derived: Dict[str, Tuple[Tuple[str, Callable[[str], str]], ...]] = {
+            kind: tuple((derived, func) for derived, (source, func) in DERIVED_TYPES.items()
+                        if source == kind)
+            for kind in ENTITY_TYPES
+        }
+
+    def add(self, kind: str, value: str) -> None:
+        """
+        Cuenta una entidad.
+
+        Args:
+            kind (str): Tipo de entidad
+            value (str): Valor tal como aparece en el texto
+        """
+        normalize = NORMALIZERS.get(kind)
+        self.counters[kind][normalize(value) if normalize else value] += 1
+        for derived, func in self._derived[kind]:
+            self.counters[derived][func(value)] += 1
+        self.count += 1
+
+    def update(self, entities: Iterable[Tuple[str, str, int, int]]) -> "EntityAggregator":
+        """
+        Cuenta las entidades (tipo, valor, inicio, fin) de un recorrido.
+
+        Returns:
+            EntityAggregator: El propio agregador
+        """
+        add = self.add
+        for kind, value, _, _ in entities:
+            add(kind, value)
+        return self
+
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resumen por tipo: apariciones, valores distintos y los más frecuentes.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: {"count", "distinct", "top"} por tipo,
+                con "top" como lista de {"value", "count"}
+        """
+        return {
+            kind: {
+                "count": sum(counter.values()),
+                "distinct": len(counter),
+                "top": [{"value": value, "count": count} for value, count in
+                        heapq.nlargest(self.top_k, counter.items(), key=lambda item: item[1])],
+            }
+            for kind, counter in self.counters.items()
+        }
+
+
+@instrumented("aggregate_entities", matches=lambda result: result["count"])
+def aggregate_entities(text: str, top_k: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Recorre el texto una vez y agrega sus entidades sin guardar la lista.
+
+    Args:
+        text (str): Texto del cual extraer entidades
+        top_k (int, optional): Valores más frecuentes por tipo (por defecto
+                               DEFAULT_TOP_K)
+
+    Returns:
+        Dict[str, Any]: Total de entidades y resumen por tipo
+    """
+    aggregator = EntityAggregator(DEFAULT_TOP_K if top_k is None else top_k)
+    if text:
+        aggregator.update(iter_entities(text))
+    return {
+        "status": "ok",
+        "input_length": len(text) if text else 0,
+        "count": aggregator.count,
+        "types": aggregator.result(),
+    }
@@ -0,0 +1,218 @@
+"""
+Extracción de entidades sobre ficheros grandes, fuera de la API.
+
+El fichero se proyecta en memoria con `mmap` y se divide en bloques de
+`chunk_size` bytes que procesan en paralelo los procesos de un pool. Cada
+proceso proyecta el fichero por su cuenta y recorre su bloque con la versión
+en bytes del escáner combinado; solo devuelve (tipo, inicio, fin) de cada
+entidad, de modo que el texto nunca se copia entre procesos y la memoria no
+depende del tamaño del fichero: hay como mucho `2 * workers` bloques en curso.
+
+Todos los patrones usan solo clases de caracteres ASCII, así que el escáner
+en bytes encuentra en UTF-8 exactamente las mismas entidades que `extract_all`
+sobre el texto decodificado, con posiciones en bytes.
+
+Unión de bloques: cada proceso escanea hasta `STREAM_OVERLAP` bytes más allá
+del final de su bloque (para que el delimitador final vea el byte siguiente)
+y solo informa de las entidades que empiezan dentro del bloque. Si la última
+entidad de un bloque termina dentro del siguiente, el proceso principal
+vuelve a escanear desde su final hasta coincidir con una entidad ya
+encontrada por el bloque siguiente; desde ahí ambos recorridos son idénticos.
+Así ninguna entidad de hasta `MAX_ENTITY_LENGTH` bytes se duplica ni se
+pierde en una frontera.
+"""
+import json
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from app.services.extractor import EntityScanner
+from app.services.streaming import STREAM_OVERLAP
+
+
+# Escáner combinado sobre bytes, con prefiltro por literales
+ENTITY_SCANNER_BYTES = EntityScanner(as_bytes=True)
+
+# Tamaño por defecto de cada bloque
+DEFAULT_CHUNK_SIZE = 64 << 20
+
+# Entidad de un bloque: (tipo, inicio, fin) en bytes
+Span = Tuple[str, int, int]
+
+
+def plan_chunks(size: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Divide un fichero en bloques contiguos.
+
+    Args:
+        size (int): Tamaño del fichero en bytes
+        chunk_size (int): Tamaño de cada bloque
+
+    Returns:
+        List[Tuple[int, int]]: (inicio, fin) de cada bloque
+    """
+    return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+
+def scan_spans(buffer, start: int, end: int, endpos: int) -> List[Span]:
+    """
+    Entidades que empiezan en [start, end), buscando hasta `endpos`.
+
+    Args:
+        buffer: Bytes o mmap del fichero completo
+        start (int): Inicio del bloque
+        end (int): Fin del bloque
+        endpos (int): Límite de la búsqueda (fin del bloque más el solape)
+
+    Returns:
+        List[Span]: (tipo, inicio, fin) de cada entidad
+    """
+    spans: List[Span] = []
+    for match in ENTITY_SCANNER_BYTES.finditer(buffer, start, endpos):
+        if match.start() >= end:
+            break
+        spans.append((match.lastgroup, match.start(), match.end()))
+    return spans
+
+
+def stitch(buffer, previous_end: int, spans: List[Span], end: int, endpos: int) -> List[Span]:
+    """
+    Corrige las entidades de un bloque cuando la última entidad del bloque
+    anterior termina dentro de él.
+
+    Args:
+        buffer: Bytes o mmap del fichero completo
+        previous_end (int): Fin de la última entidad ya emitida
+        spans (List[Span]): Entidades del bloque escaneado desde su inicio
+        end (int): Fin del bloque
+        endpos (int): Límite de la búsqueda del bloque
+
+    Returns:
+        List[Span]: Entidades del bloque tal como las daría un recorrido
+                    secuencial del fichero completo
+    """
+    if not spans or spans[0][1] >= previous_end:
+        return spans
+    positions: Dict[Tuple[int, int], int] = {
+        (span_start, span_end): index for index, (_, span_start, span_end) in enumerate(spans)
+    }
+    stitched: List[Span] = []
+    for match in ENTITY_SCANNER_BYTES.finditer(buffer, previous_end, endpos):
+        if match.start() >= end:
+            break
+        index = positions.get(match.span())
+        if index is not None:
+            return stitched + spans[index:]
+        stitched.append((match.lastgroup, match.start(), match.end()))
+    return stitched
+
+
+# =============================================================================
+# PROCESOS DEL POOL
+# =============================================================================
+
+_worker_map: Optional[mmap.mmap] = None
+
+
+def _open_map(path: str) -> Optional[mmap.mmap]:
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _init_worker(path: str) -> None:
+    global _worker_map
+    _worker_map = _open_map(path)
+
+
+def _scan_chunk(start: int, end: int, endpos: int) -> List[Span]:
+    return scan_spans(_worker_map, start, end, endpos)
+
+
+# =============================================================================
+# EXTRACCIÓN DE UN FICHERO
+# =============================================================================
+
+def iter_file_entities(path: str, workers: int = 0,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, bytes, int, int]]:
+    """
+    Recorre un fichero y produce sus entidades en orden.
+
+    Args:
+        path (str): Ruta del fichero
+        workers (int): Procesos del pool (0 = núcleos disponibles; 1 = sin
+                       pool, en el proceso actual)
+        chunk_size (int): Tamaño de cada bloque en bytes
+
+    Yields:
+        Tuple[str, bytes, int, int]: (tipo, valor, inicio, fin) con
+                                     posiciones en bytes
+    """
+    buffer = _open_map(path)
+    if buffer is None:
+        return
+    try:
+        size = len(buffer)
+        chunks = plan_chunks(size, max(chunk_size, STREAM_OVERLAP))
+        workers = workers or os.cpu_count() or 1
+        previous_end = 0
+        for (start, end, endpos), spans in _scan_chunks(path, buffer, chunks, size, workers):
+            spans = stitch(buffer, previous_end, spans, end, endpos)
+            for kind, span_start, span_end in spans:
+                yield kind, buffer[span_start:span_end], span_start, span_end
+            if spans:
+                previous_end = max(previous_end, spans[-1][2])
+    finally:
+        buffer.close()
+
+
+def _scan_chunks(path: str, buffer, chunks: List[Tuple[int, int]], size: int, workers: int):
+    tasks = [(start, end, min(end + STREAM_OVERLAP, size)) for start, end in chunks]
+    if workers == 1 or len(tasks) == 1:
+        for task in tasks:
+            yield task, scan_spans(buffer, *task)
+        return
+    # Como mucho 2 * workers bloques en curso: los resultados se consumen en
+    # orden y no se acumulan aunque la escritura vaya más lenta
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(path,)) as pool:
+        pending = deque()
+        remaining = iter(tasks)
+        for task in remaining:
+            pending.append((task, pool.submit(_scan_chunk, *task)))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            task, future = pending.popleft()
+            next_task = next(remaining, None)
+            if next_task is not None:
+                pending.append((next_task, pool.submit(_scan_chunk, *next_task)))
+            yield task, future.result()
+
+
+def write_jsonl(entities: Iterator[Tuple[str, bytes, int, int]], output: BinaryIO) -> int:
+    """
+    Escribe las entidades como JSONL con posiciones en bytes.
+
+    Args:
+        entities: (tipo, valor, inicio, fin) de cada entidad
+        output (BinaryIO): Destino binario
+
+    Returns:
+        int: Número de entidades escritas
+    """
+    count = 0
+    lines: List[str] = []
+    for kind, value, start, end in entities:
+        lines.append(json.dumps({"type": kind, "value": value.decode("ascii"),
+                                 "start": start, "end": end}))
+        count += 1
+        if len(lines) >= 4096:
+            output.write(("\n".join(lines) + "\n").encode("utf-8"))
+            lines.clear()
+    if lines:
+        output.write(("\n".join(lines) + "\n").encode("utf-8"))
+    return count
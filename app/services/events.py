@@ -0,0 +1,113 @@
+"""
+Extracción con Server-Sent Events para mostrar resultados mientras se escanea.
+
+`iter_events` recorre el texto por tramos de `slice_chars` caracteres con un
+`StreamingExtractor` y, tras cada tramo, envía las entidades ya definitivas
+(en eventos `entities` de hasta `batch_size` entidades) y un evento
+`progress` con los caracteres escaneados y el total. El último evento es
+`done`, con el mismo resumen que `/api/v1/extract/stream`. Así el cliente
+recibe las primeras entidades tras escanear el primer tramo, no el documento
+completo.
+
+Formato de cada evento:
+
+    event: entities
+    data: [{"type": "email", "value": "a@b.co", "start": 10, "end": 16}]
+
+    event: progress
+    data: {"scanned": 65536, "total": 1048576}
+
+    event: done
+    data: {"status": "ok", "input_length": 1048576, "count": 42}
+"""
+import json
+from typing import Any, AsyncIterator, List
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+
+from app.services.streaming import Entity, StreamingExtractor
+
+
+# Caracteres escaneados entre dos eventos `progress`
+SSE_SLICE_CHARS = 1 << 16
+# Entidades por evento `entities` como máximo
+SSE_BATCH_SIZE = 100
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """
+    Codifica un evento SSE con datos JSON.
+
+    Args:
+        event (str): Nombre del evento
+        data (Any): Datos serializables con JSON
+
+    Returns:
+        bytes: Evento terminado en línea en blanco
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+def _entity_events(entities: List[Entity], batch_size: int) -> bytes:
+    return b"".join(
+        sse_event("entities", [
+            {"type": kind, "value": value, "start": start, "end": end}
+            for kind, value, start, end in entities[index:index + batch_size]
+        ])
+        for index in range(0, len(entities), batch_size)
+    )
+
+
+def _scan_slice(extractor: StreamingExtractor, text: str, start: int, end: int) -> List[Entity]:
+    if end >= len(text):
+        return extractor.feed(text[start:end]) + extractor.finish()
+    return extractor.feed(text[start:end])
+
+
+async def iter_events(text: str, slice_chars: int = SSE_SLICE_CHARS,
+                      batch_size: int = SSE_BATCH_SIZE) -> AsyncIterator[bytes]:
+    """
+    Escanea el texto por tramos y produce los eventos SSE.
+
+    El escaneo de cada tramo se ejecuta en el pool de hilos para no bloquear
+    el bucle de eventos.
+
+    Args:
+        text (str): Texto en el cual buscar
+        slice_chars (int): Caracteres escaneados por tramo
+        batch_size (int): Entidades por evento `entities` como máximo
+
+    Yields:
+        bytes: Eventos `entities`, `progress` y, al final, `done`
+    """
+    from app.profiling import run_profiled
+
+    total = len(text)
+    # Cada tramo se escanea entero al recibirlo: solo se retienen las
+    # entidades que pueden continuar en el tramo siguiente
+    extractor = StreamingExtractor(min_scan_chars=0)
+    for start in range(0, total, slice_chars):
+        end = min(start + slice_chars, total)
+        entities = await run_in_threadpool(run_profiled, _scan_slice, extractor, text, start, end)
+        yield _entity_events(entities, batch_size) + sse_event(
+            "progress", {"scanned": end, "total": total})
+    summary = {"status": "ok", "input_length": total, "count": extractor.count}
+    yield sse_event("done", summary)
+
+
+class ExtractionEventResponse(StreamingResponse):
+    """
+    Respuesta `text/event-stream` con la extracción de un texto.
+
+    Args:
+        text (str): Texto en el cual buscar
+    """
+
+    def __init__(self, text: str) -> None:
+        super().__init__(
+            iter_events(text),
+            media_type="text/event-stream",
+            # Sin caché ni búfer en proxies: cada evento debe llegar al enviarse
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
@@ -0,0 +1,210 @@
+"""
+Ejecución de la extracción fuera del bucle de eventos.
+
+En modo "thread" la extracción corre en el pool de hilos de Starlette, igual
+que un endpoint síncrono. En modo "process" se envía a un pool de procesos
+precalentado: el escaneo con `re` retiene el GIL, así que solo con procesos
+las peticiones grandes concurrentes aprovechan varios núcleos.
+"""
+import asyncio
+import codecs
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import Settings, get_settings
+from app.services.extractor import SCANNER, extract_all
+
+
+MODE_THREAD = "thread"
+MODE_PROCESS = "process"
+
+# Texto entregado a un proceso: directamente, o como (nombre, tamaño) de un
+# bloque de memoria compartida con el texto codificado en UTF-8
+Payload = Union[str, Tuple[str, int]]
+
+
+# =============================================================================
+# FUNCIONES EJECUTADAS EN LOS PROCESOS DEL POOL
+# =============================================================================
+
+def _warm_worker() -> None:
+    """
+    Inicializador de cada proceso: fuerza la compilación de los patrones,
+    elige el motor de los de forma fija y ejecuta una extracción de prueba
+    antes de recibir trabajo real.
+    """
+    from app.validators.patterns import registry, select_matchers
+
+    registry.compile_all()
+    select_matchers()
+    SCANNER.search("warm@up.co")
+    extract_all("warm@up.co +573001234567")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _read_payload(payload: Payload) -> str:
+    if isinstance(payload, str):
+        return payload
+    name, size = payload
+    # El proceso padre es el dueño del bloque y lo libera con unlink(); aquí
+    # solo se adjunta, se decodifica una vez y se cierra.
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return codecs.decode(block.buf[:size], "utf-8")
+    finally:
+        block.close()
+
+
+def _run_in_worker(func: Callable[[str], Any], payload: Payload) -> Any:
+    return func(_read_payload(payload))
+
+
+# =============================================================================
+# EJECUTOR
+# =============================================================================
+
+class ExtractionExecutor:
+    """
+    Despacha el trabajo de extracción al pool de hilos o de procesos.
+
+    Args:
+        mode (str): "thread" o "process"
+        workers (int): Número de procesos (0 = núcleos disponibles)
+        shared_memory_threshold (int): Bytes a partir de los cuales el texto
+            se entrega por memoria compartida en lugar de serializarlo
+    """
+
+    def __init__(self, mode: str = MODE_THREAD, workers: int = 0,
+                 shared_memory_threshold: int = 1 << 20):
+        if mode not in (MODE_THREAD, MODE_PROCESS):
+            raise ValueError(f"Modo de extracción desconocido: {mode}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.shared_memory_threshold = shared_memory_threshold
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ExtractionExecutor":
+        return cls(
+            mode=settings.extraction_mode,
+            workers=settings.extraction_workers,
+            shared_memory_threshold=settings.shared_memory_threshold,
+        )
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    def start(self) -> None:
+        """
+        Crea el pool de procesos (solo en modo "process") y espera a que todos
+        los procesos hayan arrancado y compilado los patrones.
+        """
+        if self.mode != MODE_PROCESS or self._pool is not None:
+            return
+        # Los procesos deben compartir el rastreador de memoria compartida del
+        # padre; si se crea después, cada proceso arrancaría el suyo y daría
+        # por filtrados los bloques que el padre ya liberó.
+        resource_tracker.ensure_running()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                         initializer=_warm_worker)
+        # El pool crea los procesos bajo demanda; enviar una tarea por proceso
+        # los arranca todos ahora en lugar de en las primeras peticiones.
+        futures = [self._pool.submit(_ping) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        """Detiene el pool de procesos si existe."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, func: Callable[[str], Any], text: str) -> Any:
+        """
+        Ejecuta `func(text)` sin bloquear el bucle de eventos.
+
+        Args:
+            func: Función de extracción (debe poder serializarse con pickle)
+            text (str): Texto a procesar
+
+        Returns:
+            Any: Resultado de `func`
+        """
+        from app.profiling import active_profile, run_profiled
+
+        # Las peticiones que se perfilan se ejecutan en el pool de hilos para
+        # que cProfile las observe desde este proceso
+        if self._pool is None or active_profile() is not None:
+            return await run_in_threadpool(run_profiled, func, text)
+
+        loop = asyncio.get_running_loop()
+        with self._payload(text) as payload:
+            return await loop.run_in_executor(self._pool, partial(_run_in_worker, func, payload))
+
+    def call(self, func: Callable[[str], Any], text: str) -> Any:
+        """
+        Ejecuta `func(text)` y espera el resultado, bloqueando el hilo actual.
+        Pensado para hilos en segundo plano, no para el bucle de eventos.
+
+        Args:
+            func: Función de extracción (debe poder serializarse con pickle)
+            text (str): Texto a procesar
+
+        Returns:
+            Any: Resultado de `func`
+        """
+        if self._pool is None:
+            return func(text)
+        with self._payload(text) as payload:
+            return self._pool.submit(_run_in_worker, func, payload).result()
+
+    @contextmanager
+    def _payload(self, text: str) -> Iterator[Payload]:
+        """
+        Prepara el texto para enviarlo a un proceso del pool.
+
+        Los textos de `shared_memory_threshold` bytes en UTF-8 o más se
+        entregan en un bloque de memoria compartida. La entrega no evita las
+        copias: la librería estándar no puede codificar un `str` directamente
+        en un búfer, así que aquí se codifica (una copia) y se copia al bloque
+        (otra), y el proceso decodifica desde el bloque sin copia intermedia
+        (la tercera, el `str` que recibe la extracción). Lo que se evita es
+        serializar el texto con pickle y pasarlo por la tubería del pool.
+        """
+        # Cada carácter ocupa entre 1 y 4 bytes: solo se codifica si la
+        # longitud no basta para decidir
+        threshold = self.shared_memory_threshold
+        if not text or len(text) * 4 < threshold:
+            yield text
+            return
+        encoded = text.encode("utf-8")
+        size = len(encoded)
+        if size < threshold:
+            del encoded
+            yield text
+            return
+        block = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            block.buf[:size] = encoded
+            del encoded
+            yield block.name, size
+        finally:
+            block.close()
+            block.unlink()
+
+    async def extract(self, text: str) -> Dict[str, Any]:
+        """Ejecuta `extract_all` sobre el texto con el modo configurado."""
+        return await self.run(extract_all, text)
+
+
+extraction_executor = ExtractionExecutor.from_settings(get_settings())
@@ -1,2 +1,281 @@
-def extract_all(text: str):
-    return {"status": "ok", "input_length": len(text)}
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.columnar import entity_columns
+from app.metrics import instrumented
+from app.validators.prefilter import DENSE_SPACING, build_prefilter
+from app.validators.patterns import (
+    PATTERN_EMAIL_BUSQUEDA,
+    PATTERN_PHONE,
+    PATTERN_DATE,
+    PATTERN_DNI,
+    PATTERN_POSTAL_CODE,
+    PATTERN_URL_BUSQUEDA,
+)
+
+
+# =============================================================================
+# ESCÁNER COMBINADO DE ENTIDADES
+# =============================================================================
+
+# Tipos de entidad en orden de prioridad. Cuando dos patrones coinciden en la
+# misma posición gana el primero de la lista (semántica de alternancia de `re`),
+# por eso los patrones más específicos van antes que DNI y código postal.
+# Para el email y la URL se usan las formas de búsqueda acotadas.
+ENTITY_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("url", PATTERN_URL_BUSQUEDA),
+    ("email", PATTERN_EMAIL_BUSQUEDA),
+    ("phone", PATTERN_PHONE),
+    ("date", PATTERN_DATE),
+    ("postal_code", PATTERN_POSTAL_CODE),
+    ("dni", PATTERN_DNI),
+)
+
+ENTITY_TYPES: Tuple[str, ...] = tuple(name for name, _ in ENTITY_PATTERNS)
+
+# Delimitadores de entidad: una entidad no puede empezar ni terminar pegada a
+# un carácter alfanumérico, así "ABC12345XYZ" no produce un DNI parcial.
+BOUNDARY_BEFORE = r"(?<![A-Za-z0-9])"
+BOUNDARY_AFTER = r"(?![A-Za-z0-9])"
+
+
+def strip_anchors(pattern: str) -> str:
+    """
+    Elimina las anclas de inicio (^) y fin ($) de un patrón de validación.
+
+    Args:
+        pattern (str): Patrón regex de validación
+
+    Returns:
+        str: Patrón sin anclas
+    """
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+    if pattern.endswith("$") and not pattern.endswith("\\$"):
+        pattern = pattern[:-1]
+    return pattern
+
+
+def unanchored(pattern: str) -> str:
+    """
+    Convierte un patrón de validación anclado (^...$) en uno apto para buscar
+    dentro de texto libre, delimitado por caracteres no alfanuméricos.
+
+    Args:
+        pattern (str): Patrón regex de validación
+
+    Returns:
+        str: Patrón sin anclas, rodeado por los delimitadores de entidad
+    """
+    return f"{BOUNDARY_BEFORE}(?:{strip_anchors(pattern)}){BOUNDARY_AFTER}"
+
+
+def build_scanner_pattern(entity_patterns=ENTITY_PATTERNS) -> str:
+    """
+    Construye el patrón combinado con un grupo con nombre por tipo de entidad.
+
+    El delimitador inicial se evalúa una sola vez por posición, fuera de la
+    alternancia, de modo que las posiciones en mitad de una palabra se
+    descartan sin probar ningún patrón.
+
+    Args:
+        entity_patterns: Secuencia de pares (tipo, patrón) en orden de prioridad
+
+    Returns:
+        str: Alternancia de grupos con nombre lista para compilar
+    """
+    alternatives = "|".join(
+        f"(?P<{name}>(?:{strip_anchors(pattern)}){BOUNDARY_AFTER})"
+        for name, pattern in entity_patterns
+    )
+    return f"{BOUNDARY_BEFORE}(?:{alternatives})"
+
+
+SCANNER_PATTERN = build_scanner_pattern()
+SCANNER = re.compile(SCANNER_PATTERN)
+
+
+# Textos más cortos se recorren directamente con el escáner combinado: el
+# prefiltro no compensa su coste fijo
+MIN_PREFILTER_LENGTH = 4096
+# Entidades encontradas a partir de las cuales se comprueba la densidad
+DENSE_ENTITIES = 16
+
+
+class EntityScanner:
+    """
+    Escáner combinado con prefiltro por literales.
+
+    Los tipos cuyo patrón exige un literal (URL `://`, email `@`, teléfono
+    `+`, fecha `/`) se buscan con su propio `Prefilter`, que solo ejecuta la
+    expresión regular junto a cada aparición del literal. Los demás (código
+    postal y DNI) se buscan juntos con un escáner reducido. Cada búsqueda
+    recuerda su próxima coincidencia y solo se repite cuando otra entidad la
+    solapa; de todas gana la que empieza antes y, a igual inicio, la de mayor
+    prioridad, igual que en la alternancia de `SCANNER`. El resultado es
+    idéntico a `SCANNER.finditer`.
+
+    Args:
+        entity_patterns: Secuencia de pares (tipo, patrón) en orden de prioridad
+        as_bytes (bool): Compilar los patrones sobre bytes en lugar de str
+    """
+
+    def __init__(self, entity_patterns=ENTITY_PATTERNS, as_bytes: bool = False):
+        def compile_pattern(pattern: str) -> "re.Pattern":
+            return re.compile(pattern.encode("ascii") if as_bytes else pattern)
+
+        self.scanner = compile_pattern(build_scanner_pattern(entity_patterns))
+        self.priority = {name: index for index, (name, _) in enumerate(entity_patterns)}
+        prefilters = []
+        rest = []
+        for name, pattern in entity_patterns:
+            prefilter = build_prefilter(compile_pattern(build_scanner_pattern(((name, pattern),))))
+            if prefilter is None:
+                rest.append((name, pattern))
+            else:
+                prefilters.append(prefilter)
+        # El escáner reducido va primero: su próxima coincidencia acota hasta
+        # dónde necesitan buscar los prefiltros
+        self.streams = tuple(([compile_pattern(build_scanner_pattern(rest))] if rest else [])
+                             + prefilters)
+
+    def finditer(self, string, pos: int = 0, endpos: Optional[int] = None) -> Iterator["re.Match"]:
+        """
+        Equivalente a `SCANNER.finditer(string, pos, endpos)`.
+
+        Returns:
+            Iterator[re.Match]: Coincidencias en orden, con el tipo en `lastgroup`
+        """
+        if endpos is None or endpos > len(string):
+            endpos = len(string)
+        if endpos - pos < MIN_PREFILTER_LENGTH:
+            return self.scanner.finditer(string, pos, endpos)
+        return self._finditer(string, pos, endpos)
+
+    def _finditer(self, string, pos: int, endpos: int) -> Iterator["re.Match"]:
+        priority = self.priority
+        streams = self.streams
+        # Por búsqueda: su próxima coincidencia, None si hay que calcularla o
+        # False si no quedan; `checked` es la primera posición sin descartar
+        upcoming: List[Any] = [None] * len(streams)
+        checked = [pos] * len(streams)
+        caches = [None if isinstance(stream, re.Pattern) else stream.hit_cache()
+                  for stream in streams]
+        resume = pos
+        # Inicio del tramo en el que se mide la densidad y entidades en él
+        window_start, found = pos, 0
+        while True:
+            best = None
+            for index, stream in enumerate(streams):
+                match = upcoming[index]
+                if match is False:
+                    continue
+                if match is None or match.start() < resume:
+                    start = max(resume, checked[index])
+                    limit = None if best is None else best.start()
+                    if limit is not None and start > limit:
+                        continue
+                    if isinstance(stream, re.Pattern):
+                        match, following = stream.search(string, start, endpos), None
+                    else:
+                        match, following = stream.search_until(
+                            string, start, endpos, limit, caches[index])
+                    if match is None:
+                        upcoming[index] = False if following is None else None
+                        checked[index] = following or endpos
+                        continue
+                    upcoming[index] = match
+                if best is None or match.start() < best.start() or (
+                        match.start() == best.start()
+                        and priority[match.lastgroup] < priority[best.lastgroup]):
+                    best = match
+            if best is None:
+                return
+            yield best
+            resume = best.end()
+            found += 1
+            # Con muchas entidades el escáner combinado en C es más rápido, pero
+            # solo recorre otro tramo tan largo como todo lo ya comprobado:
+            # después se vuelve a los prefiltros y a medir la densidad desde cero
+            if found > DENSE_ENTITIES and resume - window_start < found * DENSE_SPACING:
+                window_end = resume + max(resume - pos, MIN_PREFILTER_LENGTH)
+                for match in self.scanner.finditer(string, resume, endpos):
+                    yield match
+                    resume = match.end()
+                    if resume >= window_end:
+                        break
+                else:
+                    return
+                window_start, found = resume, 0
+
+
+ENTITY_SCANNER = EntityScanner()
+
+
+# =============================================================================
+# FUNCIONES DE EXTRACCIÓN
+# =============================================================================
+
+def iter_entities(text: str, pos: int = 0,
+                  endpos: Optional[int] = None) -> Iterator[Tuple[str, str, int, int]]:
+    """
+    Recorre el texto una sola vez y produce cada entidad encontrada.
+
+    Args:
+        text (str): Texto en el cual buscar
+        pos (int): Posición inicial de la búsqueda
+        endpos (int, optional): Posición final de la búsqueda
+
+    Yields:
+        Tuple[str, str, int, int]: (tipo, valor, inicio, fin) de cada entidad
+    """
+    if not text:
+        return
+    for match in ENTITY_SCANNER.finditer(text, pos, endpos):
+        yield match.lastgroup, match.group(), match.start(), match.end()
+
+
+@instrumented("extract_all", matches=lambda result: result["count"])
+def extract_all(text: str) -> Dict[str, Any]:
+    """
+    Extrae todas las entidades tipadas (email, teléfono, fecha, DNI, código
+    postal y URL) del texto en una única pasada.
+
+    Args:
+        text (str): Texto del cual extraer entidades
+
+    Returns:
+        Dict[str, Any]: Diccionario con la lista de entidades y su posición
+    """
+    entities: List[Dict[str, Any]] = [
+        {"type": kind, "value": value, "start": start, "end": end}
+        for kind, value, start, end in iter_entities(text)
+    ]
+    return {
+        "status": "ok",
+        "input_length": len(text) if text else 0,
+        "count": len(entities),
+        "entities": entities,
+    }
+
+
+@instrumented("extract_columnar", matches=lambda result: result["count"])
+def extract_columnar(text: str) -> Dict[str, Any]:
+    """
+    Igual que `extract_all`, pero con las entidades en formato columnar
+    (ver `app.columnar`): listas paralelas de tipo, valor, inicio y fin, con
+    los tipos y los valores como índices en sus tablas.
+
+    Args:
+        text (str): Texto del cual extraer entidades
+
+    Returns:
+        Dict[str, Any]: Resumen y columnas de las entidades
+    """
+    columns = entity_columns(iter_entities(text), ENTITY_TYPES)
+    return {
+        "status": "ok",
+        "input_length": len(text) if text else 0,
+        "count": len(columns["type"]),
+        **columns,
+    }
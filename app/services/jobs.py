@@ -0,0 +1,271 @@
+"""
+Trabajos de extracción asíncronos para documentos grandes.
+
+`POST /api/v1/extract/jobs` no espera a la extracción: crea un `Job`, lo
+encola en un pool de hilos propio y acotado, y responde con su id. El cliente
+consulta el estado y el resultado con `GET /api/v1/extract/jobs/{id}`. Así un
+documento de varios megabytes no retiene una conexión ni un hilo del pool de
+Starlette, que queda libre para las peticiones pequeñas.
+
+Los trabajos terminados se guardan en memoria durante `ttl` segundos desde
+que terminan y después se descartan; `max_jobs` acota además cuántos se
+conservan a la vez (se descartan antes los que terminaron primero). Con
+`max_pending` trabajos en cola o en curso, los nuevos se rechazan. Al
+detener el servicio los trabajos aún en cola terminan como fallidos y no se
+aceptan otros hasta el siguiente `start`.
+"""
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import Settings, get_settings
+from app.services.executor import ExtractionExecutor, extraction_executor
+from app.services.extractor import extract_all
+
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """Hay demasiados trabajos en cola o en curso."""
+
+
+class JobQueueClosed(JobQueueFull):
+    """El pool está detenido y no acepta trabajos."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Job:
+    """
+    Trabajo de extracción y su resultado.
+
+    Attributes:
+        id (str): Identificador aleatorio (también sirve de clave de acceso)
+        status (str): "queued", "running", "done" o "failed"
+        input_length (int): Longitud del texto recibido
+        result (dict | None): Resultado de la extracción al terminar
+        error (str | None): Mensaje de error si falló
+    """
+
+    __slots__ = ("id", "status", "input_length", "created_at", "started_at",
+                 "finished_at", "result", "error")
+
+    def __init__(self, input_length: int):
+        self.id = secrets.token_hex(16)
+        self.status = STATUS_QUEUED
+        self.input_length = input_length
+        self.created_at = _now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "input_length": self.input_length,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == STATUS_DONE:
+            data["result"] = self.result
+        elif self.status == STATUS_FAILED:
+            data["error"] = self.error
+        return data
+
+
+class JobStore:
+    """
+    Trabajos en memoria con caducidad de los terminados.
+
+    Args:
+        ttl (float): Segundos que se conserva un trabajo desde que termina
+        max_jobs (int): Trabajos terminados que se conservan como máximo
+        clock: Reloj monotónico (para los tests)
+    """
+
+    def __init__(self, ttl: float = 600.0, max_jobs: int = 1000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._clock = clock
+        self._jobs: Dict[str, Job] = {}
+        # Terminados en orden de finalización, con su instante de caducidad:
+        # como el TTL es fijo, los primeros son siempre los primeros en caducar
+        self._expiry: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def add(self, job: Job) -> None:
+        with self._lock:
+            self._purge()
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def finished(self, job: Job) -> None:
+        """Empieza a contar la caducidad de un trabajo terminado."""
+        with self._lock:
+            self._expiry[job.id] = self._clock() + self.ttl
+            self._purge()
+
+    def _purge(self) -> None:
+        now = self._clock()
+        expiry = self._expiry
+        while expiry:
+            job_id, expires = next(iter(expiry.items()))
+            if expires > now and len(expiry) <= self.max_jobs:
+                break
+            expiry.popitem(last=False)
+            self._jobs.pop(job_id, None)
+
+
+class ExtractionJobs:
+    """
+    Pool de hilos acotado que ejecuta los trabajos de extracción.
+
+    Args:
+        executor (ExtractionExecutor): Ejecutor de la extracción; en modo
+            "process" los hilos solo esperan al pool de procesos
+        workers (int): Trabajos ejecutándose a la vez
+        max_pending (int): Trabajos en cola o en curso como máximo
+        store (JobStore, optional): Almacén de trabajos
+    """
+
+    def __init__(self, executor: ExtractionExecutor, workers: int = 2,
+                 max_pending: int = 64, store: Optional[JobStore] = None):
+        self.executor = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self.store = store if store is not None else JobStore()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # Trabajos enviados al pool que aún no han empezado
+        self._queued: Dict[str, Tuple[Job, Future]] = {}
+        self._closed = False
+
+    @classmethod
+    def from_settings(cls, settings: Settings,
+                      executor: ExtractionExecutor = extraction_executor) -> "ExtractionJobs":
+        return cls(
+            executor,
+            workers=settings.job_workers,
+            max_pending=settings.job_max_pending,
+            store=JobStore(ttl=settings.job_ttl, max_jobs=settings.job_max_stored),
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> "ExtractionJobs":
+        """
+        Vuelve a aceptar trabajos tras `shutdown`. El pool se crea con el
+        primer trabajo.
+
+        Returns:
+            ExtractionJobs: El propio gestor
+        """
+        with self._lock:
+            self._closed = False
+        return self
+
+    def submit(self, text: str, func: Callable[[str], Any] = extract_all) -> Job:
+        """
+        Encola la extracción de un texto. No bloquea.
+
+        Args:
+            text (str): Texto a procesar
+            func: Función de extracción
+
+        Returns:
+            Job: Trabajo creado, en estado "queued"
+
+        Raises:
+            JobQueueFull: Si ya hay `max_pending` trabajos sin terminar
+            JobQueueClosed: Si el pool está detenido
+        """
+        job = Job(len(text))
+        with self._lock:
+            if self._closed:
+                raise JobQueueClosed("El servicio de trabajos está detenido")
+            if self._pending >= self.max_pending:
+                raise JobQueueFull(f"Hay {self._pending} trabajos pendientes")
+            self._pending += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix="extraction-job")
+            self.store.add(job)
+            # Se registra antes de que `_run` pueda empezar: espera este lock
+            self._queued[job.id] = (job, self._pool.submit(self._run, job, func, text))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Detiene el pool y deja de aceptar trabajos. Los trabajos aún en cola
+        se cancelan y terminan como fallidos; los que están en curso terminan
+        normalmente.
+
+        Args:
+            wait (bool): Esperar a que terminen los trabajos en curso
+        """
+        with self._lock:
+            self._closed = True
+            pool, self._pool = self._pool, None
+            queued, self._queued = self._queued, {}
+        for job, future in queued.values():
+            # Solo se cancela si aún no ha empezado
+            if future.cancel():
+                job.error = "Cancelado al detener el servicio"
+                self._finish(job, STATUS_FAILED)
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def _run(self, job: Job, func: Callable[[str], Any], text: str) -> None:
+        with self._lock:
+            self._queued.pop(job.id, None)
+        job.status = STATUS_RUNNING
+        job.started_at = _now()
+        try:
+            job.result = self.executor.call(func, text)
+            status = STATUS_DONE
+        except Exception as exc:
+            logger.exception("Falló el trabajo de extracción %s", job.id)
+            job.error = str(exc) or type(exc).__name__
+            status = STATUS_FAILED
+        self._finish(job, status)
+
+    def _finish(self, job: Job, status: str) -> None:
+        # El estado se publica el último: quien lo lea ya ve el resultado
+        job.finished_at = _now()
+        job.status = status
+        with self._lock:
+            self._pending -= 1
+        self.store.finished(job)
+
+
+extraction_jobs = ExtractionJobs.from_settings(get_settings())
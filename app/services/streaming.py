@@ -0,0 +1,188 @@
+"""
+Extracción de entidades por bloques sobre el cuerpo de la petición.
+
+`StreamingExtractor` recibe el texto por partes y mantiene solo una ventana
+acotada: una entidad que empieza a más de `overlap` caracteres del final del
+texto recibido ya no puede cambiar con los bloques siguientes, así que se
+emite y el texto anterior se descarta. El resultado es el mismo que el de
+`iter_entities` sobre el documento completo para toda entidad de hasta
+`MAX_ENTITY_LENGTH` caracteres; una entidad más larga (una ruta de URL o un
+año de miles de dígitos) puede emitirse recortada.
+
+`ExtractionStreamResponse` lee el cuerpo de la petición directamente de ASGI,
+lo decodifica de forma incremental y escribe cada entidad como una línea
+NDJSON mientras sigue leyendo. La última línea es un resumen con
+`input_length` y `count`.
+"""
+import codecs
+import json
+from typing import AsyncIterator, List, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.services.extractor import ENTITY_SCANNER
+
+
+# Longitud máxima de entidad que se garantiza encontrar completa entre bloques
+MAX_ENTITY_LENGTH = 4096
+# Ventana que se conserva entre bloques: la entidad más larga más el carácter
+# que mira el delimitador final
+STREAM_OVERLAP = MAX_ENTITY_LENGTH + 1
+# Texto nuevo mínimo acumulado antes de volver a escanear, para que bloques
+# muy pequeños no obliguen a recorrer la ventana una y otra vez
+MIN_SCAN_CHARS = 1 << 16
+
+Entity = Tuple[str, str, int, int]
+
+
+class StreamingExtractor:
+    """
+    Escáner incremental de entidades con memoria acotada.
+
+    Args:
+        overlap (int): Caracteres al final del texto recibido cuyas entidades
+                       se retienen hasta recibir más texto o finalizar
+        min_scan_chars (int): Texto pendiente mínimo para escanear en `feed`
+    """
+
+    def __init__(self, overlap: int = STREAM_OVERLAP, min_scan_chars: int = MIN_SCAN_CHARS):
+        self.overlap = overlap
+        self.min_scan_chars = min_scan_chars
+        self.input_length = 0
+        self.count = 0
+        self._buffer = ""
+        # Posición en el documento del primer carácter de `_buffer`
+        self._base = 0
+        # Posición (relativa a `_buffer`) desde la que continúa la búsqueda
+        self._resume = 0
+
+    def feed(self, text: str) -> List[Entity]:
+        """
+        Añade un bloque de texto y retorna las entidades ya definitivas.
+
+        Args:
+            text (str): Siguiente bloque del documento
+
+        Returns:
+            List[Entity]: (tipo, valor, inicio, fin) con posiciones en el
+                          documento completo
+        """
+        if text:
+            self._buffer += text
+            self.input_length += len(text)
+        if len(self._buffer) - self._resume < self.overlap + self.min_scan_chars:
+            return []
+        return self._scan(len(self._buffer) - self.overlap)
+
+    def finish(self) -> List[Entity]:
+        """
+        Marca el final del documento y retorna las entidades restantes.
+
+        Returns:
+            List[Entity]: Entidades pendientes de la ventana final
+        """
+        return self._scan(len(self._buffer))
+
+    def _scan(self, limit: int) -> List[Entity]:
+        buffer = self._buffer
+        base = self._base
+        resume = self._resume
+        found: List[Entity] = []
+        for match in ENTITY_SCANNER.finditer(buffer, resume):
+            start = match.start()
+            if start >= limit:
+                break
+            end = match.end()
+            found.append((match.lastgroup, match.group(), base + start, base + end))
+            resume = end
+        # Las posiciones anteriores a `limit` sin coincidencia son definitivas
+        resume = max(resume, limit)
+        # Se conserva un carácter antes de `resume` para el delimitador inicial
+        cut = max(resume - 1, 0)
+        self._buffer = buffer[cut:]
+        self._base = base + cut
+        self._resume = resume - cut
+        self.count += len(found)
+        return found
+
+
+def _ndjson(entities: List[Entity]) -> bytes:
+    return "".join(
+        json.dumps({"type": kind, "value": value, "start": start, "end": end},
+                   ensure_ascii=False) + "\n"
+        for kind, value, start, end in entities
+    ).encode("utf-8")
+
+
+async def iter_body(receive: Receive) -> AsyncIterator[bytes]:
+    """
+    Produce los bloques del cuerpo de la petición a medida que llegan.
+
+    Args:
+        receive: Canal `receive` de ASGI
+
+    Yields:
+        bytes: Bloques del cuerpo (termina también si el cliente se desconecta)
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        body = message.get("body", b"")
+        if body:
+            yield body
+        if not message.get("more_body", False):
+            return
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Escanea un documento UTF-8 recibido por bloques y produce NDJSON.
+
+    Los bytes inválidos se sustituyen por U+FFFD. El escaneo de cada bloque se
+    ejecuta en el pool de hilos para no bloquear el bucle de eventos.
+
+    Args:
+        chunks: Bloques de bytes del documento
+
+    Yields:
+        bytes: Líneas NDJSON (una por entidad y un resumen final)
+    """
+    from app.profiling import run_profiled
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    extractor = StreamingExtractor()
+    async for chunk in chunks:
+        entities = await run_in_threadpool(run_profiled, extractor.feed, decoder.decode(chunk))
+        if entities:
+            yield _ndjson(entities)
+    entities = await run_in_threadpool(run_profiled, extractor.feed,
+                                       decoder.decode(b"", final=True))
+    entities += await run_in_threadpool(run_profiled, extractor.finish)
+    summary = {"status": "ok", "input_length": extractor.input_length, "count": extractor.count}
+    yield _ndjson(entities) + (json.dumps(summary) + "\n").encode("utf-8")
+
+
+class ExtractionStreamResponse(StreamingResponse):
+    """
+    Respuesta NDJSON que extrae entidades del cuerpo de la propia petición.
+
+    `StreamingResponse` escucha `receive` en paralelo para detectar la
+    desconexión del cliente, lo que consumiría el cuerpo que aquí se quiere
+    leer; por eso esta respuesta lee y escribe en un único bucle.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(content=(), media_type="application/x-ndjson")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        async for body in iter_ndjson(iter_body(receive)):
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -0,0 +1,183 @@
+"""
+Arranque medido de la API y precalentamiento.
+
+`StartupReport` guarda la duración de cada fase del arranque: la
+importación de rutas y servicios y la construcción de la aplicación en
+`create_app`, y las fases de `warm_up` en el lifespan. `warm_up` hace el
+trabajo que si no recaería en las primeras peticiones:
+
+- compila todos los patrones del registro (`PATTERN_*` y auxiliares),
+- elige el motor más rápido de los patrones de forma fija,
+- ejecuta cada validador y el extractor una vez, y
+- carga el índice de duplicados (y con él SQLAlchemy, que no se importa
+  antes).
+
+La readiness (`/health/ready`) no pasa a 200 hasta que termina.
+
+Para ver qué módulos pesan más al importar la aplicación:
+
+    python -m app.startup --imports 15
+
+El informe importa `app.main:app` en un proceso nuevo con `-X importtime`,
+así que incluye también lo que importa `create_app`.
+"""
+import argparse
+import logging
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.config import Settings
+from app.services.extractor import extract_all
+from app.validators.patterns import FIELD_SPECS, find_patterns, registry, select_matchers
+
+
+logger = logging.getLogger(__name__)
+
+# Valor válido con el que se ejecuta cada validador al precalentar
+WARMUP_VALUES = {
+    "email": "warm@up.co",
+    "phone": "+573001234567",
+    "date": "15/08/2000",
+    "dni": "12345678A",
+    "postal_code": "630001",
+    "url": "https://warm.up/registro?paso=1",
+}
+WARMUP_TEXT = " ".join(WARMUP_VALUES.values())
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+class StartupReport:
+    """
+    Duración de las fases del arranque y estado de la readiness.
+
+    Attributes:
+        phases (List[Tuple[str, float]]): (fase, segundos) en orden
+        ready (bool): Si la aplicación ya puede recibir tráfico
+        patterns_warm (bool): Si `warm_patterns` ya se ejecutó
+    """
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float]] = []
+        self.ready = False
+        self.patterns_warm = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Mide la duración del bloque como la fase `name`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    @property
+    def total(self) -> float:
+        return sum(seconds for _, seconds in self.phases)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.phases},
+            "total_ms": round(self.total * 1000, 2),
+        }
+
+    def log(self) -> None:
+        logger.info("Arranque en %.1f ms: %s", self.total * 1000, ", ".join(
+            f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.phases))
+
+
+def warm_patterns(report: StartupReport) -> None:
+    """
+    Compila los patrones, elige sus motores y ejecuta cada validador y el
+    extractor una vez.
+
+    No abre conexiones ni hilos, así que puede hacerse en el proceso maestro
+    antes de crear los workers (`app.serve`): estos heredan el estado ya
+    compilado y su `warm_up` se salta estas fases.
+
+    Args:
+        report (StartupReport): Informe donde se anotan las fases
+    """
+    with report.phase("compile_patterns"):
+        registry.compile_all()
+    with report.phase("select_matchers"):
+        select_matchers()
+    with report.phase("validators"):
+        for spec in FIELD_SPECS:
+            spec.validator(WARMUP_VALUES[spec.name])
+        extract_all(WARMUP_TEXT)
+        find_patterns(WARMUP_TEXT, r"[a-z]+@[a-z]+\.[a-z]+")
+    report.patterns_warm = True
+
+
+def warm_up(report: StartupReport, settings: Settings) -> None:
+    """
+    Precalienta patrones, validadores, extractor e índice de duplicados.
+
+    Args:
+        report (StartupReport): Informe donde se anotan las fases
+        settings (Settings): Configuración (solo precalienta si
+                             `warmup_enabled`)
+    """
+    if not settings.warmup_enabled:
+        return
+    if not report.patterns_warm:
+        warm_patterns(report)
+    with report.phase("registration_index"):
+        from app.db.dedup import get_registration_index
+        get_registration_index()
+
+
+# =============================================================================
+# INFORME DE IMPORTACIÓN
+# =============================================================================
+
+def import_times(target: str = "app.main:app") -> List[Tuple[str, int, int, int]]:
+    """
+    Carga `módulo:atributo` en un proceso nuevo con `-X importtime`.
+
+    Args:
+        target (str): Módulo y, opcionalmente, atributo a cargar
+
+    Returns:
+        List[Tuple[str, int, int, int]]: (módulo, µs propios, µs acumulados,
+                                         nivel de anidamiento) por importación
+    """
+    module, _, attribute = target.partition(":")
+    # `importlib.import_module` no pasa por el registro de -X importtime
+    code = f"import sys, {module}"
+    if attribute:
+        code += f"; getattr(sys.modules[{module!r}], {attribute!r})"
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                               capture_output=True, text=True, check=True)
+    return [(match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2)
+            for match in map(_IMPORT_LINE.match, completed.stderr.splitlines()) if match]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.startup",
+        description="Informe de los módulos que más tardan en importarse.",
+    )
+    parser.add_argument("--target", default="app.main:app",
+                        help="Módulo y atributo a cargar (por defecto %(default)s)")
+    parser.add_argument("--imports", type=int, default=20, metavar="N",
+                        help="Importaciones más lentas que se muestran")
+    args = parser.parse_args(argv)
+
+    times = import_times(args.target)
+    total = sum(cumulative for _, _, cumulative, depth in times if depth == 0)
+    print(f"{args.target}: {total / 1000:.1f} ms importando {len(times)} módulos")
+    print(f"{'módulo':<50} {'propio ms':>10} {'acumulado ms':>13}")
+    for name, own, cumulative, _ in sorted(times, key=lambda item: -item[2])[:args.imports]:
+        print(f"{name:<50} {own / 1000:>10.1f} {cumulative / 1000:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# UI helpers package
@@ -0,0 +1,134 @@
+"""
+Recursos estáticos del formulario de Streamlit.
+
+Streamlit vuelve a ejecutar el script completo en cada interacción. Para no
+releer ni recodificar los mismos ficheros en cada rerun, su contenido se
+guarda con `st.cache_resource` usando como clave la ruta y la fecha de
+modificación: basta un `os.stat` por rerun y, si el fichero cambia en disco,
+la siguiente ejecución lee la versión nueva.
+
+Además se emiten de forma que el navegador los conserve:
+- La hoja de estilos y el script de validación se envían juntos en un único
+  mensaje idéntico en cada rerun. Streamlit guarda en el navegador los
+  mensajes de más de 10 KB y en los reruns siguientes solo envía su hash.
+- El logo se sirve desde `static/` (server.enableStaticServing) con la fecha de
+  modificación en el parámetro `v`, que hace que el servidor lo marque como
+  cacheable a largo plazo. Si el servicio estático está desactivado se usa
+  una URI `data:` calculada una sola vez.
+"""
+import base64
+import os
+from typing import Optional, Tuple
+
+import streamlit as st
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+STATIC_DIR = os.path.join(ROOT_DIR, "static")
+# Ruta con la que Streamlit publica el directorio static/
+STATIC_URL = "app/static"
+
+STYLESHEET_PATH = os.path.join(ASSETS_DIR, "css", "laborauq.css")
+SCRIPT_PATH = os.path.join(ASSETS_DIR, "js", "validation_styles.js")
+LOGO_FILES = ("laborauq_logo.png", "laborauq_logo.svg", "logo.png", "logo.svg")
+LOGO_DIR = os.path.join(STATIC_DIR, "images")
+
+# Versiones de un mismo fichero que se conservan en caché
+_MAX_VERSIONS = 4
+
+
+def file_version(path: str) -> Optional[int]:
+    """
+    Retorna la fecha de modificación del fichero en nanosegundos.
+
+    Args:
+        path (str): Ruta del fichero
+
+    Returns:
+        Optional[int]: mtime en ns, o None si el fichero no existe
+    """
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+@st.cache_resource(max_entries=_MAX_VERSIONS * 2, show_spinner=False)
+def _read_text(path: str, version: int) -> str:
+    with open(path, encoding="utf-8") as handle:
+        return handle.read()
+
+
+@st.cache_resource(max_entries=_MAX_VERSIONS, show_spinner=False)
+def _page_assets(stylesheet: str, stylesheet_version: Optional[int],
+                 script: str, script_version: Optional[int]) -> str:
+    parts = []
+    if stylesheet_version is not None:
+        parts.append(f"<style>\n{_read_text(stylesheet, stylesheet_version)}</style>")
+    if script_version is not None:
+        parts.append(f"<script>\n{_read_text(script, script_version)}</script>")
+    return "\n".join(parts)
+
+
+@st.cache_resource(max_entries=_MAX_VERSIONS, show_spinner=False)
+def _data_uri(path: str, version: int) -> str:
+    mime_type = "image/svg+xml" if path.endswith(".svg") else "image/png"
+    with open(path, "rb") as handle:
+        encoded = base64.b64encode(handle.read()).decode()
+    return f"data:{mime_type};base64,{encoded}"
+
+
+def page_assets_html(stylesheet: str = STYLESHEET_PATH, script: str = SCRIPT_PATH) -> str:
+    """
+    Retorna el HTML con la hoja de estilos y el script de validación.
+
+    Args:
+        stylesheet (str): Ruta de la hoja de estilos
+        script (str): Ruta del script
+
+    Returns:
+        str: Bloques <style> y <script> listos para `st.markdown`
+    """
+    return _page_assets(stylesheet, file_version(stylesheet), script, file_version(script))
+
+
+def find_logo() -> Tuple[Optional[str], Optional[int]]:
+    """
+    Busca el logo en el directorio de imágenes estáticas.
+
+    Returns:
+        Tuple[Optional[str], Optional[int]]: (ruta, versión) del primer logo
+                                             encontrado, o (None, None)
+    """
+    for name in LOGO_FILES:
+        path = os.path.join(LOGO_DIR, name)
+        version = file_version(path)
+        if version is not None:
+            return path, version
+    return None, None
+
+
+def logo_src(static_serving: Optional[bool] = None) -> Optional[str]:
+    """
+    Retorna el valor del atributo `src` del logo.
+
+    Args:
+        static_serving (bool, optional): Si Streamlit sirve `static/`; por
+            defecto se consulta la opción server.enableStaticServing
+
+    Returns:
+        Optional[str]: URL versionada o URI `data:`; None si no hay logo
+    """
+    path, version = find_logo()
+    if path is None:
+        return None
+    if static_serving is None:
+        static_serving = bool(st.get_option("server.enableStaticServing"))
+    if static_serving:
+        relative = os.path.relpath(path, STATIC_DIR).replace(os.sep, "/")
+        return f"{STATIC_URL}/{relative}?v={version}"
+    try:
+        return _data_uri(path, version)
+    except OSError:
+        return None
@@ -0,0 +1,100 @@
+"""
+Validación incremental de los campos del formulario de Streamlit.
+
+Cada rerun de Streamlit vuelve a ejecutar el script completo aunque el
+usuario solo haya marcado una casilla. `IncrementalValidator` guarda en el
+estado de la sesión, por campo, la huella de lo último que se validó (qué
+validador y qué valor) junto con su resultado. Un validador solo se vuelve a
+ejecutar para los campos cuyo valor cambió; el resto, incluido el resumen de
+validación, se construye con los resultados guardados.
+"""
+from typing import Any, Callable, Dict, Hashable, Iterable, MutableMapping, Optional, Tuple
+
+
+# Clave del estado de la sesión donde se guardan los resultados por campo
+STATE_KEY = "field_validation"
+
+Fingerprint = Tuple[str, Hashable]
+
+
+def fingerprint(value: Any, validator: Callable[[Any], bool]) -> Fingerprint:
+    """
+    Huella de una validación: identifica el validador por su nombre
+    cualificado (estable entre reruns aunque se envuelva de nuevo) y el valor.
+
+    Args:
+        value: Valor validado
+        validator: Función de validación
+
+    Returns:
+        Fingerprint: (módulo.nombre del validador, valor)
+    """
+    name = f"{getattr(validator, '__module__', '')}.{getattr(validator, '__qualname__', repr(validator))}"
+    return name, value
+
+
+class IncrementalValidator:
+    """
+    Resultados de validación por campo persistidos en el estado de la sesión.
+
+    Args:
+        state (MutableMapping): Estado donde se guardan los resultados
+                                (normalmente `st.session_state`)
+        key (str): Clave del estado bajo la que se guardan
+    """
+
+    def __init__(self, state: MutableMapping[str, Any], key: str = STATE_KEY):
+        if key not in state:
+            state[key] = {}
+        self._results: Dict[str, Tuple[Fingerprint, bool]] = state[key]
+        self.runs = 0
+
+    def validate(self, field: str, value: Any, validator: Callable[[Any], bool]) -> bool:
+        """
+        Retorna el resultado de validar `value`, ejecutando el validador solo
+        si el campo cambió desde la última validación.
+
+        Args:
+            field (str): Nombre del campo
+            value: Valor actual del campo
+            validator: Función de validación del campo
+
+        Returns:
+            bool: True si el valor es válido
+        """
+        current = fingerprint(value, validator)
+        entry = self._results.get(field)
+        if entry is not None and entry[0] == current:
+            return entry[1]
+        result = bool(validator(value))
+        self._results[field] = (current, result)
+        self.runs += 1
+        return result
+
+    def result(self, field: str) -> Optional[bool]:
+        """
+        Retorna el último resultado guardado del campo.
+
+        Args:
+            field (str): Nombre del campo
+
+        Returns:
+            Optional[bool]: Resultado, o None si el campo no se ha validado
+        """
+        entry = self._results.get(field)
+        return None if entry is None else entry[1]
+
+    def retain(self, fields: Iterable[str]) -> None:
+        """
+        Descarta los resultados de los campos que ya no existen (por ejemplo,
+        URLs de portafolio eliminadas).
+
+        Args:
+            fields: Nombres de los campos que siguen en el formulario
+        """
+        keep = set(fields)
+        for field in [name for name in self._results if name not in keep]:
+            del self._results[field]
+
+    def __len__(self) -> int:
+        return len(self._results)
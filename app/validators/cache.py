@@ -0,0 +1,310 @@
+"""
+Cachés acotadas para los validadores.
+
+`LRUCache` es una caché genérica, segura entre hilos, con expulsión del
+elemento menos usado y contadores de aciertos, fallos y expulsiones.
+`CompiledPatternCache` la usa para guardar los patrones arbitrarios que
+recibe `find_patterns`, de modo que un patrón repetido no se recompila aunque
+los clientes roten entre más patrones de los que admite la caché de `re`.
+
+Antes de compilar un patrón nuevo se comprueban su longitud y su estructura
+(profundidad de grupos, repeticiones `{m,n}` grandes y cuantificadores
+anidados como `(a+)+`), que es lo que encarece la compilación y provoca
+retroceso catastrófico al buscar. La comprobación es léxica y conservadora:
+rechaza las formas habituales, no garantiza que cualquier patrón aceptado
+sea barato.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+# Valores por defecto de la caché de patrones de usuario
+MAX_CACHED_PATTERNS = 512
+MAX_PATTERN_LENGTH = 1000
+MAX_GROUP_DEPTH = 10
+MAX_REPEAT = 1000
+MAX_COMPILE_SECONDS = 0.05
+
+# Cuantificador `{m}`, `{m,}` o `{m,n}`; cualquier otra llave es un literal
+_BRACE_QUANTIFIER = re.compile(r"\{(\d*)(?:(,)(\d*))?\}")
+
+
+class PatternRejectedError(ValueError):
+    """Patrón rechazado por superar los límites de tamaño, estructura o compilación."""
+
+
+def _quantifier(pattern: str, pos: int) -> Tuple[Optional[bool], int, int]:
+    """
+    Lee el cuantificador que empieza en `pos`, si lo hay.
+
+    Returns:
+        tuple: (repite, mayor número de repeticiones explícito, posición
+               siguiente); `repite` es None si no hay cuantificador
+    """
+    char = pattern[pos:pos + 1]
+    if char in ("*", "+"):
+        repeats, largest, pos = True, 0, pos + 1
+    elif char == "?":
+        repeats, largest, pos = False, 0, pos + 1
+    elif char == "{":
+        match = _BRACE_QUANTIFIER.match(pattern, pos)
+        if match is None or not (match.group(1) or match.group(3)):
+            return None, 0, pos
+        low, comma, high = match.groups()
+        counts = [int(count) for count in (low, high) if count]
+        largest = max(counts)
+        # `{m}` sin coma repite m veces; `{m,}` no tiene tope
+        upper = int(low) if not comma else int(high) if high else None
+        repeats, pos = upper is None or upper > 1, match.end()
+    else:
+        return None, 0, pos
+    # Modificador perezoso o posesivo
+    if pattern[pos:pos + 1] in ("?", "+"):
+        pos += 1
+    return repeats, largest, pos
+
+
+def check_pattern_structure(pattern: str, max_group_depth: int = MAX_GROUP_DEPTH,
+                            max_repeat: int = MAX_REPEAT) -> None:
+    """
+    Comprueba la estructura de un patrón sin compilarlo.
+
+    Recorre el patrón una vez saltando escapes y clases de caracteres, y
+    lleva por cada grupo abierto si contiene algún cuantificador que repite.
+
+    Args:
+        pattern (str): Patrón regex
+        max_group_depth (int): Grupos anidados como máximo
+        max_repeat (int): Mayor número aceptado en `{m,n}`
+
+    Raises:
+        PatternRejectedError: Si los grupos se anidan demasiado, una
+                              repetición supera `max_repeat` o un grupo con
+                              un cuantificador se repite a su vez
+    """
+    # Por cada grupo abierto (el primero es el patrón completo): si contiene
+    # un cuantificador que repite
+    groups = [False]
+    length = len(pattern)
+    pos = 0
+    while pos < length:
+        char = pattern[pos]
+        if char == "\\":
+            pos += 2
+            inner = False
+        elif char == "[":
+            pos += 1
+            if pattern[pos:pos + 1] == "^":
+                pos += 1
+            if pattern[pos:pos + 1] == "]":
+                pos += 1
+            while pos < length and pattern[pos] != "]":
+                pos += 2 if pattern[pos] == "\\" else 1
+            pos += 1
+            inner = False
+        elif char == "(":
+            groups.append(False)
+            if len(groups) - 1 > max_group_depth:
+                raise PatternRejectedError(
+                    f"El patrón anida más de {max_group_depth} grupos"
+                )
+            pos += 1
+            continue
+        elif char == ")" and len(groups) > 1:
+            inner = groups.pop()
+            pos += 1
+        else:
+            inner = False
+            pos += 1
+        # Cuantificador aplicado al átomo que acaba de terminar
+        repeats, largest, pos = _quantifier(pattern, pos)
+        if largest > max_repeat:
+            raise PatternRejectedError(
+                f"El patrón repite un elemento más de {max_repeat} veces"
+            )
+        if repeats and inner:
+            raise PatternRejectedError("El patrón repite un grupo que ya contiene repeticiones")
+        if repeats or inner:
+            groups[-1] = True
+
+
+class LRUCache:
+    """
+    Caché LRU acotada y segura entre hilos.
+
+    Args:
+        maxsize (int): Número máximo de elementos almacenados
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError("maxsize debe ser mayor que cero")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retorna el valor asociado a `key` y lo marca como usado recientemente.
+
+        Args:
+            key: Clave a consultar
+            default: Valor retornado si la clave no está
+
+        Returns:
+            Any: Valor almacenado o `default`
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Guarda un valor, expulsando el menos usado si se supera el tamaño.
+
+        Args:
+            key: Clave
+            value: Valor a guardar
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        """Vacía la caché y reinicia los contadores."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna las estadísticas de uso de la caché.
+
+        Returns:
+            Dict[str, Any]: Tamaño, capacidad, aciertos, fallos, expulsiones
+                            y tasa de aciertos
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class CompiledPatternCache:
+    """
+    Caché de patrones compilados para patrones suministrados por el usuario.
+
+    Además de acotar el número de patrones, rechaza antes de compilarlos los
+    que superan una longitud máxima o no pasan `check_pattern_structure`.
+
+    El tiempo de compilación solo se conoce después de compilar, así que no
+    protege de nada: el patrón ya ha costado ese tiempo y la caché interna de
+    `re` lo conserva. Sirve para no guardar en esta caché los patrones lentos
+    y recordarlos como rechazados, de modo que repetirlos no vuelve a
+    compilarlos.
+
+    Args:
+        maxsize (int): Número máximo de patrones compilados en caché
+        max_pattern_length (int): Longitud máxima aceptada de un patrón
+        max_group_depth (int): Grupos anidados como máximo
+        max_repeat (int): Mayor número aceptado en `{m,n}`
+        max_compile_seconds (float): Tiempo de compilación a partir del cual
+                                     el patrón se recuerda como rechazado
+    """
+
+    def __init__(self, maxsize: int = MAX_CACHED_PATTERNS,
+                 max_pattern_length: int = MAX_PATTERN_LENGTH,
+                 max_compile_seconds: float = MAX_COMPILE_SECONDS,
+                 max_group_depth: int = MAX_GROUP_DEPTH,
+                 max_repeat: int = MAX_REPEAT):
+        self.max_pattern_length = max_pattern_length
+        self.max_group_depth = max_group_depth
+        self.max_repeat = max_repeat
+        self.max_compile_seconds = max_compile_seconds
+        self._compiled = LRUCache(maxsize)
+        self._rejected = LRUCache(maxsize)
+
+    def compile(self, pattern: str, flags: int = 0) -> re.Pattern:
+        """
+        Retorna el patrón compilado, compilándolo solo si no está en caché.
+
+        Args:
+            pattern (str): Patrón regex
+            flags (int): Flags de compilación de `re`
+
+        Returns:
+            re.Pattern: Patrón compilado
+
+        Raises:
+            PatternRejectedError: Si el patrón es demasiado largo, su
+                                  estructura no se acepta o ya se rechazó
+                                  por su tiempo de compilación
+            re.error: Si el patrón no es una expresión regular válida
+        """
+        key = (pattern, flags)
+        compiled: Optional[re.Pattern] = self._compiled.get(key)
+        if compiled is not None:
+            return compiled
+
+        if len(pattern) > self.max_pattern_length:
+            raise PatternRejectedError(
+                f"El patrón supera la longitud máxima de {self.max_pattern_length} caracteres"
+            )
+        if key in self._rejected:
+            raise PatternRejectedError("El patrón excede el tiempo máximo de compilación")
+        check_pattern_structure(pattern, self.max_group_depth, self.max_repeat)
+
+        start = time.perf_counter()
+        compiled = re.compile(pattern, flags)
+        elapsed = time.perf_counter() - start
+        if elapsed > self.max_compile_seconds:
+            self._rejected.put(key, elapsed)
+            raise PatternRejectedError("El patrón excede el tiempo máximo de compilación")
+
+        self._compiled.put(key, compiled)
+        return compiled
+
+    def clear(self) -> None:
+        """Vacía la caché de patrones compilados y la de rechazados."""
+        self._compiled.clear()
+        self._rejected.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna las estadísticas de la caché de patrones compilados.
+
+        Returns:
+            Dict[str, Any]: Estadísticas de `LRUCache` más el número de
+                            patrones rechazados recordados
+        """
+        stats = self._compiled.stats()
+        stats["rejected"] = len(self._rejected)
+        return stats
@@ -0,0 +1,335 @@
+"""
+Autómatas finitos deterministas con tabla de transiciones.
+
+Los patrones de forma fija (teléfono, fecha, DNI, código postal) son lenguajes
+regulares que no necesitan retroceso. `TableDFA` traduce uno de esos patrones
+a la sintaxis de `automata-lib`, obtiene el DFA mínimo y lo guarda como dos
+tablas `array`:
+
+- `classes`: 256 entradas que asignan a cada byte su clase de equivalencia
+  (los caracteres que el patrón no distingue comparten clase; la clase 0
+  agrupa a los que el patrón no acepta en ninguna posición).
+- `table`: transiciones indexadas por `estado + clase`. Los estados se guardan
+  ya multiplicados por el número de clases, así que cada carácter cuesta una
+  sola indexación.
+
+`install_fastest` mide el DFA contra el `fullmatch` de `re` y, solo si el DFA
+es más rápido, lo instala en el registro de patrones; `install_dfas` lo
+instala sin medir, con un resultado que no depende de la carga de la máquina.
+"""
+import re
+import timeit
+from array import array
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+try:
+    import re._parser as sre_parse
+    from re._constants import (
+        AT, AT_BEGINNING, AT_END, BRANCH, IN, LITERAL, MAX_REPEAT, MAXREPEAT,
+        MIN_REPEAT, NEGATE, RANGE, SUBPATTERN,
+    )
+except ImportError:  # Python < 3.11
+    import sre_parse
+    from sre_constants import (
+        AT, AT_BEGINNING, AT_END, BRANCH, IN, LITERAL, MAX_REPEAT, MAXREPEAT,
+        MIN_REPEAT, NEGATE, RANGE, SUBPATTERN,
+    )
+
+from app.validators.registry import PatternRegistry
+
+
+# Solo se admiten patrones sobre ASCII: cualquier otro carácter va a la clase 0
+ALPHABET_SIZE = 128
+
+# Símbolos usados para nombrar las clases en la sintaxis de automata-lib
+# (ninguno es un carácter reservado de esa sintaxis)
+_CLASS_SYMBOLS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+
+class UnsupportedPatternError(ValueError):
+    """El patrón usa construcciones que no se pueden traducir a un DFA."""
+
+
+# =============================================================================
+# TRADUCCIÓN DEL PATRÓN
+# =============================================================================
+
+def _charset(op, av) -> FrozenSet[int]:
+    """Conjunto de códigos ASCII que acepta un átomo LITERAL o IN."""
+    if op is LITERAL:
+        codes = {av}
+    else:
+        codes = _class_codes(av)
+    if max(codes, default=0) >= ALPHABET_SIZE:
+        raise UnsupportedPatternError("El patrón acepta caracteres no ASCII")
+    return frozenset(codes)
+
+
+def _class_codes(items) -> set:
+    codes = set()
+    negate = False
+    for item_op, item_av in items:
+        if item_op is NEGATE:
+            negate = True
+        elif item_op is LITERAL:
+            codes.add(item_av)
+        elif item_op is RANGE:
+            codes.update(range(item_av[0], item_av[1] + 1))
+        else:
+            raise UnsupportedPatternError(f"Clase de caracteres no soportada: {item_op}")
+    if negate:
+        # Un carácter no ASCII también cumpliría la negación; no se puede
+        # representar con la clase 0, que siempre rechaza.
+        raise UnsupportedPatternError("Las clases negadas no están soportadas")
+    return codes
+
+
+def _collect_charsets(tree, found: List[FrozenSet[int]]) -> None:
+    for op, av in tree:
+        if op in (LITERAL, IN):
+            found.append(_charset(op, av))
+        elif op in (MAX_REPEAT, MIN_REPEAT):
+            _collect_charsets(av[2], found)
+        elif op is SUBPATTERN:
+            _collect_charsets(av[3], found)
+        elif op is BRANCH:
+            for branch in av[1]:
+                _collect_charsets(branch, found)
+
+
+def _partition(charsets: Iterable[FrozenSet[int]]) -> List[int]:
+    """
+    Divide el alfabeto en clases de equivalencia respecto a los conjuntos.
+
+    Returns:
+        List[int]: Clase de cada código ASCII (0 = ningún conjunto lo acepta)
+    """
+    # Firma de cada código: conjuntos del patrón a los que pertenece
+    distinct = list(dict.fromkeys(charsets))
+    signatures = [
+        tuple(index for index, charset in enumerate(distinct) if code in charset)
+        for code in range(ALPHABET_SIZE)
+    ]
+    numbering: Dict[Tuple[int, ...], int] = {(): 0}
+    for signature in signatures:
+        numbering.setdefault(signature, len(numbering))
+    return [numbering[signature] for signature in signatures]
+
+
+def _to_automata_regex(tree, code_class: List[int], at_start: bool = True,
+                       at_end: bool = True) -> str:
+    """Traduce un árbol de `sre_parse` a la sintaxis de automata-lib."""
+    parts = []
+    last = len(tree) - 1
+    for position, (op, av) in enumerate(tree):
+        if op is AT:
+            # Con fullmatch, ^ al inicio y $ al final no restringen nada más
+            if av is AT_BEGINNING and at_start and position == 0:
+                continue
+            if av is AT_END and at_end and position == last:
+                continue
+            raise UnsupportedPatternError(f"Ancla no soportada: {av}")
+        if op in (LITERAL, IN):
+            symbols = sorted({_CLASS_SYMBOLS[code_class[code] - 1] for code in _charset(op, av)})
+            if not symbols:
+                raise UnsupportedPatternError("Clase de caracteres vacía")
+            parts.append(symbols[0] if len(symbols) == 1 else "(" + "|".join(symbols) + ")")
+        elif op in (MAX_REPEAT, MIN_REPEAT):
+            low, high, sub = av
+            inner = _to_automata_regex(sub, code_class, False, False)
+            upper = "" if high is MAXREPEAT else str(high)
+            parts.append(f"({inner}){{{low},{upper}}}")
+        elif op is SUBPATTERN:
+            if av[1] & re.IGNORECASE:
+                raise UnsupportedPatternError("Los grupos sin distinción de mayúsculas no están soportados")
+            parts.append("(" + _to_automata_regex(av[3], code_class, False, False) + ")")
+        elif op is BRANCH:
+            branches = [_to_automata_regex(branch, code_class, False, False) for branch in av[1]]
+            parts.append("(" + "|".join(branches) + ")")
+        else:
+            raise UnsupportedPatternError(f"Construcción no soportada: {op}")
+    return "".join(parts)
+
+
+# =============================================================================
+# AUTÓMATA CON TABLA
+# =============================================================================
+
+class TableDFA:
+    """
+    DFA mínimo ejecutado sobre tablas `array` indexadas por byte.
+
+    Args:
+        classes (array): Clase de cada byte (256 entradas)
+        table (array): Transiciones; `table[estado + clase]` es el siguiente
+                       estado, con los estados ya multiplicados por `width`
+        width (int): Número de clases (columnas de la tabla)
+        start (int): Estado inicial
+        accepting (bytes): 1 en el desplazamiento de cada estado de aceptación
+        dead (int): Estado sumidero (nunca acepta)
+        pattern (str): Patrón de origen
+    """
+
+    __slots__ = ("classes", "table", "width", "start", "accepting", "dead", "pattern")
+
+    def __init__(self, classes: array, table: array, width: int, start: int,
+                 accepting: bytes, dead: int, pattern: str = ""):
+        self.classes = classes
+        self.table = table
+        self.width = width
+        self.start = start
+        self.accepting = accepting
+        self.dead = dead
+        self.pattern = pattern
+
+    @classmethod
+    def from_regex(cls, pattern: str) -> "TableDFA":
+        """
+        Construye el DFA mínimo equivalente a `re.fullmatch(pattern, ...)`.
+
+        Args:
+            pattern (str): Patrón regex sin retroceso (literales, clases,
+                           repeticiones, grupos, alternativas y anclas ^ $)
+
+        Returns:
+            TableDFA: Autómata listo para usar
+
+        Raises:
+            UnsupportedPatternError: Si el patrón usa otras construcciones
+        """
+        from automata.fa.dfa import DFA
+        from automata.fa.nfa import NFA
+
+        parsed = sre_parse.parse(pattern)
+        if parsed.state.flags & re.IGNORECASE:
+            raise UnsupportedPatternError("Los patrones sin distinción de mayúsculas no están soportados")
+        tree = list(parsed)
+        charsets: List[FrozenSet[int]] = []
+        _collect_charsets(tree, charsets)
+        code_class = _partition(charsets)
+        width = max(code_class) + 1
+
+        symbols = {_CLASS_SYMBOLS[index - 1] for index in range(1, width)}
+        regex = _to_automata_regex(tree, code_class)
+        dfa = DFA.from_nfa(NFA.from_regex(regex, input_symbols=symbols), minify=True)
+
+        # Estado 0 = sumidero; el resto, en el orden en que se alcanzan
+        order = {}
+        pending = [dfa.initial_state]
+        while pending:
+            state = pending.pop()
+            if state in order:
+                continue
+            order[state] = len(order) + 1
+            pending.extend(dfa.transitions.get(state, {}).values())
+
+        size = (len(order) + 1) * width
+        table = array("B" if size <= 0xFF else "H", [0]) * size
+        # Aceptación indexada por el desplazamiento del estado en la tabla
+        accepting = bytearray(size)
+        for state, number in order.items():
+            offset = number * width
+            accepting[offset] = state in dfa.final_states
+            for symbol, target in dfa.transitions.get(state, {}).items():
+                table[offset + _CLASS_SYMBOLS.index(symbol) + 1] = order[target] * width
+
+        classes = array("B", code_class) + array("B", [0]) * (256 - ALPHABET_SIZE)
+
+        return cls(classes, table, width, order[dfa.initial_state] * width,
+                   bytes(accepting), 0, pattern)
+
+    def fullmatch(self, string: str) -> bool:
+        """
+        Indica si `string` completo pertenece al lenguaje del patrón.
+
+        Args:
+            string (str): Texto a comprobar
+
+        Returns:
+            bool: True si el DFA acepta el texto
+        """
+        try:
+            data = string.encode("ascii")
+        except UnicodeEncodeError:
+            return False
+        table = self.table
+        classes = self.classes
+        state = self.start
+        for byte in data:
+            state = table[state + classes[byte]]
+            if not state:
+                return False
+        return bool(self.accepting[state])
+
+    @property
+    def state_count(self) -> int:
+        """Número de estados, incluido el sumidero."""
+        return len(self.table) // self.width
+
+    def __repr__(self) -> str:
+        return f"TableDFA({self.pattern!r}, states={self.state_count}, classes={self.width})"
+
+
+# =============================================================================
+# SELECCIÓN DEL MOTOR MÁS RÁPIDO
+# =============================================================================
+
+def benchmark(func, samples: Sequence[str], number: int = 200) -> float:
+    """
+    Tiempo mínimo (de 3 repeticiones) de aplicar `func` a todas las muestras.
+
+    Args:
+        func: Función de un argumento
+        samples (Sequence[str]): Entradas representativas
+        number (int): Pasadas sobre las muestras por repetición
+
+    Returns:
+        float: Segundos de la repetición más rápida
+    """
+    def run():
+        for sample in samples:
+            func(sample)
+
+    return min(timeit.repeat(run, number=number, repeat=3))
+
+
+def install_dfas(registry: PatternRegistry, names: Iterable[str]) -> Dict[str, str]:
+    """
+    Instala el DFA de cada patrón en el registro, sin medir.
+
+    Args:
+        registry (PatternRegistry): Registro con los patrones
+        names (Iterable[str]): Nombres de los patrones
+
+    Returns:
+        Dict[str, str]: Motor instalado por patrón ("dfa")
+    """
+    chosen = {}
+    for name in names:
+        registry.use_matcher(name, TableDFA.from_regex(registry[name].pattern))
+        chosen[name] = "dfa"
+    return chosen
+
+
+def install_fastest(registry: PatternRegistry, samples: Dict[str, Sequence[str]],
+                    number: int = 200) -> Dict[str, str]:
+    """
+    Instala el DFA de cada patrón en el registro si es más rápido que `re`.
+
+    Args:
+        registry (PatternRegistry): Registro con los patrones
+        samples (Dict[str, Sequence[str]]): Entradas de prueba por nombre
+        number (int): Pasadas de la medición
+
+    Returns:
+        Dict[str, str]: Motor elegido por patrón ("dfa" o "re")
+    """
+    chosen = {}
+    for name, inputs in samples.items():
+        entry = registry[name]
+        dfa = TableDFA.from_regex(entry.pattern)
+        compiled = re.compile(entry.pattern, entry.flags).fullmatch
+        faster = benchmark(dfa.fullmatch, inputs, number) < benchmark(compiled, inputs, number)
+        registry.use_matcher(name, dfa if faster else None)
+        chosen[name] = "dfa" if faster else "re"
+    return chosen
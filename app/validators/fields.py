@@ -0,0 +1,140 @@
+"""
+Especificación declarativa de los campos validados.
+
+Cada campo con validación de patrón se describe una sola vez con `FieldSpec`
+(nombre, nombre visible, validador, obligatorio y si admite varios valores).
+La tabla `FIELD_SPECS` de `patterns.py` la comparten la API y el formulario
+de Streamlit, y `evaluate_fields` la recorre en un único bucle para producir
+el resumen de validación.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+
+# Estados posibles de un campo en el resumen
+STATUS_VALID = "valid"
+STATUS_INVALID = "invalid"
+STATUS_MISSING = "missing"
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    Descripción de un campo con validación de patrón.
+
+    Attributes:
+        name (str): Nombre del campo (clave en la API y en el formulario)
+        display_name (str): Nombre mostrado al usuario
+        validator (Callable[[str], bool]): Función de validación
+        required (bool): Si el campo es obligatorio (en campos múltiples,
+            que haya al menos un valor)
+        multi (bool): Si el campo admite una lista de valores
+        feminine (bool): Concordancia de género de los mensajes
+            ("obligatoria", "válida")
+    """
+    name: str
+    display_name: str
+    validator: Callable[[str], bool]
+    required: bool = True
+    multi: bool = False
+    feminine: bool = False
+    messages: Dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Los mensajes se calculan una sola vez por campo
+        ending = "a" if self.feminine else "o"
+        if self.multi:
+            messages = {
+                STATUS_MISSING: f"{self.display_name}: se requiere al menos un valor",
+                STATUS_VALID: "Todos los valores ({valid}) son válidos",
+                STATUS_INVALID: "{invalid} valor(es) inválido(s) de {total} total",
+            }
+        else:
+            messages = {
+                STATUS_MISSING: f"{self.display_name} es obligatori{ending}",
+                STATUS_VALID: f"{self.display_name} es válid{ending}",
+                STATUS_INVALID: f"{self.display_name} tiene formato inválido",
+            }
+        object.__setattr__(self, "messages", messages)
+
+    def item_key(self, index: int) -> str:
+        """Nombre del valor `index` de un campo múltiple (p. ej. "url_0")."""
+        return f"{self.name}_{index}"
+
+
+def _is_blank(value: Any) -> bool:
+    return not value or not value.strip()
+
+
+def evaluate_fields(specs: Sequence[FieldSpec], values: Mapping[str, Any],
+                    validate: Optional[Callable[[str, Any, Callable], bool]] = None) -> Dict[str, Any]:
+    """
+    Valida los campos de la tabla y construye el resumen de validación.
+
+    Args:
+        specs (Sequence[FieldSpec]): Campos a evaluar, en orden de
+                                     presentación
+        values (Mapping[str, Any]): Valor de cada campo por nombre (lista de
+                                    valores en los campos múltiples)
+        validate: Función opcional `(clave, valor, validador) -> bool` usada
+                  en lugar de llamar directamente al validador; el formulario
+                  la usa para reutilizar resultados entre reruns
+
+    Returns:
+        Dict[str, Any]: Resumen con:
+            - valid (int): Valores válidos
+            - invalid (int): Valores inválidos
+            - required_missing (int): Campos obligatorios sin valor
+            - total (int): Valores evaluados (un campo vacío cuenta como uno)
+            - fields_detail (dict): Por campo, status, display_name y message
+    """
+    valid = invalid = missing = total = 0
+    details: Dict[str, Any] = dict.fromkeys(spec.name for spec in specs)
+
+    for spec in specs:
+        value = values.get(spec.name)
+        messages = spec.messages
+        if spec.multi:
+            items = [(spec.item_key(index), item) for index, item in enumerate(value or ())
+                     if not _is_blank(item)]
+        else:
+            items = [] if _is_blank(value) else [(spec.name, value)]
+
+        if not items:
+            if not spec.required:
+                del details[spec.name]
+                continue
+            total += 1
+            missing += 1
+            details[spec.name] = {
+                "status": STATUS_MISSING,
+                "display_name": spec.display_name,
+                "message": messages[STATUS_MISSING],
+            }
+            continue
+
+        validator = spec.validator
+        if validate is None:
+            field_valid = sum(1 for _, item in items if validator(item))
+        else:
+            field_valid = sum(1 for key, item in items if validate(key, item, validator))
+        field_invalid = len(items) - field_valid
+        total += len(items)
+        valid += field_valid
+        invalid += field_invalid
+
+        status = STATUS_INVALID if field_invalid else STATUS_VALID
+        details[spec.name] = {
+            "status": status,
+            "display_name": spec.display_name,
+            "message": messages[status].format(valid=field_valid, invalid=field_invalid,
+                                               total=len(items)),
+        }
+
+    return {
+        "valid": valid,
+        "invalid": invalid,
+        "required_missing": missing,
+        "total": total,
+        "fields_detail": details,
+    }
@@ -0,0 +1,87 @@
+"""
+Memoización opcional de los validadores.
+
+Los mismos valores se validan una y otra vez: Streamlit vuelve a ejecutar el
+formulario completo en cada interacción y en la API se repiten dominios de
+correo y URLs populares. `ValidationMemo` envuelve cualquier `validate_*` con
+una caché LRU acotada indexada por (validador, valor), de modo que las
+expresiones pesadas de email y URL se ejecutan una vez por valor distinto.
+
+Los valores más largos que `max_value_length` se validan siempre sin pasar
+por la caché, para que un valor enorme no ocupe memoria en ella.
+"""
+from functools import wraps
+from typing import Any, Callable, Dict
+
+from app.validators.cache import LRUCache
+
+
+# Valores por defecto de la caché de resultados de validación
+MAX_MEMO_ENTRIES = 4096
+MAX_MEMO_VALUE_LENGTH = 2048
+
+_MISSING = object()
+
+
+class ValidationMemo:
+    """
+    Caché de resultados de validación compartida por varios validadores.
+
+    Args:
+        maxsize (int): Número máximo de resultados almacenados
+        max_value_length (int): Longitud máxima de un valor cacheable
+    """
+
+    def __init__(self, maxsize: int = MAX_MEMO_ENTRIES,
+                 max_value_length: int = MAX_MEMO_VALUE_LENGTH):
+        self.max_value_length = max_value_length
+        self.skipped = 0
+        self._results = LRUCache(maxsize)
+
+    def wrap(self, validator: Callable[[str], bool]) -> Callable[[str], bool]:
+        """
+        Retorna una versión memoizada de `validator`.
+
+        Args:
+            validator: Función `validate_*` que recibe un valor y retorna bool
+
+        Returns:
+            Callable[[str], bool]: Validador con el mismo nombre y resultado
+        """
+        results = self._results
+        max_length = self.max_value_length
+
+        @wraps(validator)
+        def memoized(value: str) -> bool:
+            if not isinstance(value, str) or len(value) > max_length:
+                self.skipped += 1
+                return validator(value)
+            key = (validator, value)
+            verdict = results.get(key, _MISSING)
+            if verdict is _MISSING:
+                verdict = validator(value)
+                results.put(key, verdict)
+            return verdict
+
+        return memoized
+
+    def clear(self) -> None:
+        """Vacía la caché y reinicia los contadores."""
+        self._results.clear()
+        self.skipped = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna las estadísticas de uso de la caché.
+
+        Returns:
+            Dict[str, Any]: Estadísticas de `LRUCache` más el número de valores
+                            que no se cachearon por su longitud o tipo
+        """
+        stats = self._results.stats()
+        stats["skipped"] = self.skipped
+        return stats
+
+
+# Caché compartida por los validadores memoizados del proceso
+validation_memo = ValidationMemo()
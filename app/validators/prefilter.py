@@ -0,0 +1,365 @@
+"""
+Prefiltrado por literales obligatorios.
+
+Muchos patrones exigen un literal en toda coincidencia: `://` en una URL,
+`@` en un email, `+` en un teléfono, `/` en una fecha. `build_prefilter`
+deriva ese literal del árbol del patrón (`re._parser`) junto con lo que puede
+aparecer antes de él en una coincidencia:
+
+- la anchura mínima y máxima de esa parte, y
+- el conjunto de caracteres que puede consumir.
+
+Con eso `Prefilter.finditer` busca el literal con `str.find`/`bytes.find`
+y solo prueba el patrón completo (`pattern.match`) en las posiciones de la
+ventana anterior a cada aparición donde puede empezar una coincidencia: el
+tramo de caracteres de ese conjunto que termina en el literal, acotado por la
+anchura máxima. El resto del texto no pasa por el motor de expresiones
+regulares. El resultado es idéntico al de `pattern.finditer`.
+
+Si el primer carácter del literal puede aparecer también antes de él (por
+ejemplo la `@` dentro de un email entre comillas), la ventana no se puede
+delimitar así; en ese caso se separan las alternativas de primer nivel del
+patrón y se prefiltra cada una por su cuenta. Los patrones sin literal
+obligatorio, o con IGNORECASE, no se prefiltran.
+
+Cuando el literal es muy frecuente el coste por aparición supera al del
+escaneo en C; a partir de `DENSE_HITS` apariciones, si hay más de una cada
+`DENSE_SPACING` caracteres, `finditer` recorre con `pattern.finditer` un tramo
+tan largo como todo lo ya comprobado (al menos `DENSE_WINDOW` caracteres) y
+vuelve a medir la densidad. Así un comienzo denso no deja el resto del texto, quizá
+sin apariciones del literal, en manos de `re`. `search_until` recurre a
+`pattern.search`, que se detiene en la primera coincidencia.
+"""
+import heapq
+import re
+import sys
+from functools import lru_cache
+from typing import Iterator, List, Optional, Set, Tuple
+
+try:
+    import re._parser as sre_parse
+    from re._constants import (
+        ASSERT, ASSERT_NOT, AT, BRANCH, IN, LITERAL, MAX_REPEAT, MAXREPEAT,
+        MIN_REPEAT, RANGE, SUBPATTERN,
+    )
+except ImportError:  # Python < 3.11
+    import sre_parse
+    from sre_constants import (
+        ASSERT, ASSERT_NOT, AT, BRANCH, IN, LITERAL, MAX_REPEAT, MAXREPEAT,
+        MIN_REPEAT, RANGE, SUBPATTERN,
+    )
+
+
+# Rango de caracteres más grande que se enumera al calcular los conjuntos
+MAX_RANGE_SIZE = 4096
+# Alternativas de primer nivel que se prefiltran por separado, como máximo
+MAX_ALTERNATIVES = 8
+# Densidad de apariciones del literal a partir de la cual se vuelve a `re`
+DENSE_HITS = 64
+DENSE_SPACING = 256
+# Caracteres que se recorren con `re` como mínimo al pasar a un tramo denso
+DENSE_WINDOW = DENSE_HITS * DENSE_SPACING
+# Prefiltros guardados (uno por patrón compilado)
+MAX_CACHED_PREFILTERS = 512
+
+
+# =============================================================================
+# ANÁLISIS DEL PATRÓN
+# =============================================================================
+
+def _flatten(items) -> list:
+    """Inserta en la secuencia el contenido de los grupos sin flags."""
+    flat = []
+    for op, av in items:
+        if op is SUBPATTERN and not av[1] and not av[2]:
+            flat.extend(_flatten(av[3]))
+        else:
+            flat.append((op, av))
+    return flat
+
+
+def _chars(items) -> Optional[Set[int]]:
+    """Caracteres que puede consumir una secuencia, o None si no se acotan."""
+    chars: Set[int] = set()
+    for op, av in items:
+        if op is LITERAL:
+            chars.add(av)
+        elif op is IN:
+            for item_op, item_av in av:
+                if item_op is LITERAL:
+                    chars.add(item_av)
+                elif item_op is RANGE and item_av[1] - item_av[0] < MAX_RANGE_SIZE:
+                    chars.update(range(item_av[0], item_av[1] + 1))
+                else:
+                    return None
+        elif op in (MAX_REPEAT, MIN_REPEAT):
+            inner = _chars(av[2])
+            if inner is None:
+                return None
+            chars |= inner
+        elif op is SUBPATTERN:
+            inner = None if av[1] or av[2] else _chars(av[3])
+            if inner is None:
+                return None
+            chars |= inner
+        elif op is BRANCH:
+            for branch in av[1]:
+                inner = _chars(branch)
+                if inner is None:
+                    return None
+                chars |= inner
+        elif op in (ASSERT, ASSERT_NOT, AT):
+            # Las aserciones no consumen caracteres
+            continue
+        else:
+            return None
+    return chars
+
+
+def _width(items, state) -> Tuple[int, Optional[int]]:
+    low, high = sre_parse.SubPattern(state, list(items)).getwidth()
+    return low, None if high >= MAXREPEAT - 1 else high
+
+
+class LiteralWindow:
+    """
+    Literal obligatorio y descripción de la parte que lo precede.
+
+    Attributes:
+        needle: Literal (str o bytes, según el patrón)
+        min_before (int): Caracteres mínimos antes del literal
+        max_before (int | None): Caracteres máximos antes del literal
+        charset (frozenset | None): Caracteres que pueden preceder al literal
+            dentro de la coincidencia; None si no se pueden enumerar
+    """
+
+    __slots__ = ("needle", "min_before", "max_before", "charset")
+
+    def __init__(self, needle, min_before: int, max_before: Optional[int], charset):
+        self.needle = needle
+        self.min_before = min_before
+        self.max_before = max_before
+        self.charset = charset
+
+    def positions(self, string, pos: int, endpos: int, stats: List[int],
+                  limit: Optional[int] = None, cache: Optional[List[int]] = None) -> Iterator[int]:
+        """
+        Posiciones, en orden, donde puede empezar una coincidencia. Con
+        `limit`, la primera posición mayor que él es solo una cota inferior
+        de las siguientes y termina la secuencia. `cache` guarda entre
+        llamadas sobre el mismo texto [desde, aparición]: la primera
+        aparición del literal a partir de `desde` (-1 si no hay).
+        """
+        find = string.find
+        needle = self.needle
+        charset = self.charset
+        min_before = self.min_before
+        max_before = self.max_before
+        following = pos
+        start = pos + min_before
+        if cache is not None and cache[0] <= start and (cache[1] < 0 or cache[1] >= start):
+            hit = cache[1]
+        else:
+            hit = find(needle, start, endpos)
+            if cache is not None:
+                cache[0], cache[1] = start, hit
+        while hit >= 0:
+            stats[0] += 1
+            last = hit - min_before
+            first = following if max_before is None else max(following, hit - max_before)
+            if charset is not None:
+                start = hit
+                while start > first and string[start - 1] in charset:
+                    start -= 1
+                first = start
+            if limit is not None and first > limit:
+                yield first
+                return
+            if first <= last:
+                yield from range(first, last + 1)
+                following = last + 1
+            start = hit + 1
+            hit = find(needle, start, endpos)
+            if cache is not None:
+                cache[0], cache[1] = start, hit
+
+
+def _windows(items, state, is_bytes: bool, depth: int = 0) -> Optional[List[LiteralWindow]]:
+    flat = _flatten(items)
+    best: Optional[LiteralWindow] = None
+    index = 0
+    while index < len(flat):
+        if flat[index][0] is not LITERAL:
+            index += 1
+            continue
+        end = index
+        while end < len(flat) and flat[end][0] is LITERAL:
+            end += 1
+        codes = [av for _, av in flat[index:end]]
+        prefix = flat[:index]
+        chars = _chars(prefix)
+        low, high = _width(prefix, state)
+        if chars is not None and codes[0] in chars:
+            # El literal puede aparecer antes de sí mismo: el tramo anterior
+            # no delimita la ventana, solo la anchura máxima
+            chars = None
+        if chars is not None or high is not None:
+            needle = bytes(codes) if is_bytes else "".join(map(chr, codes))
+            charset = None if chars is None else frozenset(chars if is_bytes else map(chr, chars))
+            if best is None or len(needle) > len(best.needle):
+                best = LiteralWindow(needle, low, high, charset)
+        index = end
+    if best is not None:
+        return [best]
+
+    if depth > 0:
+        return None
+    for position, (op, av) in enumerate(flat):
+        if op is BRANCH and len(av[1]) <= MAX_ALTERNATIVES:
+            windows: List[LiteralWindow] = []
+            for branch in av[1]:
+                found = _windows(flat[:position] + list(branch) + flat[position + 1:],
+                                 state, is_bytes, depth + 1)
+                if found is None:
+                    return None
+                windows.extend(found)
+            return windows
+    return None
+
+
+class Prefilter:
+    """
+    Búsqueda de un patrón limitada a las ventanas de sus literales.
+
+    Args:
+        pattern (re.Pattern): Patrón compilado
+        windows (List[LiteralWindow]): Una ventana por alternativa
+    """
+
+    def __init__(self, pattern: "re.Pattern", windows: List[LiteralWindow]):
+        self.pattern = pattern
+        self.windows = windows
+
+    @property
+    def literals(self) -> List:
+        return [window.needle for window in self.windows]
+
+    def hit_cache(self) -> List[List[int]]:
+        """Caché de apariciones para llamadas sucesivas a `search_until`."""
+        return [[sys.maxsize, -1] for _ in self.windows]
+
+    def candidates(self, string, pos: int, endpos: int, stats: List[int],
+                   limit: Optional[int] = None,
+                   cache: Optional[List[List[int]]] = None) -> Iterator[int]:
+        """Posiciones, en orden y sin repetir, donde puede empezar una coincidencia."""
+        caches = cache or [None] * len(self.windows)
+        if len(self.windows) == 1:
+            yield from self.windows[0].positions(string, pos, endpos, stats, limit, caches[0])
+            return
+        previous = -1
+        for position in heapq.merge(*(window.positions(string, pos, endpos, stats, limit, hits)
+                                      for window, hits in zip(self.windows, caches))):
+            if position != previous:
+                yield position
+                previous = position
+
+    def search_until(self, string, pos: int, endpos: int, limit: Optional[int] = None,
+                     cache: Optional[List[List[int]]] = None
+                     ) -> Tuple[Optional["re.Match"], Optional[int]]:
+        """
+        Busca la primera coincidencia que empieza como muy tarde en `limit`.
+
+        Args:
+            string: Texto (str, bytes o mmap)
+            pos (int): Posición inicial
+            endpos (int): Posición final
+            limit (int, optional): Última posición de inicio que interesa
+            cache (list, optional): Resultado de `hit_cache()`, compartido
+                por las llamadas con `pos` creciente sobre el mismo texto y
+                `endpos` para no buscar de nuevo los mismos literales
+
+        Returns:
+            Tuple: (coincidencia, None) si la hay; (None, posición) con una
+                   cota inferior, posterior a `limit`, de las posiciones aún
+                   sin probar; (None, None) si no hay más coincidencias
+        """
+        match = self.pattern.match
+        stats = [0]
+        for position in self.candidates(string, pos, endpos, stats, limit, cache):
+            if limit is not None and position > limit:
+                return None, position
+            if stats[0] > DENSE_HITS and (position - pos) < stats[0] * DENSE_SPACING:
+                return self.pattern.search(string, position, endpos), None
+            found = match(string, position, endpos)
+            if found is not None:
+                return found, None
+        return None, None
+
+    def search(self, string, pos: int = 0, endpos: Optional[int] = None) -> Optional["re.Match"]:
+        """Equivalente a `pattern.search(string, pos, endpos)`."""
+        if endpos is None or endpos > len(string):
+            endpos = len(string)
+        return self.search_until(string, pos, endpos)[0]
+
+    def finditer(self, string, pos: int = 0, endpos: Optional[int] = None) -> Iterator["re.Match"]:
+        """
+        Equivalente a `pattern.finditer(string, pos, endpos)`.
+
+        Yields:
+            re.Match: Coincidencias en orden
+        """
+        if endpos is None or endpos > len(string):
+            endpos = len(string)
+        match = self.pattern.match
+        resume = pos
+        while True:
+            start = resume
+            stats = [0]
+            for position in self.candidates(string, start, endpos, stats):
+                if position < resume:
+                    continue
+                if stats[0] > DENSE_HITS and (position - start) < stats[0] * DENSE_SPACING:
+                    break
+                found = match(string, position, endpos)
+                if found is not None:
+                    yield found
+                    resume = max(found.end(), position + 1)
+            else:
+                return
+            # Tramo denso: se recorre con `re` solo otro tanto como todo lo ya
+            # comprobado, y después se vuelve a medir la densidad
+            window_end = resume + max(resume - pos, DENSE_WINDOW)
+            for found in self.pattern.finditer(string, resume, endpos):
+                yield found
+                resume = max(found.end(), found.start() + 1)
+                if resume >= window_end:
+                    break
+            else:
+                return
+
+
+def build_prefilter(pattern: "re.Pattern") -> Optional[Prefilter]:
+    """
+    Deriva el prefiltro de un patrón compilado.
+
+    Args:
+        pattern (re.Pattern): Patrón compilado
+
+    Returns:
+        Optional[Prefilter]: Prefiltro, o None si el patrón no tiene un
+                             literal obligatorio aprovechable
+    """
+    if pattern.flags & re.IGNORECASE:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except re.error:
+        return None
+    windows = _windows(parsed.data, parsed.state, isinstance(pattern.pattern, bytes))
+    return None if windows is None else Prefilter(pattern, windows)
+
+
+@lru_cache(maxsize=MAX_CACHED_PREFILTERS)
+def prefilter_for(pattern: "re.Pattern") -> Optional[Prefilter]:
+    """`build_prefilter` con caché por patrón compilado."""
+    return build_prefilter(pattern)
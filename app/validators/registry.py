@@ -0,0 +1,216 @@
+"""
+Registro de patrones precompilados.
+
+Compila cada patrón una única vez y expone, por nombre, los métodos
+`search` y `finditer` del objeto compilado y un `fullmatch` que retorna
+siempre un booleano, use `re` o un motor alternativo. Así los validadores
+no pasan por la caché interna del módulo `re` en cada llamada, caché que
+además comparten con los patrones arbitrarios de `find_patterns`.
+"""
+import re
+import sys
+from typing import Callable, Dict, Iterator, Optional
+
+
+_METHODS = ("fullmatch", "search", "finditer")
+
+
+def _as_bool(fullmatch: Callable) -> Callable[..., bool]:
+    """`fullmatch` de un patrón compilado que retorna un booleano."""
+    def matches(string: str, pos: int = 0, endpos: int = sys.maxsize) -> bool:
+        return fullmatch(string, pos, endpos) is not None
+
+    return matches
+
+
+class RegisteredPattern:
+    """
+    Patrón registrado con sus métodos de búsqueda precompilados.
+
+    Los atributos `search` y `finditer` apuntan directamente a los métodos del
+    patrón compilado, de modo que invocarlos no añade ninguna capa intermedia.
+    `fullmatch` retorna siempre un booleano: con `re` es un envoltorio mínimo
+    del método compilado (admite `pos` y `endpos`) y, si se asigna un
+    `matcher` alternativo (por ejemplo un DFA con tabla), es directamente su
+    método `fullmatch`. Con compilación diferida o contadores activos se
+    sustituyen por envoltorios equivalentes.
+    """
+
+    __slots__ = ("name", "pattern", "flags", "calls", "_compiled", "matcher",
+                 "fullmatch", "search", "finditer")
+
+    def __init__(self, name: str, pattern: str, flags: int = 0):
+        self.name = name
+        self.pattern = pattern
+        self.flags = flags
+        self.calls = dict.fromkeys(_METHODS, 0)
+        self._compiled: Optional[re.Pattern] = None
+        self.matcher = None
+
+    @property
+    def compiled(self) -> re.Pattern:
+        """Patrón compilado (se compila en el primer acceso si era diferido)."""
+        if self._compiled is None:
+            self._compiled = re.compile(self.pattern, self.flags)
+        return self._compiled
+
+    @property
+    def is_compiled(self) -> bool:
+        return self._compiled is not None
+
+    def bind(self, count_calls: bool = False) -> None:
+        """
+        Enlaza los métodos públicos al patrón compilado.
+
+        Args:
+            count_calls (bool): Si es True, cada método incrementa su contador
+        """
+        compiled = self.compiled
+        for method in _METHODS:
+            target = getattr(compiled, method)
+            if method == "fullmatch":
+                target = _as_bool(target) if self.matcher is None else self.matcher.fullmatch
+            if count_calls:
+                target = self._counting(method, target)
+            setattr(self, method, target)
+
+    def bind_lazy(self, count_calls: bool = False) -> None:
+        """
+        Enlaza los métodos públicos a trampolines que compilan el patrón en la
+        primera llamada y después se reemplazan por los métodos reales.
+
+        Args:
+            count_calls (bool): Si es True, cada método incrementa su contador
+        """
+        for method in _METHODS:
+            setattr(self, method, self._trampoline(method, count_calls))
+
+    def _counting(self, method: str, target):
+        calls = self.calls
+
+        def counted(*args, **kwargs):
+            calls[method] += 1
+            return target(*args, **kwargs)
+
+        return counted
+
+    def _trampoline(self, method: str, count_calls: bool):
+        def first_call(*args, **kwargs):
+            self.bind(count_calls)
+            return getattr(self, method)(*args, **kwargs)
+
+        return first_call
+
+    def __repr__(self) -> str:
+        return f"RegisteredPattern({self.name!r}, compiled={self.is_compiled})"
+
+
+class PatternRegistry:
+    """
+    Colección de patrones precompilados accesibles por nombre.
+
+    Args:
+        lazy (bool): Si es True, cada patrón se compila en su primer uso
+        count_calls (bool): Si es True, se cuentan las llamadas por patrón
+    """
+
+    def __init__(self, lazy: bool = False, count_calls: bool = False):
+        self.lazy = lazy
+        self.count_calls = count_calls
+        self._patterns: Dict[str, RegisteredPattern] = {}
+
+    def register(self, name: str, pattern: str, flags: int = 0) -> RegisteredPattern:
+        """
+        Registra (o reemplaza) un patrón bajo un nombre.
+
+        Args:
+            name (str): Nombre con el que se consultará el patrón
+            pattern (str): Patrón regex
+            flags (int): Flags de compilación de `re`
+
+        Returns:
+            RegisteredPattern: Entrada registrada
+        """
+        entry = RegisteredPattern(name, pattern, flags)
+        if self.lazy:
+            entry.bind_lazy(self.count_calls)
+        else:
+            entry.bind(self.count_calls)
+        self._patterns[name] = entry
+        return entry
+
+    def __getitem__(self, name: str) -> RegisteredPattern:
+        return self._patterns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._patterns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._patterns)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def fullmatch(self, name: str, string: str) -> bool:
+        """Indica si `string` completo cumple el patrón `name`."""
+        return self._patterns[name].fullmatch(string)
+
+    def search(self, name: str, string: str):
+        """Aplica `search` del patrón `name` sobre `string`."""
+        return self._patterns[name].search(string)
+
+    def finditer(self, name: str, string: str):
+        """Aplica `finditer` del patrón `name` sobre `string`."""
+        return self._patterns[name].finditer(string)
+
+    def use_matcher(self, name: str, matcher) -> None:
+        """
+        Sustituye el `fullmatch` del patrón `name` por el de otro motor.
+
+        Args:
+            name (str): Nombre del patrón
+            matcher: Objeto con un método `fullmatch(str) -> bool` equivalente al del
+                     patrón, o None para volver a usar `re`
+        """
+        entry = self._patterns[name]
+        entry.matcher = matcher
+        if entry.is_compiled:
+            entry.bind(self.count_calls)
+        else:
+            entry.bind_lazy(self.count_calls)
+
+    def compile_all(self) -> None:
+        """Compila ahora todos los patrones que aún estén pendientes."""
+        for entry in self._patterns.values():
+            entry.bind(self.count_calls)
+
+    def set_call_counting(self, enabled: bool) -> None:
+        """
+        Activa o desactiva los contadores de llamadas de todos los patrones.
+
+        Los patrones diferidos que aún no se han compilado siguen siéndolo.
+
+        Args:
+            enabled (bool): Nuevo estado de los contadores
+        """
+        self.count_calls = enabled
+        for entry in self._patterns.values():
+            if entry.is_compiled:
+                entry.bind(enabled)
+            else:
+                entry.bind_lazy(enabled)
+
+    def call_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Retorna los contadores de llamadas por patrón y método.
+
+        Returns:
+            Dict[str, Dict[str, int]]: {nombre: {método: llamadas}}
+        """
+        return {name: dict(entry.calls) for name, entry in self._patterns.items()}
+
+    def reset_counts(self) -> None:
+        """Pone a cero todos los contadores de llamadas."""
+        for entry in self._patterns.values():
+            for method in _METHODS:
+                entry.calls[method] = 0
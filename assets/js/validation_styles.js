@@ -0,0 +1,290 @@
+(function() {
+    // Interceptar y sobrescribir estilos de Streamlit de forma agresiva
+    function forceCorrectBorderColors() {
+        document.querySelectorAll('input, textarea, select').forEach(function(input) {
+            const container = input.closest('.stTextInput, .stTextArea, .stSelectbox');
+            if (!container) return;
+
+            const computedStyle = window.getComputedStyle(input);
+            const borderColor = computedStyle.borderColor;
+            const isFocused = document.activeElement === input;
+
+            // Detectar si Streamlit aplicó un borde rojo
+            const isRedBorder = borderColor.includes('220') || borderColor.includes('rgb(220') || 
+                               borderColor.includes('#dc') || borderColor.toLowerCase().includes('red');
+
+            // Si no hay validación y no está enfocado, forzar borde gris
+            if (!container.classList.contains('field-valid') && 
+                !container.classList.contains('field-error') && 
+                !container.classList.contains('field-warning')) {
+                if (!isFocused && isRedBorder) {
+                    // Forzar borde gris
+                    input.style.setProperty('border-color', '#4a5568', 'important');
+                    input.style.setProperty('box-shadow', '', 'important');
+                } else if (isFocused && !isRedBorder) {
+                    // Si está enfocado y no es rojo, aplicar azul
+                    input.style.setProperty('border-color', '#2c5282', 'important');
+                    input.style.setProperty('box-shadow', '0 0 0 2px rgba(44, 82, 130, 0.2)', 'important');
+                } else if (!isFocused && !isRedBorder) {
+                    // Si no está enfocado y no es rojo, aplicar gris
+                    input.style.setProperty('border-color', '#4a5568', 'important');
+                    input.style.setProperty('box-shadow', '', 'important');
+                }
+            }
+        });
+    }
+
+    function applyFieldValidationStyles() {
+        // Buscar todos los campos de entrada
+        const fieldContainers = document.querySelectorAll('.stTextInput, .stTextArea, .stSelectbox');
+
+        fieldContainers.forEach(function(container) {
+            // Primero, remover todas las clases de validación
+            container.classList.remove('field-valid', 'field-error', 'field-warning');
+
+            // Buscar el mensaje de validación más cercano después del campo
+            // En Streamlit, los mensajes suelen estar en el siguiente elemento hermano
+            let found = false;
+            let current = container;
+            let validationStatus = null;
+
+            // Buscar en el siguiente elemento hermano directo
+            let next = current.nextElementSibling;
+            let maxSearch = 5; // Limitar la búsqueda a los siguientes 5 elementos
+            let searchCount = 0;
+
+            while (next && !found && searchCount < maxSearch) {
+                // Buscar mensajes de validación directamente en el elemento
+                const directMsg = next.querySelector && next.querySelector('.validation-success, .validation-error, .validation-warning');
+                if (directMsg) {
+                    found = true;
+                    if (directMsg.classList.contains('validation-success')) {
+                        validationStatus = 'valid';
+                        container.classList.add('field-valid');
+                    } else if (directMsg.classList.contains('validation-error')) {
+                        validationStatus = 'error';
+                        container.classList.add('field-error');
+                    } else if (directMsg.classList.contains('validation-warning')) {
+                        validationStatus = 'warning';
+                        container.classList.add('field-warning');
+                    }
+                    break;
+                }
+
+                // También verificar si el elemento mismo es un mensaje de validación
+                if (next.classList && (
+                    next.classList.contains('validation-success') ||
+                    next.classList.contains('validation-error') ||
+                    next.classList.contains('validation-warning')
+                )) {
+                    found = true;
+                    if (next.classList.contains('validation-success')) {
+                        validationStatus = 'valid';
+                        container.classList.add('field-valid');
+                    } else if (next.classList.contains('validation-error')) {
+                        validationStatus = 'error';
+                        container.classList.add('field-error');
+                    } else if (next.classList.contains('validation-warning')) {
+                        validationStatus = 'warning';
+                        container.classList.add('field-warning');
+                    }
+                    break;
+                }
+
+                next = next.nextElementSibling;
+                searchCount++;
+            }
+
+            // Aplicar estilos directamente a los inputs para sobrescribir estilos inline
+            const inputs = container.querySelectorAll('input, textarea, select');
+            inputs.forEach(function(input) {
+                // Remover cualquier estilo inline de borde que Streamlit pueda haber aplicado
+                if (input.style.borderColor && !validationStatus) {
+                    input.style.borderColor = '';
+                }
+
+                // Aplicar estilos según el estado de validación
+                if (validationStatus === 'valid') {
+                    input.style.borderColor = '#10b981';
+                    input.style.boxShadow = '0 0 0 2px rgba(16, 185, 129, 0.2)';
+                } else if (validationStatus === 'error') {
+                    input.style.borderColor = '#dc3545';
+                    input.style.boxShadow = '0 0 0 2px rgba(220, 53, 69, 0.2)';
+                } else if (validationStatus === 'warning') {
+                    input.style.borderColor = '#ffc107';
+                    input.style.boxShadow = '0 0 0 2px rgba(255, 193, 7, 0.2)';
+                } else {
+                    // Sin validación: borde gris por defecto
+                    input.style.borderColor = '#4a5568';
+                    input.style.boxShadow = '';
+                }
+            });
+        });
+    }
+
+    // Función para manejar el focus de los campos
+    function handleFieldFocus() {
+        document.querySelectorAll('.stTextInput input, .stTextArea textarea, .stSelectbox select').forEach(function(input) {
+            const container = input.closest('.stTextInput, .stTextArea, .stSelectbox');
+            if (container) {
+                // Solo aplicar borde azul si no tiene clase de validación
+                if (!container.classList.contains('field-valid') && 
+                    !container.classList.contains('field-error') && 
+                    !container.classList.contains('field-warning')) {
+                    input.addEventListener('focus', function() {
+                        this.style.borderColor = '#2c5282';
+                        this.style.boxShadow = '0 0 0 2px rgba(44, 82, 130, 0.2)';
+                    });
+                    input.addEventListener('blur', function() {
+                        // Restaurar el color según el estado de validación
+                        setTimeout(function() {
+                            applyFieldValidationStyles();
+                        }, 50);
+                    });
+                }
+            }
+        });
+    }
+
+    // Función para aplicar estilos cuando cambia el input
+    function setupInputListeners() {
+        document.querySelectorAll('.stTextInput input, .stTextArea textarea, .stSelectbox select').forEach(function(input) {
+            // Solo agregar listeners si no los tiene ya
+            if (!input.hasAttribute('data-validation-listener')) {
+                input.setAttribute('data-validation-listener', 'true');
+
+                // Agregar listener para cuando el usuario escribe
+                input.addEventListener('input', function() {
+                    setTimeout(applyFieldValidationStyles, 50);
+                });
+
+                // Agregar listener para cuando el campo pierde el foco
+                input.addEventListener('blur', function() {
+                    setTimeout(applyFieldValidationStyles, 50);
+                });
+
+                // Listener para focus - aplicar borde azul si no hay validación
+                input.addEventListener('focus', function() {
+                    const container = this.closest('.stTextInput, .stTextArea, .stSelectbox');
+                    if (container && !container.classList.contains('field-valid') && 
+                        !container.classList.contains('field-error') && 
+                        !container.classList.contains('field-warning')) {
+                        this.style.borderColor = '#2c5282';
+                        this.style.boxShadow = '0 0 0 2px rgba(44, 82, 130, 0.2)';
+                    }
+                });
+            }
+        });
+    }
+
+    // Ejecutar cuando el DOM esté listo
+    function init() {
+        applyFieldValidationStyles();
+        setupInputListeners();
+        handleFieldFocus();
+        observeInputStyles();
+        forceCorrectBorderColors();
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+
+    // Ejecutar después de delays para asegurar que Streamlit haya renderizado
+    setTimeout(init, 100);
+    setTimeout(init, 300);
+    setTimeout(init, 600);
+    setTimeout(init, 1000);
+
+    // Ejecutar periódicamente para forzar estilos y sobrescribir cambios de Streamlit
+    setInterval(function() {
+        applyFieldValidationStyles();
+        forceCorrectBorderColors();
+    }, 100); // Ejecutar cada 100ms para ser más agresivo
+
+    // Observar cambios en atributos de estilo para interceptar cambios de Streamlit
+    const styleObserver = new MutationObserver(function(mutations) {
+        mutations.forEach(function(mutation) {
+            if (mutation.type === 'attributes' && mutation.attributeName === 'style') {
+                const target = mutation.target;
+                if (target.tagName === 'INPUT' || target.tagName === 'TEXTAREA' || target.tagName === 'SELECT') {
+                    setTimeout(forceCorrectBorderColors, 10);
+                }
+            }
+        });
+    });
+
+    // Observar todos los inputs para cambios de estilo
+    function observeInputStyles() {
+        document.querySelectorAll('input, textarea, select').forEach(function(input) {
+            styleObserver.observe(input, {
+                attributes: true,
+                attributeFilter: ['style']
+            });
+        });
+    }
+
+    // Observar cambios en el DOM para aplicar estilos cuando se agreguen nuevos elementos
+    const observer = new MutationObserver(function(mutations) {
+        let shouldApply = false;
+        mutations.forEach(function(mutation) {
+            if (mutation.addedNodes.length > 0) {
+                mutation.addedNodes.forEach(function(node) {
+                    if (node.nodeType === 1) {
+                        // Verificar si se agregó un mensaje de validación
+                        if (node.classList && (
+                            node.classList.contains('validation-success') ||
+                            node.classList.contains('validation-error') ||
+                            node.classList.contains('validation-warning')
+                        )) {
+                            shouldApply = true;
+                        }
+                        // Verificar si se agregó un campo de entrada
+                        if (node.classList && (
+                            node.classList.contains('stTextInput') ||
+                            node.classList.contains('stTextArea') ||
+                            node.classList.contains('stSelectbox')
+                        )) {
+                            shouldApply = true;
+                        }
+                        // Verificar si contiene mensajes de validación
+                        if (node.querySelector && node.querySelector('.validation-success, .validation-error, .validation-warning')) {
+                            shouldApply = true;
+                        }
+
+                        // Si se agregaron nuevos inputs, observarlos también
+                        const newInputs = node.querySelectorAll ? node.querySelectorAll('input, textarea, select') : [];
+                        newInputs.forEach(function(input) {
+                            styleObserver.observe(input, {
+                                attributes: true,
+                                attributeFilter: ['style']
+                            });
+                        });
+                        // Si el nodo mismo es un input
+                        if (node.tagName === 'INPUT' || node.tagName === 'TEXTAREA' || node.tagName === 'SELECT') {
+                            styleObserver.observe(node, {
+                                attributes: true,
+                                attributeFilter: ['style']
+                            });
+                        }
+                    }
+                });
+            }
+        });
+        if (shouldApply) {
+            setTimeout(function() {
+                applyFieldValidationStyles();
+                setupInputListeners();
+                observeInputStyles();
+                forceCorrectBorderColors();
+            }, 100);
+        }
+    });
+
+    observer.observe(document.body, {
+        childList: true,
+        subtree: true
+    });
+})();
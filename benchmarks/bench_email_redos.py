@@ -0,0 +1,91 @@
+"""
+Benchmark de entradas adversarias para la validación de emails.
+
+Mide la latencia de la validación estructural (lineal) y de la extracción con
+`extract_all` (que usa PATTERN_EMAIL_BUSQUEDA) frente a la longitud de la
+entrada para varias familias de entradas diseñadas para provocar retroceso
+en PATTERN_EMAIL. El patrón original solo se mide en longitudes pequeñas,
+porque con entradas mayores no termina en un tiempo razonable.
+
+Uso:
+    python -m benchmarks.bench_email_redos
+"""
+import re
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+from app.services.extractor import extract_all
+from app.validators.patterns import PATTERN_EMAIL, _is_email_structure, validate_email
+
+
+# Familias de entradas adversarias: cada función recibe n y construye la entrada
+FAMILIAS: Dict[str, Callable[[int], str]] = {
+    "comillas_dobles": lambda n: '""' * n + "!",
+    "comillas_con_atomos": lambda n: '"' + '".a"' * n + "!",
+    "comillas_escapadas": lambda n: '"' + '\\"' * n + "!",
+    "atomos_con_puntos": lambda n: "a." * n + "!",
+    "dominio_profundo": lambda n: "a@" + "a." * n + "!",
+    "etiqueta_larga": lambda n: "a@" + "a" * n + "!",
+}
+
+LONGITUDES = (8, 64, 512, 4096, 32768, 262144)
+
+# Longitud máxima con la que se ejecuta el patrón original
+LIMITE_PATRON_ORIGINAL = 24
+
+_ORIGINAL = re.compile(PATTERN_EMAIL)
+
+
+def medir(func: Callable[[str], object], entrada: str, repeticiones: int = 5) -> float:
+    """
+    Mide la mediana del tiempo de ejecución de una función.
+
+    Args:
+        func: Función a medir
+        entrada (str): Argumento de la función
+        repeticiones (int): Número de repeticiones
+
+    Returns:
+        float: Mediana en microsegundos
+    """
+    tiempos: List[float] = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        func(entrada)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1e6
+
+
+def main() -> int:
+    print(f"{'familia':<22}{'n':>8}{'longitud':>10}"
+          f"{'estructural µs':>16}{'µs/char':>10}{'validate µs':>13}"
+          f"{'extract µs':>13}{'µs/char':>10}{'original µs':>14}")
+    for nombre, construir in FAMILIAS.items():
+        for n in LONGITUDES:
+            entrada = construir(n)
+            estructural = medir(_is_email_structure, entrada)
+            validador = medir(validate_email, entrada)
+            extractor = medir(extract_all, entrada, 3)
+            if len(entrada) <= LIMITE_PATRON_ORIGINAL:
+                original = f"{medir(_ORIGINAL.fullmatch, entrada, 1):14.1f}"
+            else:
+                original = f"{'omitido':>14}"
+            print(f"{nombre:<22}{n:>8}{len(entrada):>10}{estructural:16.1f}"
+                  f"{estructural / len(entrada):10.4f}{validador:13.1f}"
+                  f"{extractor:13.1f}{extractor / len(entrada):10.4f}{original}")
+
+    print()
+    print("Crecimiento del patrón original con comillas_dobles:")
+    for n in range(4, 12):
+        entrada = FAMILIAS["comillas_dobles"](n)
+        original = medir(_ORIGINAL.fullmatch, entrada, 1)
+        estructural = medir(_is_email_structure, entrada)
+        print(f"  n={n:<3} longitud={len(entrada):<4} original={original:12.1f} µs"
+              f"  estructural={estructural:6.1f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+"""
+Suite de microbenchmarks de validadores y extractores.
+
+Mide cada `validate_*`, `find_patterns`, `extract_all`, `validate_all_fields`
+y `validate_batch` con entradas cortas, típicas, de longitud máxima y
+adversarias. Reporta operaciones por segundo y percentiles de latencia por
+operación (medidos en lotes cortos, ver `measure`), guarda los resultados en JSON y los compara con una línea base:
+si algún caso es más lento que la línea base más la tolerancia, o no tiene
+medida en ella, el proceso termina con código 1.
+
+Uso:
+    python -m benchmarks.run                       # medir y comparar con la línea base
+    python -m benchmarks.run --output out.json     # guardar resultados
+    python -m benchmarks.run --save-baseline       # reemplazar la línea base
+    python -m benchmarks.run --filter email --quick
+
+La línea base depende de la máquina: debe regenerarse (--save-baseline) en la
+misma máquina donde se ejecuta la comparación.
+
+Las funciones se miden sin el envoltorio de métricas (salvo que se defina
+PATRONES_METRICS_ENABLED): lo que se compara es el coste de los validadores.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# Antes de importar los validadores: `instrumented` decide al decorar
+os.environ.setdefault("PATRONES_METRICS_ENABLED", "0")
+
+from app.services.extractor import extract_all
+from app.validators.memo import ValidationMemo
+from app.validators.patterns import (
+    find_patterns,
+    validate_all_fields,
+    validate_batch,
+    validate_date,
+    validate_dni,
+    validate_email,
+    validate_phone,
+    validate_postal_code,
+    validate_url,
+)
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TOLERANCE = 0.30
+
+# Duración aproximada de cada lote medido y número mínimo de lotes por caso
+BATCH_SECONDS = 0.00005
+MIN_BATCHES = 100
+
+
+@dataclass(frozen=True)
+class Case:
+    """Caso de benchmark: una función aplicada a una entrada fija."""
+    name: str
+    func: Callable[[Any], Any]
+    arg: Any
+
+
+# =============================================================================
+# ENTRADAS
+# =============================================================================
+
+_PARRAFO = (
+    "El equipo de LaboraUQ revisó las solicitudes recibidas durante la semana. "
+    "Para dudas escriba a soporte@laborauq.edu.co o llame al +573001234567. "
+    "La convocatoria cierra el 15/08/2025 y los documentos (DNI 12345678A, "
+    "código postal 630001) se cargan en https://laborauq.streamlit.app/registro?paso=2. "
+)
+_TEXTO_SIN_ENTIDADES = "Lorem ipsum dolor sit amet, consectetur adipiscing elit sed do eiusmod. " * 70
+
+_REGISTRO = {
+    "email": "usuario@empresa.com",
+    "phone": "+573001234567",
+    "date": "15/08/2000",
+    "dni": "12345678A",
+    "postal_code": "630001",
+    "url": "https://github.com/usuario/proyecto",
+}
+
+
+def _lote(cantidad: int) -> List[Dict[str, str]]:
+    return [dict(_REGISTRO, email=f"usuario{i}@empresa.com", dni=f"{10000000 + i}A")
+            for i in range(cantidad)]
+
+
+# Caché propia para que los casos memoizados no dependan de la global
+_MEMO = ValidationMemo()
+
+
+def build_cases() -> List[Case]:
+    """
+    Construye la lista de casos del benchmark.
+
+    Returns:
+        List[Case]: Casos agrupados por función y tipo de entrada
+    """
+    return [
+        Case("validate_email/short", validate_email, "a@b.co"),
+        Case("validate_email/typical", validate_email, "nombre_apellido@empresa.com.co"),
+        Case("validate_email/max", validate_email, "a" * 64 + "@" + ".".join(["d" * 60] * 3) + ".com"),
+        Case("validate_email/adversarial", validate_email, '""' * 120 + "!"),
+        Case("validate_phone/short", validate_phone, "+12345678"),
+        Case("validate_phone/typical", validate_phone, "+573001234567"),
+        Case("validate_phone/max", validate_phone, "+123456789012345"),
+        Case("validate_phone/adversarial", validate_phone, "+" + "1" * 5000),
+        Case("validate_date/short", validate_date, "01/01/1"),
+        Case("validate_date/typical", validate_date, "15/08/2000"),
+        Case("validate_date/max", validate_date, "31/12/-" + "9" * 64),
+        Case("validate_date/adversarial", validate_date, "01/01/" + "1" * 5000 + "x"),
+        Case("validate_dni/short", validate_dni, "ABCD"),
+        Case("validate_dni/typical", validate_dni, "12345678A"),
+        Case("validate_dni/max", validate_dni, "A" * 18),
+        Case("validate_dni/adversarial", validate_dni, "A" * 5000),
+        Case("validate_postal_code/short", validate_postal_code, "123"),
+        Case("validate_postal_code/typical", validate_postal_code, "630001"),
+        Case("validate_postal_code/max", validate_postal_code, "123456789"),
+        Case("validate_postal_code/adversarial", validate_postal_code, "1" * 5000),
+        Case("validate_url/short", validate_url, "http://a.b"),
+        Case("validate_url/typical", validate_url, "https://github.com/usuario/proyecto"),
+        Case("validate_url/max", validate_url,
+             "https://" + ".".join(["h" * 61] * 4) + ":65535/" + "p" * 1500 + "?q=" + "v" * 400),
+        Case("validate_url/adversarial", validate_url, "a" + "a." * 2500 + "!"),
+        Case("validate_email/memoized", _MEMO.wrap(validate_email), "nombre_apellido@empresa.com.co"),
+        Case("validate_url/memoized", _MEMO.wrap(validate_url), "https://github.com/usuario/proyecto"),
+        Case("find_patterns/short", lambda text: find_patterns(text, r"\d+"), "abc 123 def"),
+        Case("find_patterns/typical", lambda text: find_patterns(text, r"[\w.+-]+@[\w-]+\.[\w.]+"),
+             _PARRAFO * 10),
+        Case("find_patterns/max", lambda text: find_patterns(text, r"\d{3,}"), _PARRAFO * 500),
+        Case("find_patterns/adversarial", lambda text: find_patterns(text, r"(a|aa)+b"), "a" * 24),
+        Case("find_patterns/literal", lambda text: find_patterns(text, r"[a-z0-9._-]+@[a-z0-9-]+\.[a-z.]+"),
+             _TEXTO_SIN_ENTIDADES * 10 + _PARRAFO),
+        Case("extract_all/short", extract_all, "escribe a a@b.co"),
+        Case("extract_all/typical", extract_all, _PARRAFO * 10),
+        Case("extract_all/no_entities", extract_all, _TEXTO_SIN_ENTIDADES),
+        Case("extract_all/max", extract_all, _PARRAFO * 1000),
+        Case("extract_all/adversarial", extract_all, '""' * 500 + "!"),
+        Case("extract_all/dotted", extract_all, "a." * 5000 + "!"),
+        Case("validate_all_fields/typical", validate_all_fields, _REGISTRO),
+        Case("validate_all_fields/invalid", validate_all_fields,
+             {field: "x" for field in _REGISTRO}),
+        Case("validate_batch/1000", validate_batch, _lote(1000)),
+    ]
+
+
+# =============================================================================
+# MEDICIÓN
+# =============================================================================
+
+def _calibrate(func: Callable[[Any], Any], arg: Any, target_seconds: float) -> int:
+    """Número de repeticiones necesarias para que un lote dure target_seconds."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(arg)
+        elapsed = time.perf_counter() - start
+        if elapsed >= target_seconds or loops >= 1 << 20:
+            return loops
+        loops = max(loops * 2, int(loops * target_seconds / max(elapsed, 1e-9)))
+
+
+def measure(case: Case, seconds: float = 0.3,
+            batch_seconds: float = BATCH_SECONDS) -> Dict[str, float]:
+    """
+    Mide un caso y calcula el rendimiento y los percentiles por operación.
+
+    Cada medida es un lote de operaciones que dura unos `batch_seconds`:
+    una sola operación si es más lenta, o las necesarias para que el coste
+    del reloj no cuente si es más rápida. Se toman lotes durante `seconds`,
+    y como mínimo MIN_BATCHES para que p95 y p99 salgan de una distribución
+    y no de la muestra más lenta. En las operaciones más cortas que un lote
+    los percentiles son de la media de cada lote, no de llamadas sueltas.
+
+    Args:
+        case (Case): Caso a medir
+        seconds (float): Duración aproximada de la medición
+        batch_seconds (float): Duración aproximada de cada lote
+
+    Returns:
+        Dict[str, float]: ops_per_sec, percentiles p50/p95/p99 y mínimo en
+                          microsegundos por operación, operaciones por lote
+                          y número de lotes
+    """
+    func, arg = case.func, case.arg
+    loops = _calibrate(func, arg, batch_seconds)
+    per_op: List[float] = []
+    deadline = time.perf_counter() + seconds
+    while len(per_op) < MIN_BATCHES or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(arg)
+        per_op.append((time.perf_counter() - start) / loops)
+    cuts = statistics.quantiles(per_op, n=100, method="inclusive")
+    p50 = cuts[49]
+    return {
+        "ops_per_sec": len(per_op) / sum(per_op),
+        "p50_us": p50 * 1e6,
+        "p95_us": cuts[94] * 1e6,
+        "p99_us": cuts[98] * 1e6,
+        "min_us": min(per_op) * 1e6,
+        "loops": loops,
+        "batches": len(per_op),
+    }
+
+
+def _reference_workload() -> None:
+    total = 0
+    for i in range(20000):
+        total += i * i % 7
+    "".join(str(i) for i in range(2000)).count("7")
+
+
+def calibrate_machine(repeats: int = 20) -> float:
+    """
+    Mide una carga de trabajo fija que no depende del código del proyecto.
+
+    La relación entre esta medida y la de la línea base estima cuánto más
+    rápida o lenta está la máquina en esta ejecución, y se usa para
+    normalizar la comparación.
+
+    Args:
+        repeats (int): Número de repeticiones
+
+    Returns:
+        float: Tiempo mínimo de la carga de referencia en microsegundos
+    """
+    tiempos = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        _reference_workload()
+        tiempos.append(time.perf_counter() - start)
+    return min(tiempos) * 1e6
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float = DEFAULT_TOLERANCE, speed_ratio: float = 1.0) -> List[str]:
+    """
+    Compara los resultados con la línea base usando el mínimo por operación,
+    la medida menos sensible al ruido de otros procesos de la máquina. Un caso
+    sin medida en la línea base también es un fallo: hay que regenerarla con
+    --save-baseline al añadir casos.
+
+    Args:
+        results: Resultados actuales por caso
+        baseline: Resultados de la línea base por caso
+        tolerance (float): Aumento relativo permitido (0.30 = 30 %)
+        speed_ratio (float): Calibración actual / calibración de la línea base
+
+    Returns:
+        List[str]: Descripción de cada regresión o caso sin línea base
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            regressions.append(f"{name}: sin medida en la línea base")
+            continue
+        ratio = current["min_us"] / (reference["min_us"] * speed_ratio)
+        if ratio > 1.0 + tolerance:
+            regressions.append(
+                f"{name}: {current['min_us']:.2f} µs vs {reference['min_us']:.2f} µs "
+                f"(+{(ratio - 1) * 100:.0f} %)"
+            )
+    return regressions
+
+
+def _load_json(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks de validadores y extractores")
+    parser.add_argument("--filter", default="", help="Solo casos cuyo nombre contenga este texto")
+    parser.add_argument("--quick", action="store_true", help="Menos muestras, más rápido y ruidoso")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Archivo JSON de línea base")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como línea base")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Aumento relativo permitido del mínimo (por defecto 0.30)")
+    args = parser.parse_args(argv)
+
+    seconds = 0.03 if args.quick else 0.3
+    cases = [case for case in build_cases() if args.filter in case.name]
+
+    calibration_start = calibrate_machine()
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'caso':<36}{'ops/s':>14}{'p50 µs':>12}{'p95 µs':>12}{'p99 µs':>12}")
+    for case in cases:
+        stats = measure(case, seconds)
+        results[case.name] = stats
+        print(f"{case.name:<36}{stats['ops_per_sec']:14,.0f}{stats['p50_us']:12.2f}"
+              f"{stats['p95_us']:12.2f}{stats['p99_us']:12.2f}")
+
+    # La velocidad de la máquina se estima al principio y al final de la ejecución
+    calibration_us = (calibration_start + calibrate_machine()) / 2
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration_us": calibration_us,
+        "results": results,
+    }
+    if args.output:
+        _write_json(args.output, document)
+    if args.save_baseline:
+        _write_json(args.baseline, document)
+        print(f"\nLínea base guardada en {args.baseline}")
+        return 0
+
+    baseline = _load_json(args.baseline)
+    if baseline is None:
+        print(f"\nNo hay línea base en {args.baseline}; use --save-baseline para crearla")
+        return 0
+    speed_ratio = calibration_us / baseline.get("calibration_us", calibration_us)
+    print(f"\nVelocidad relativa de la máquina frente a la línea base: {speed_ratio:.2f}x")
+    regressions = compare(results, baseline["results"], args.tolerance, speed_ratio)
+    if regressions:
+        print(f"\nREGRESIONES (tolerancia {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nSin regresiones frente a la línea base (tolerancia {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
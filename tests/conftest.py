@@ -0,0 +1,12 @@
+"""
+Configuración común de los tests.
+"""
+import os
+
+# La API carga el índice de duplicados al arrancar: los tests usan una base
+# en memoria en lugar de crear laborauq.db en el directorio de trabajo
+os.environ.setdefault("PATRONES_DATABASE_URL", "sqlite://")
+
+# Los tests de métricas necesitan las funciones instrumentadas aunque otro
+# módulo importado antes (p. ej. benchmarks.run) prefiera desactivarlas
+os.environ.setdefault("PATRONES_METRICS_ENABLED", "1")
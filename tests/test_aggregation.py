@@ -0,0 +1,110 @@
+"""
+Tests unitarios para la agregación de entidades.
+"""
+from collections import Counter
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.aggregation import (
+    EntityAggregator,
+    aggregate_entities,
+    email_domain,
+    normalize_url,
+    url_host,
+)
+from app.services.extractor import extract_all
+
+
+TEXTO = (
+    "Escribe a ana@empresa.com o ana@empresa.com; copia a luis@otra.co. "
+    "Web https://GitHub.com/Usuario/repo y https://github.com/Usuario/repo "
+    "también https://docs.github.com:8080/x?y=1 DNI 12345678A "
+) * 3
+
+
+class TestNormalizers:
+    """Tests para la normalización de valores"""
+
+    @pytest.mark.parametrize("url, host", [
+        ("https://GitHub.com/Usuario", "github.com"),
+        ("http://user:pw@docs.example.com:8080/x?y=1", "docs.example.com"),
+        ("https://a.co?x=1", "a.co"),
+        ("ftp://Files.Example.org#frag", "files.example.org"),
+    ])
+    def test_url_host(self, url, host):
+        """Test del host de una URL"""
+        assert url_host(url) == host
+
+    def test_normalize_url(self):
+        """Test que solo el esquema y el host pasan a minúsculas"""
+        assert normalize_url("HTTPS://GitHub.COM/Ab?Q=1") == "https://github.com/Ab?Q=1"
+        assert normalize_url("http://A.co") == "http://a.co"
+
+    def test_email_domain(self):
+        """Test del dominio de un email"""
+        assert email_domain("Ana@Empresa.COM") == "empresa.com"
+
+
+class TestAggregateEntities:
+    """Tests para aggregate_entities"""
+
+    def test_counts(self):
+        """Test que los valores se cuentan normalizados"""
+        result = aggregate_entities(TEXTO)
+        types = result["types"]
+        assert result["count"] == extract_all(TEXTO)["count"]
+        assert types["email"]["count"] == 9
+        assert types["email"]["distinct"] == 2
+        assert types["email"]["top"][0] == {"value": "ana@empresa.com", "count": 6}
+        assert types["email_domain"]["top"] == [{"value": "empresa.com", "count": 6},
+                                                {"value": "otra.co", "count": 3}]
+        assert types["url_host"]["top"][0] == {"value": "github.com", "count": 6}
+        assert types["url"]["distinct"] == 2
+        assert types["dni"]["top"] == [{"value": "12345678A", "count": 3}]
+
+    def test_same_as_counting_extract_all(self):
+        """Test que los totales coinciden con contar la lista completa"""
+        result = aggregate_entities(TEXTO)
+        kinds = Counter(entity["type"] for entity in extract_all(TEXTO)["entities"])
+        for kind, count in kinds.items():
+            assert result["types"][kind]["count"] == count
+
+    def test_top_k(self):
+        """Test que top_k acota la lista y desempata por primera aparición"""
+        text = " ".join(["c@x.co", "a@x.co", "b@x.co", "a@x.co", "c@x.co"])
+        top = aggregate_entities(text, top_k=2)["types"]["email"]["top"]
+        assert top == [{"value": "c@x.co", "count": 2}, {"value": "a@x.co", "count": 2}]
+
+    def test_empty_text(self):
+        """Test con texto vacío"""
+        result = aggregate_entities("")
+        assert result["count"] == 0
+        assert result["types"]["email"] == {"count": 0, "distinct": 0, "top": []}
+
+    def test_aggregator_memory(self):
+        """Test que solo se guardan los valores distintos"""
+        aggregator = EntityAggregator(top_k=1)
+        for _ in range(10_000):
+            aggregator.add("email", "a@b.co")
+        assert aggregator.count == 10_000
+        assert len(aggregator.counters["email"]) == 1
+
+
+class TestAggregateEndpoint:
+    """Tests para POST /api/v1/extract/aggregate"""
+
+    def test_endpoint(self):
+        """Test que el endpoint retorna la agregación"""
+        with TestClient(app) as client:
+            response = client.post("/api/v1/extract/aggregate",
+                                   json={"text": TEXTO, "top_k": 1})
+        assert response.status_code == 200
+        assert response.json() == aggregate_entities(TEXTO, top_k=1)
+
+    def test_invalid_top_k(self):
+        """Test que top_k fuera de rango da 422"""
+        with TestClient(app) as client:
+            response = client.post("/api/v1/extract/aggregate", json={"text": "x", "top_k": 0})
+        assert response.status_code == 422
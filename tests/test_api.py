@@ -0,0 +1,68 @@
+"""
+Tests de los endpoints de la API.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class TestRoot:
+    """Tests para el endpoint raíz"""
+
+    def test_root(self, client):
+        """Test mensaje de bienvenida"""
+        response = client.get("/")
+        assert response.status_code == 200
+        assert "message" in response.json()
+
+
+class TestExtractEndpoint:
+    """Tests para POST /api/v1/extract"""
+
+    def test_extract(self, client):
+        """Test extracción de entidades"""
+        response = client.post("/api/v1/extract", json={"text": "mail: a@b.co tel +12345678"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 2
+        assert [e["type"] for e in data["entities"]] == ["email", "phone"]
+
+    def test_extract_missing_text(self, client):
+        """Test petición sin texto"""
+        response = client.post("/api/v1/extract", json={})
+        assert response.status_code == 422
+
+
+class TestValidateBatchEndpoint:
+    """Tests para POST /api/v1/validate/batch"""
+
+    def test_validate_batch(self, client):
+        """Test validación de un lote de registros"""
+        records = [
+            {"email": "a@b.co", "phone": "+12345678"},
+            {"email": "invalido", "phone": "+12345678"},
+        ]
+        response = client.post("/api/v1/validate/batch", json={"records": records})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["valid"] == 1
+        assert data["results"][1] == {"valid": False, "errors": ["email"]}
+
+    def test_validate_batch_empty(self, client):
+        """Test lote vacío"""
+        response = client.post("/api/v1/validate/batch", json={"records": []})
+        assert response.status_code == 200
+        assert response.json()["total"] == 0
+
+    def test_validate_batch_invalid_body(self, client):
+        """Test cuerpo sin registros"""
+        response = client.post("/api/v1/validate/batch", json={"rows": []})
+        assert response.status_code == 422
@@ -0,0 +1,53 @@
+"""
+Tests unitarios para la comparación de la suite de benchmarks con su línea base.
+"""
+from benchmarks.run import MIN_BATCHES, Case, compare, measure
+
+
+def _result(min_us):
+    """Resultado de un caso con solo la latencia mínima."""
+    return {"min_us": min_us}
+
+
+class TestCompare:
+    """Tests para la función compare"""
+
+    def test_within_tolerance(self):
+        """Test que un caso dentro de la tolerancia no es una regresión"""
+        assert compare({"a": _result(1.2)}, {"a": _result(1.0)}, tolerance=0.3) == []
+
+    def test_regression(self):
+        """Test que un caso más lento que la tolerancia se reporta"""
+        regressions = compare({"a": _result(1.5), "b": _result(1.0)},
+                              {"a": _result(1.0), "b": _result(1.0)}, tolerance=0.3)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("a:")
+        assert "+50 %" in regressions[0]
+
+    def test_speed_ratio(self):
+        """Test que la velocidad relativa de la máquina escala la línea base"""
+        results = {"a": _result(2.0)}
+        baseline = {"a": _result(1.0)}
+        assert compare(results, baseline, tolerance=0.3, speed_ratio=2.0) == []
+        assert compare(results, baseline, tolerance=0.3, speed_ratio=1.0) != []
+
+    def test_missing_from_baseline(self):
+        """Test que un caso sin medida en la línea base es un fallo"""
+        regressions = compare({"a": _result(1.0), "nuevo": _result(1.0)},
+                              {"a": _result(1.0)})
+        assert regressions == ["nuevo: sin medida en la línea base"]
+
+    def test_baseline_only_cases_ignored(self):
+        """Test que los casos no medidos (p. ej. por --filter) no fallan"""
+        assert compare({"a": _result(1.0)}, {"a": _result(1.0), "b": _result(1.0)}) == []
+
+
+class TestMeasure:
+    """Tests para la función measure"""
+
+    def test_percentiles_from_batches(self):
+        """Test que los percentiles salen de al menos MIN_BATCHES lotes"""
+        stats = measure(Case("len", len, "texto"), seconds=0.0)
+        assert stats["batches"] >= MIN_BATCHES
+        assert stats["min_us"] <= stats["p50_us"] <= stats["p95_us"] <= stats["p99_us"]
+        assert stats["ops_per_sec"] > 0
@@ -0,0 +1,114 @@
+"""
+Tests unitarios para la extracción de ficheros grandes por bloques.
+"""
+import json
+import random
+
+import pytest
+
+from app.cli import main
+from app.services.aggregation import aggregate_entities
+from app.services.bulk import iter_file_entities, plan_chunks, scan_spans, stitch
+from app.services.extractor import extract_all
+
+
+def _expected(text):
+    """Entidades de extract_all con posiciones convertidas a bytes."""
+    result = []
+    for entity in extract_all(text)["entities"]:
+        start = len(text[:entity["start"]].encode("utf-8"))
+        value = entity["value"].encode("utf-8")
+        result.append((entity["type"], value, start, start + len(value)))
+    return result
+
+
+def _sample_text(seed=7, items=5000):
+    """Texto aleatorio con entidades, separadores y caracteres no ASCII."""
+    words = ["ana@example.com", "+573001234567", "12/03/1990", "28001", "12345678A",
+             "https://github.com/usuario/repo?tab=1", "http://a.co/12345", "ñandú",
+             "texto", "ABC", "é@x.co", "-", ".", ""]
+    rng = random.Random(seed)
+    return "".join(rng.choice(words) + rng.choice(" ,;\n") for _ in range(items))
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    """Fichero UTF-8 con el texto de muestra."""
+    text = _sample_text()
+    path = tmp_path / "registros.log"
+    path.write_bytes(text.encode("utf-8"))
+    return str(path), text
+
+
+class TestChunking:
+    """Tests para la división en bloques y su unión"""
+
+    def test_plan_chunks(self):
+        """Test que los bloques cubren el fichero sin huecos"""
+        assert plan_chunks(10, 4) == [(0, 4), (4, 8), (8, 10)]
+        assert plan_chunks(0, 4) == []
+
+    def test_stitch_entity_across_boundary(self):
+        """Test que una entidad que cruza la frontera no se duplica"""
+        data = b"ver http://a.co/12345 fin 28001"
+        boundary = data.index(b"12345") + 2
+        first = scan_spans(data, 0, boundary, len(data))
+        second = scan_spans(data, boundary, len(data), len(data))
+        # El bloque siguiente, escaneado por su cuenta, ve un código postal
+        # dentro de la ruta de la URL
+        assert second[0][0] == "postal_code"
+        fixed = stitch(data, first[-1][2], second, len(data), len(data))
+        assert [kind for kind, _, _ in first + fixed] == ["url", "postal_code"]
+        assert data[fixed[0][1]:fixed[0][2]] == b"28001"
+
+    def test_stitch_without_overlap(self):
+        """Test que sin solape las entidades del bloque no cambian"""
+        data = b"28001 y 28002"
+        spans = scan_spans(data, 6, len(data), len(data))
+        assert stitch(data, 5, spans, len(data), len(data)) == spans
+
+
+class TestIterFileEntities:
+    """Tests para iter_file_entities"""
+
+    @pytest.mark.parametrize("workers,chunk_size", [(1, 1 << 20), (1, 5000), (2, 4097)])
+    def test_matches_extract_all(self, sample_file, workers, chunk_size):
+        """Test que el resultado coincide con extract_all sobre el texto completo"""
+        path, text = sample_file
+        assert list(iter_file_entities(path, workers=workers, chunk_size=chunk_size)) \
+            == _expected(text)
+
+    def test_empty_file(self, tmp_path):
+        """Test que un fichero vacío no produce entidades"""
+        path = tmp_path / "vacio.log"
+        path.write_bytes(b"")
+        assert list(iter_file_entities(str(path), workers=1)) == []
+
+
+class TestCli:
+    """Tests para la línea de comandos"""
+
+    def test_writes_jsonl(self, sample_file, tmp_path, capsys):
+        """Test que la salida es JSONL con posiciones en bytes"""
+        path, text = sample_file
+        output = tmp_path / "entidades.jsonl"
+        assert main([path, "-o", str(output), "--workers", "1"]) == 0
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        expected = _expected(text)
+        assert len(lines) == len(expected)
+        assert lines[0] == {"type": expected[0][0], "value": expected[0][1].decode(),
+                            "start": expected[0][2], "end": expected[0][3]}
+        assert f"{len(expected)} entidades" in capsys.readouterr().err
+
+    def test_aggregate(self, sample_file, tmp_path):
+        """Test que --top escribe la agregación del fichero"""
+        path, text = sample_file
+        output = tmp_path / "resumen.json"
+        assert main([path, "-o", str(output), "--workers", "1", "--top", "3"]) == 0
+        summary = json.loads(output.read_text())
+        assert summary == aggregate_entities(text, top_k=3) | {
+            "input_length": len(text.encode("utf-8"))}
+
+    def test_missing_file(self, tmp_path):
+        """Test que un fichero inexistente termina con error"""
+        assert main([str(tmp_path / "no-existe.log")]) == 2
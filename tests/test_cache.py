@@ -0,0 +1,175 @@
+"""
+Tests unitarios para las cachés acotadas de los validadores.
+"""
+import re
+import threading
+
+import pytest
+from app.validators.cache import (
+    CompiledPatternCache,
+    LRUCache,
+    PatternRejectedError,
+    check_pattern_structure,
+)
+from app.validators.patterns import find_patterns, pattern_cache
+
+
+class TestLRUCache:
+    """Tests para la clase LRUCache"""
+
+    def test_get_put(self):
+        """Test guardar y recuperar un valor"""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("b", 0) == 0
+
+    def test_eviction_least_recently_used(self):
+        """Test que expulsa el elemento menos usado"""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_counters(self):
+        """Test contadores de aciertos y fallos"""
+        cache = LRUCache(4)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("x")
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+    def test_clear(self):
+        """Test vaciar la caché"""
+        cache = LRUCache(4)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 0
+
+    def test_invalid_maxsize(self):
+        """Test tamaño máximo inválido"""
+        with pytest.raises(ValueError):
+            LRUCache(0)
+
+    def test_thread_safety(self):
+        """Test que el tamaño nunca supera el máximo con varios hilos"""
+        cache = LRUCache(16)
+
+        def worker(offset):
+            for i in range(2000):
+                cache.put((offset, i % 50), i)
+                cache.get((offset, (i + 1) % 50))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(cache) == 16
+
+
+class TestCompiledPatternCache:
+    """Tests para la clase CompiledPatternCache"""
+
+    def test_compile_reuses_pattern(self):
+        """Test que un patrón repetido no se recompila"""
+        cache = CompiledPatternCache(maxsize=4)
+        first = cache.compile(r"\d+")
+        second = cache.compile(r"\d+")
+        assert first is second
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_pattern_too_long(self):
+        """Test que rechaza patrones demasiado largos"""
+        cache = CompiledPatternCache(max_pattern_length=5)
+        with pytest.raises(PatternRejectedError):
+            cache.compile("a" * 6)
+
+    def test_compile_time_limit(self):
+        """Test que rechaza y recuerda patrones lentos de compilar"""
+        cache = CompiledPatternCache(max_compile_seconds=0.0)
+        with pytest.raises(PatternRejectedError):
+            cache.compile(r"(a|b)+c")
+        with pytest.raises(PatternRejectedError):
+            cache.compile(r"(a|b)+c")
+        assert cache.stats()["rejected"] == 1
+        assert cache.stats()["size"] == 0
+
+    @pytest.mark.parametrize("pattern", [
+        r"(a+)+",
+        r"(\w+\s?)*",
+        r"((a+)b){2,}",
+        r"(?:x*y)+",
+        r"a{1001}",
+        "(" * 11 + "a" + ")" * 11,
+    ])
+    def test_structure_rejected_before_compiling(self, pattern, monkeypatch):
+        """Test que los patrones con estructura peligrosa se rechazan sin compilar"""
+        def compile_forbidden(*args, **kwargs):
+            raise AssertionError("no debería compilarse")
+
+        cache = CompiledPatternCache()
+        monkeypatch.setattr(re, "compile", compile_forbidden)
+        with pytest.raises(PatternRejectedError):
+            cache.compile(pattern)
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.parametrize("pattern", [
+        r"(a+)?b",
+        r"(ab)+",
+        r"[(a+)]+",
+        r"\(a+\)+",
+        r"(a{1})+",
+        r"a{2,1000}",
+    ])
+    def test_structure_accepted(self, pattern):
+        """Test que los cuantificadores sin anidar se aceptan"""
+        check_pattern_structure(pattern)
+        assert CompiledPatternCache().compile(pattern).pattern == pattern
+
+    def test_invalid_regex(self):
+        """Test que un patrón inválido propaga re.error"""
+        with pytest.raises(re.error):
+            CompiledPatternCache().compile("(")
+
+    def test_bounded_size(self):
+        """Test que la caché no supera su tamaño máximo"""
+        cache = CompiledPatternCache(maxsize=3)
+        for n in range(10):
+            cache.compile(f"a{{{n}}}")
+        stats = cache.stats()
+        assert stats["size"] == 3
+        assert stats["evictions"] == 7
+
+
+class TestFindPatternsCache:
+    """Tests de find_patterns con la caché de patrones"""
+
+    def test_find_patterns_uses_cache(self):
+        """Test que find_patterns reutiliza el patrón compilado"""
+        pattern_cache.clear()
+        find_patterns("abc123", r"[0-9]{2}")
+        find_patterns("x45", r"[0-9]{2}")
+        assert pattern_cache.stats()["hits"] == 1
+
+    def test_find_patterns_rejects_long_pattern(self):
+        """Test que find_patterns rechaza patrones demasiado largos"""
+        with pytest.raises(PatternRejectedError):
+            find_patterns("texto", "a" * (pattern_cache.max_pattern_length + 1))
+
+    def test_find_patterns_rejects_nested_quantifiers(self):
+        """Test que find_patterns rechaza los cuantificadores anidados"""
+        with pytest.raises(PatternRejectedError):
+            find_patterns("aaaaaaaaaaaaaaaaaaaaaaaaaaaa!", r"(a+)+$")
@@ -0,0 +1,160 @@
+"""
+Tests unitarios para el formato columnar compacto.
+"""
+import json
+import subprocess
+import sys
+
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1 import formats
+from app.api.v1.formats import COLUMNAR_JSON, MSGPACK, FormatNotAvailable, negotiate, render
+from app.columnar import columnar_result, string_table
+from app.main import app
+from app.services.extractor import ENTITY_TYPES, extract_all, extract_columnar
+from app.validators.patterns import find_patterns
+
+
+TEXTO = "Escribe a juan@empresa.com o llama al +573001234567 (ñandú) " * 100
+
+
+def _rows(result):
+    """Reconstruye las entidades a partir de las columnas."""
+    return [
+        {"type": result["types"][kind], "value": result["strings"][value],
+         "start": start, "end": end}
+        for kind, value, start, end in zip(result["type"], result["value"],
+                                           result["start"], result["end"])
+    ]
+
+
+class TestStringTable:
+    """Tests para la tabla de valores sin repetidos"""
+
+    def test_deduplicates_in_order(self):
+        """Test que la tabla conserva el orden de primera aparición"""
+        assert string_table(["b", "a", "b", "c", "a"]) == (["b", "a", "c"], [0, 1, 0, 2, 1])
+
+    def test_tuples(self):
+        """Test con tuplas de grupos"""
+        assert string_table([("a", ""), ("a", ""), ("b", "x")]) == \
+            ([("a", ""), ("b", "x")], [0, 0, 1])
+
+
+    def test_no_framework_imports(self):
+        """Test que validadores y extractor no importan el framework web"""
+        code = ("import sys, app.validators.patterns, app.services.extractor; "
+                "print(any(name.split('.')[0] in ('starlette', 'fastapi') for name in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                check=True).stdout
+        assert output.strip() == "False"
+
+
+class TestExtractColumnar:
+    """Tests para extract_columnar"""
+
+    def test_same_entities_as_extract_all(self):
+        """Test que las columnas contienen las mismas entidades"""
+        result = extract_columnar(TEXTO)
+        expected = extract_all(TEXTO)
+        assert result["count"] == expected["count"] == 200
+        assert result["input_length"] == expected["input_length"]
+        assert _rows(result) == expected["entities"]
+        assert result["types"] == list(ENTITY_TYPES)
+        assert len(result["strings"]) == 2
+
+    def test_columnar_result(self):
+        """Test que la conversión de un resultado equivale a extract_columnar"""
+        assert columnar_result(extract_all(TEXTO), ENTITY_TYPES) == extract_columnar(TEXTO)
+
+    def test_empty_text(self):
+        """Test con texto vacío"""
+        result = extract_columnar("")
+        assert result["count"] == 0
+        assert result["strings"] == [] and result["start"] == []
+
+
+class TestFindPatternsCompact:
+    """Tests para find_patterns con compact=True"""
+
+    @pytest.mark.parametrize("pattern", [r"[a-z]+@[a-z]+", r"(\w+)@(\w+)", r"\d+"])
+    def test_same_matches(self, pattern):
+        """Test que la tabla y los índices reconstruyen las coincidencias"""
+        text = "ab@cd 12 ab@cd ef@gh 12 345"
+        compact = find_patterns(text, pattern, compact=True)
+        expected = find_patterns(text, pattern)
+        assert [compact["strings"][code] for code in compact["value"]] == expected["matches"]
+        assert compact["count"] == expected["count"]
+        assert compact["text_length"] == expected["text_length"]
+
+    def test_empty(self):
+        """Test con texto vacío"""
+        assert find_patterns("", r"\d", compact=True)["count"] == 0
+
+
+class TestNegotiate:
+    """Tests para la negociación por Accept"""
+
+    @pytest.mark.parametrize("accept, expected", [
+        (None, None),
+        ("application/json", None),
+        ("*/*", None),
+        (COLUMNAR_JSON, COLUMNAR_JSON),
+        ("application/msgpack", MSGPACK),
+        ("application/x-msgpack", MSGPACK),
+        ("application/json, application/msgpack", None),
+        ("application/msgpack, application/json", MSGPACK),
+        ("application/json;q=0.5, application/msgpack", MSGPACK),
+        ("application/msgpack;q=0", None),
+        ("text/html, " + COLUMNAR_JSON + ";q=0.9", COLUMNAR_JSON),
+    ])
+    def test_negotiate(self, accept, expected):
+        """Test de la elección del formato"""
+        assert negotiate(accept) == expected
+
+    def test_render_without_msgpack(self, monkeypatch):
+        """Test que sin el paquete msgpack se indica el error"""
+        monkeypatch.setattr(formats, "msgpack", None)
+        with pytest.raises(FormatNotAvailable):
+            render({}, MSGPACK)
+
+
+class TestColumnarEndpoint:
+    """Tests de POST /api/v1/extract con formato columnar"""
+
+    @pytest.fixture(scope="class")
+    def client(self):
+        with TestClient(app) as test_client:
+            yield test_client
+
+    def test_json(self, client):
+        """Test que Accept columnar devuelve JSON columnar"""
+        response = client.post("/api/v1/extract", json={"text": TEXTO},
+                               headers={"Accept": COLUMNAR_JSON})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(COLUMNAR_JSON)
+        assert _rows(response.json()) == extract_all(TEXTO)["entities"]
+
+    def test_msgpack(self, client):
+        """Test que Accept msgpack devuelve MessagePack más pequeño que el JSON"""
+        response = client.post("/api/v1/extract", json={"text": TEXTO},
+                               headers={"Accept": MSGPACK})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == MSGPACK
+        data = msgpack.unpackb(response.content)
+        assert _rows(data) == extract_all(TEXTO)["entities"]
+        assert len(response.content) < len(json.dumps(extract_all(TEXTO))) / 2
+
+    def test_default_json(self, client):
+        """Test que sin Accept columnar la respuesta no cambia"""
+        response = client.post("/api/v1/extract", json={"text": TEXTO})
+        assert response.json() == extract_all(TEXTO)
+
+    def test_msgpack_unavailable(self, client, monkeypatch):
+        """Test que sin el paquete msgpack se responde 406"""
+        monkeypatch.setattr(formats, "msgpack", None)
+        response = client.post("/api/v1/extract", json={"text": "a@b.co"},
+                               headers={"Accept": MSGPACK})
+        assert response.status_code == 406
@@ -0,0 +1,202 @@
+"""
+Tests unitarios para la persistencia de registros con escritura diferida.
+"""
+import json
+import time
+
+import pytest
+from sqlalchemy import event, func, select, text
+
+from app.db.engine import create_db_engine
+from app.db.models import Registration
+from app.db.writer import RegistrationWriter, registration_row
+
+
+def _record(index=0):
+    """Registro válido de prueba."""
+    return {
+        "name": f"Persona {index}",
+        "email": f"persona{index}@example.com",
+        "phone": "+573001234567",
+        "birth_date": "15/03/1990",
+        "dni": f"{12345678 + index}A",
+        "postal_code": "28001",
+        "profession": "Desarrolladora",
+        "experience": "2-3 años",
+        "portfolio_urls": ["https://github.com/persona", ""],
+        "notifications": True,
+    }
+
+
+def _count(engine):
+    """Número de registros guardados."""
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(Registration)).scalar_one()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Motor SQLite en un fichero temporal."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'registros.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    """Lista de (sentencia, executemany) ejecutadas por el motor."""
+    executed = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            executed.append((statement, executemany))
+
+    return executed
+
+
+class TestEngine:
+    """Tests para create_db_engine"""
+
+    def test_sqlite_wal(self, engine):
+        """Test que SQLite usa el modo WAL y crea las tablas"""
+        with engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert _count(engine) == 0
+
+    def test_memory_database_shared(self):
+        """Test que la base en memoria es la misma para todos los hilos"""
+        engine = create_db_engine("sqlite://")
+        writer = RegistrationWriter(engine, flush_interval=0.01).start()
+        writer.submit(_record())
+        writer.stop()
+        assert _count(engine) == 1
+
+
+class TestRegistrationRow:
+    """Tests para registration_row"""
+
+    def test_normalizes_record(self):
+        """Test que se completan las columnas opcionales"""
+        row = registration_row(_record())
+        assert row["company"] == ""
+        assert row["bio"] == ""
+        assert row["portfolio_urls"] == ["https://github.com/persona"]
+        assert row["notifications"] == True
+        assert row["created_at"] is not None
+
+
+class TestRegistrationWriter:
+    """Tests para la clase RegistrationWriter"""
+
+    def test_batches_inserts(self, engine, statements):
+        """Test que los registros se escriben en lotes executemany"""
+        writer = RegistrationWriter(engine, batch_size=50, flush_interval=0.05)
+        for index in range(120):
+            assert writer.submit(_record(index)) == True
+        writer.start()
+        writer.flush()
+        assert _count(engine) == 120
+        assert writer.batches == 3
+        assert len(statements) == 3
+        assert all(executemany for _, executemany in statements)
+        writer.stop()
+
+    def test_flush_interval(self, engine):
+        """Test que un lote incompleto se escribe al pasar el intervalo"""
+        writer = RegistrationWriter(engine, batch_size=1000, flush_interval=0.05).start()
+        writer.submit(_record())
+        deadline = time.monotonic() + 5
+        while writer.written == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert writer.written == 1
+        assert writer.pending == 0
+        writer.stop()
+
+    def test_stop_drains_queue(self, engine):
+        """Test que stop escribe los registros pendientes"""
+        writer = RegistrationWriter(engine, batch_size=1000, flush_interval=60).start()
+        for index in range(10):
+            writer.submit(_record(index))
+        writer.stop(timeout=5)
+        assert writer.running == False
+        assert _count(engine) == 10
+
+    def test_flush_without_thread(self, engine):
+        """Test que flush no se bloquea antes de start ni tras stop"""
+        writer = RegistrationWriter(engine, flush_interval=0.01)
+        writer.submit(_record(1))
+        writer.flush()
+        assert writer.pending == 1
+        writer.start()
+        writer.flush()
+        writer.stop(timeout=5)
+        writer.submit(_record(2))
+        writer.flush()
+        assert _count(engine) == 1
+        assert writer.pending == 1
+
+    def test_submit_rejects_when_full(self, engine):
+        """Test que con la cola llena submit no bloquea y rechaza el registro"""
+        writer = RegistrationWriter(engine, max_pending=2)
+        assert writer.submit(_record(1)) == True
+        assert writer.submit(_record(2)) == True
+        assert writer.submit(_record(3)) == False
+
+    def test_failed_batch_is_counted(self, engine):
+        """Test que un lote que no se puede escribir se cuenta como fallido"""
+        writer = RegistrationWriter(engine, flush_interval=0.01, retries=1)
+        record = _record()
+        record["name"] = None
+        writer.start()
+        writer.submit(record)
+        writer.flush()
+        assert writer.failed == 1
+        assert writer.written == 0
+        writer.stop()
+
+    def test_failed_batch_keeps_valid_rows(self, engine, tmp_path):
+        """Test que si un lote falla solo se descartan las filas que fallan"""
+        dead_letter = tmp_path / "descartados.jsonl"
+        writer = RegistrationWriter(engine, batch_size=10, flush_interval=60, retries=0,
+                                    dead_letter_path=str(dead_letter))
+        written = []
+        writer.add_listener(written.extend)
+        records = [_record(index) for index in range(3)]
+        records[1]["name"] = None
+        for record in records:
+            writer.submit(record)
+        writer.start()
+        writer.stop(timeout=5)
+        assert _count(engine) == 2
+        assert writer.written == 2
+        assert writer.failed == 1
+        assert [row["email"] for row in written] == ["persona0@example.com",
+                                                     "persona2@example.com"]
+        assert [row["email"] for row in writer.dead_letters] == ["persona1@example.com"]
+        lines = dead_letter.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["email"] for line in lines] == ["persona1@example.com"]
+
+    def test_long_values_fit(self, engine):
+        """Test que las columnas admiten los valores más largos que se validan"""
+        writer = RegistrationWriter(engine, flush_interval=0.01)
+        assert Registration.__table__.c.dni.type.length >= 18
+        record = _record()
+        record["dni"] = "A" * 18
+        record["birth_date"] = "01/01/" + "9" * 40
+        writer.start()
+        writer.submit(record)
+        writer.stop()
+        assert writer.written == 1
+
+    def test_persisted_values(self, engine):
+        """Test que los valores del formulario se guardan tal cual"""
+        writer = RegistrationWriter(engine, flush_interval=0.01).start()
+        writer.submit(_record(7))
+        writer.stop()
+        with engine.connect() as connection:
+            row = connection.execute(select(Registration.__table__)).one()
+        assert row.email == "persona7@example.com"
+        assert row.portfolio_urls == ["https://github.com/persona"]
+        assert row.notifications == True
@@ -0,0 +1,166 @@
+"""
+Tests unitarios para la detección de registros duplicados.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.dedup import BloomFilter, RegistrationIndex
+from app.db.engine import create_db_engine
+from app.db.writer import RegistrationWriter
+from app.main import app
+
+
+def _record(email, dni):
+    """Registro mínimo de prueba."""
+    return {
+        "name": "Persona", "email": email, "phone": "+573001234567",
+        "birth_date": "15/03/1990", "dni": dni, "postal_code": "28001",
+        "profession": "Ingeniera", "experience": "2-3 años",
+        "portfolio_urls": ["https://github.com/persona"],
+    }
+
+
+@pytest.fixture
+def writer(tmp_path):
+    """Escritor diferido sobre una base SQLite temporal."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'registros.db'}")
+    writer = RegistrationWriter(engine, flush_interval=0.01).start()
+    yield writer
+    writer.stop()
+    engine.dispose()
+
+
+class TestBloomFilter:
+    """Tests para la clase BloomFilter"""
+
+    def test_no_false_negatives(self):
+        """Test que todo valor añadido se encuentra"""
+        bloom = BloomFilter(1000, 0.01)
+        values = [f"persona{index}@example.com" for index in range(1000)]
+        for value in values:
+            bloom.add(value)
+        assert all(value in bloom for value in values)
+        assert bloom.count == 1000
+
+    def test_false_positive_rate(self):
+        """Test que la tasa de falsos positivos está cerca de la configurada"""
+        bloom = BloomFilter(5000, 0.01)
+        for index in range(5000):
+            bloom.add(f"dentro{index}")
+        false_positives = sum(f"fuera{index}" in bloom for index in range(10000))
+        assert false_positives < 300
+
+
+class TestRegistrationIndex:
+    """Tests para la clase RegistrationIndex"""
+
+    def test_new_value_without_query(self, writer):
+        """Test que un valor nuevo se descarta sin consultar la base de datos"""
+        index = RegistrationIndex(writer.engine, capacity=1000).load()
+        assert index.exists("email", "nuevo@example.com") == False
+        assert index.exists("dni", "12345678A") == False
+        assert index.db_queries == 0
+
+    def test_load_existing(self, writer):
+        """Test que se cargan los registros existentes y se confirman en la base"""
+        writer.submit(_record("Ana@Example.com", "12345678A"))
+        writer.flush()
+        index = RegistrationIndex(writer.engine, capacity=1000).load()
+        assert index.exists("email", "  ana@example.COM ") == True
+        assert index.exists("dni", "12345678a") == True
+        assert index.db_queries == 2
+
+    def test_pending_registration(self, writer):
+        """Test que un registro aún no escrito también cuenta como duplicado"""
+        index = RegistrationIndex(writer.engine, capacity=1000).load()
+        writer.add_listener(index.written)
+        index.add(_record("luis@example.com", "X1234567"))
+        assert index.duplicates(_record("luis@example.com", "Y7654321")) == ["email"]
+        assert index.db_queries == 0
+
+    def test_reserve_and_release(self, writer):
+        """Test que reserve comprueba y reserva el registro en una operación"""
+        index = RegistrationIndex(writer.engine, capacity=1000).load()
+        record = _record("rosa@example.com", "R1234567")
+        assert index.reserve(record) == []
+        assert index.reserve(_record("Rosa@example.com", "S1234567")) == ["email"]
+        index.release(record)
+        assert index.reserve(_record("rosa@example.com", "S1234567")) == []
+
+    def test_reload_keeps_pending(self, writer):
+        """Test que una recarga por capacidad conserva los valores reservados"""
+        index = RegistrationIndex(writer.engine, capacity=1).load()
+        assert index.reserve(_record("uno@example.com", "U1234567")) == []
+        assert index.reserve(_record("dos@example.com", "V1234567")) == []
+        filters = index._filters
+        index.refresh()
+        assert index._filters is not filters
+        assert index.reserve(_record("uno@example.com", "U1234567")) == ["email", "dni"]
+        index.written([{"email": "uno@example.com", "dni": "U1234567"}])
+        assert "uno@example.com" in index._filters["email"]
+
+    def test_discarded_clears_pending(self, writer):
+        """Test que un registro que el escritor descarta deja de estar pendiente"""
+        index = RegistrationIndex(writer.engine, capacity=1000).load()
+        writer.add_listener(index.written)
+        writer.add_failure_listener(index.written)
+        record = _record("pia@example.com", "P1234567")
+        record["name"] = None
+        assert index.reserve(record) == []
+        writer.submit(record)
+        writer.flush()
+        assert writer.failed == 1
+        assert index.exists("email", "pia@example.com") == False
+
+    def test_refresh_sees_other_writers(self, writer, tmp_path):
+        """Test que el índice ve las altas escritas por otro proceso"""
+        index = RegistrationIndex(writer.engine, capacity=1000, refresh_interval=0).load()
+        other = create_db_engine(f"sqlite:///{tmp_path / 'registros.db'}")
+        other_writer = RegistrationWriter(other, flush_interval=0.01).start()
+        other_writer.submit(_record("otro@example.com", "O1234567"))
+        other_writer.stop()
+        other.dispose()
+        assert index.exists("email", "otro@example.com") == True
+        assert index.exists("dni", "o1234567") == True
+
+    def test_refresh_interval(self, writer):
+        """Test que dentro del intervalo no se vuelve a leer la tabla"""
+        index = RegistrationIndex(writer.engine, capacity=1000, refresh_interval=60).load()
+        writer.submit(_record("tarde@example.com", "T1234567"))
+        writer.flush()
+        assert index.exists("email", "tarde@example.com") == False
+        index.refresh()
+        assert index.exists("email", "tarde@example.com") == True
+
+    def test_unique_constraint(self, writer):
+        """Test que la base de datos rechaza un duplicado que pasó el índice"""
+        writer.submit(_record("doble@example.com", "D1234567"))
+        writer.submit(_record("DOBLE@example.com", "E1234567"))
+        writer.flush()
+        assert writer.written == 1
+        assert writer.failed == 1
+
+    def test_written_clears_pending(self, writer):
+        """Test que tras escribirse el registro se confirma en la base de datos"""
+        index = RegistrationIndex(writer.engine, capacity=1000).load()
+        writer.add_listener(index.written)
+        record = _record("eva@example.com", "Z1234567")
+        writer.submit(record)
+        index.add(record)
+        writer.flush()
+        assert index.exists("dni", "Z1234567") == True
+        assert index.db_queries == 1
+
+
+class TestRegistrationExistsEndpoint:
+    """Tests para el endpoint /api/v1/registrations/exists"""
+
+    def test_exists_endpoint(self):
+        """Test que el endpoint responde por campo"""
+        with TestClient(app) as client:
+            response = client.get("/api/v1/registrations/exists",
+                                  params={"email": "nadie@example.com", "dni": "A1234567"})
+            missing = client.get("/api/v1/registrations/exists")
+        assert response.status_code == 200
+        assert response.json() == {"exists": False, "fields": {"email": False, "dni": False}}
+        assert missing.status_code == 400
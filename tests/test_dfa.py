@@ -0,0 +1,156 @@
+"""
+Tests unitarios para los DFA con tabla de los patrones de forma fija.
+
+El test diferencial compara el DFA con `re.fullmatch` sobre todas las cadenas
+cortas de un alfabeto que incluye un representante de cada clase de
+caracteres del patrón, caracteres fuera de ellas y no ASCII, además de
+cadenas aleatorias más largas.
+"""
+import itertools
+import random
+import re
+import subprocess
+import sys
+
+import pytest
+from app.validators.dfa import TableDFA, UnsupportedPatternError, install_fastest
+from app.validators.registry import PatternRegistry
+from app.validators.patterns import (
+    DFA_SAMPLES,
+    PATTERN_DATE,
+    PATTERN_DNI,
+    PATTERN_PHONE,
+    PATTERN_POSTAL_CODE,
+    registry,
+    select_matchers,
+)
+
+
+FIXED_PATTERNS = [PATTERN_PHONE, PATTERN_DATE, PATTERN_DNI, PATTERN_POSTAL_CODE]
+
+# Representantes de cada clase relevante más caracteres que deben rechazarse
+ALPHABET = "+0/-A9Za \n٣é"
+
+
+def _random_strings(pattern, count, seed):
+    """Cadenas aleatorias construidas con los caracteres del patrón."""
+    rng = random.Random(seed)
+    chars = "+0123456789/-ABZ a\n"
+    samples = []
+    for _ in range(count):
+        length = rng.randint(0, 25)
+        samples.append("".join(rng.choice(chars) for _ in range(length)))
+    return samples
+
+
+class TestTableDFADifferential:
+    """Tests diferenciales entre el DFA y re.fullmatch"""
+
+    @pytest.mark.parametrize("pattern", FIXED_PATTERNS)
+    def test_exhaustive_short_strings(self, pattern):
+        """Test que aceptan exactamente las mismas cadenas de hasta 4 caracteres"""
+        dfa = TableDFA.from_regex(pattern)
+        compiled = re.compile(pattern)
+        for length in range(5):
+            for chars in itertools.product(ALPHABET, repeat=length):
+                text = "".join(chars)
+                assert dfa.fullmatch(text) == bool(compiled.fullmatch(text)), repr(text)
+
+    @pytest.mark.parametrize("pattern", FIXED_PATTERNS)
+    def test_random_strings(self, pattern):
+        """Test que coinciden sobre cadenas aleatorias más largas"""
+        dfa = TableDFA.from_regex(pattern)
+        compiled = re.compile(pattern)
+        for text in _random_strings(pattern, 5000, seed=len(pattern)):
+            assert dfa.fullmatch(text) == bool(compiled.fullmatch(text)), repr(text)
+
+    def test_length_bounds(self):
+        """Test límites de longitud de las repeticiones"""
+        phone = TableDFA.from_regex(PATTERN_PHONE)
+        assert phone.fullmatch("+" + "1" * 8) == True
+        assert phone.fullmatch("+" + "1" * 15) == True
+        assert phone.fullmatch("+" + "1" * 7) == False
+        assert phone.fullmatch("+" + "1" * 16) == False
+
+    @pytest.mark.parametrize("pattern", FIXED_PATTERNS)
+    def test_samples(self, pattern):
+        """Test que coinciden sobre las muestras de la selección de motor"""
+        dfa = TableDFA.from_regex(pattern)
+        for samples in DFA_SAMPLES.values():
+            for text in samples:
+                assert dfa.fullmatch(text) == bool(re.fullmatch(pattern, text))
+
+
+class TestTableDFA:
+    """Tests para la construcción de TableDFA"""
+
+    def test_minimized_table(self):
+        """Test que la tabla usa clases de caracteres y un estado sumidero"""
+        dfa = TableDFA.from_regex(PATTERN_POSTAL_CODE)
+        # Clases: rechazo y dígito
+        assert dfa.width == 2
+        assert len(dfa.classes) == 256
+        assert dfa.table.typecode in ("B", "H")
+
+    def test_alternatives_and_groups(self):
+        """Test alternativas y grupos"""
+        dfa = TableDFA.from_regex(r"(ab|c)+d?")
+        assert dfa.fullmatch("abcab") == True
+        assert dfa.fullmatch("cd") == True
+        assert dfa.fullmatch("d") == False
+
+    @pytest.mark.parametrize("pattern", [r"a\b", r"[^a]", r"(?i)abc", r"(a)\1", r"(?=a)a", "é"])
+    def test_unsupported(self, pattern):
+        """Test que rechaza construcciones fuera del subconjunto soportado"""
+        with pytest.raises(UnsupportedPatternError):
+            TableDFA.from_regex(pattern)
+
+
+class TestMatcherSelection:
+    """Tests para la instalación del motor más rápido en el registro"""
+
+    def test_use_matcher(self):
+        """Test que el registro usa el fullmatch del DFA instalado"""
+        reg = PatternRegistry(count_calls=True)
+        entry = reg.register("postal_code", PATTERN_POSTAL_CODE)
+        reg.use_matcher("postal_code", TableDFA.from_regex(PATTERN_POSTAL_CODE))
+        assert entry.fullmatch("630004") is True
+        assert entry.fullmatch("63a") is False
+        assert entry.calls["fullmatch"] == 2
+        reg.use_matcher("postal_code", None)
+        assert entry.fullmatch("630004") is True
+
+    def test_install_fastest(self):
+        """Test que elige un motor por patrón y lo deja equivalente"""
+        reg = PatternRegistry()
+        for name, pattern in [("phone", PATTERN_PHONE), ("dni", PATTERN_DNI)]:
+            reg.register(name, pattern)
+        samples = {name: DFA_SAMPLES[name] for name in ("phone", "dni")}
+        chosen = install_fastest(reg, samples, number=5)
+        assert set(chosen) == {"phone", "dni"}
+        assert set(chosen.values()) <= {"dfa", "re"}
+        assert bool(reg.fullmatch("phone", "+573001234567")) == True
+        assert bool(reg.fullmatch("dni", "abc123")) == False
+
+    def test_select_matchers_on(self):
+        """Test que en modo "on" se instala el DFA en todos sin medir"""
+        try:
+            assert select_matchers("on") == dict.fromkeys(DFA_SAMPLES, "dfa")
+            assert all(registry[name].matcher is not None for name in DFA_SAMPLES)
+        finally:
+            select_matchers("off")
+        assert all(registry[name].matcher is None for name in DFA_SAMPLES)
+
+    def test_select_matchers_off_skips_automata(self):
+        """Test que por defecto se queda `re` sin importar automata-lib"""
+        code = ("import sys; from app.validators.patterns import select_matchers; "
+                "print(select_matchers() == dict.fromkeys(select_matchers(), 're'), "
+                "'automata' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                check=True).stdout
+        assert output.split() == ["True", "False"]
+
+    def test_select_matchers_unknown(self):
+        """Test que un modo desconocido se rechaza"""
+        with pytest.raises(ValueError):
+            select_matchers("rapido")
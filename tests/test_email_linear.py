@@ -0,0 +1,127 @@
+"""
+Tests de la validación de emails en tiempo lineal.
+Comprueban que acepta exactamente el mismo lenguaje que PATTERN_EMAIL y que
+las entradas adversarias no disparan retroceso catastrófico.
+"""
+import random
+import re
+import time
+
+import pytest
+from app.validators.patterns import (
+    PATTERN_EMAIL,
+    PATTERN_EMAIL_LINEAL,
+    _is_email_structure,
+    validate_email,
+)
+from app.services.extractor import extract_all
+
+
+ALFABETO = ['a', 'Z', '0', '.', '@', '"', '-', '_', '+', ' ', '!', '\\', 'é', '\n', 'c', 'o']
+
+
+def _entradas_aleatorias(cantidad, semilla=2024):
+    rnd = random.Random(semilla)
+    for _ in range(cantidad):
+        texto = ''.join(rnd.choice(ALFABETO) for _ in range(rnd.randint(1, 10)))
+        if rnd.random() < 0.4:
+            texto += '@ab.co'
+        if rnd.random() < 0.3:
+            texto = '"' + texto
+        yield texto
+
+
+class TestEmailEquivalence:
+    """Tests diferenciales contra el patrón original"""
+
+    def test_structure_matches_original_pattern(self):
+        """Test que la validación estructural coincide con PATTERN_EMAIL"""
+        original = re.compile(PATTERN_EMAIL)
+        for texto in _entradas_aleatorias(20000):
+            assert _is_email_structure(texto) == bool(original.fullmatch(texto)), texto
+
+    def test_linear_pattern_matches_original_pattern(self):
+        """Test que PATTERN_EMAIL_LINEAL coincide con PATTERN_EMAIL"""
+        original = re.compile(PATTERN_EMAIL)
+        lineal = re.compile(PATTERN_EMAIL_LINEAL)
+        for texto in _entradas_aleatorias(20000, semilla=7):
+            assert bool(lineal.fullmatch(texto)) == bool(original.fullmatch(texto)), texto
+
+    @pytest.mark.parametrize("email", [
+        'usuario@dominio.com',
+        '"usuario nombre"@dominio.com',
+        '"a"."b"@dominio.com',
+        '"a".b.c@dominio.com',
+        '"con@arroba"@sub.dominio.co',
+    ])
+    def test_valid_examples(self, email):
+        """Test ejemplos válidos con comillas y puntos"""
+        assert validate_email(email) == True
+
+    @pytest.mark.parametrize("email", [
+        'a.b@dominio.com',
+        '"a".@dominio.com',
+        '"@dominio.com',
+        'usuario@-dominio.com',
+        'usuario@dominio.c',
+    ])
+    def test_invalid_examples(self, email):
+        """Test ejemplos inválidos según PATTERN_EMAIL"""
+        assert validate_email(email) == False
+
+
+def _medir(funcion, texto, repeticiones=3):
+    """Mejor tiempo de varias ejecuciones de funcion(texto)."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(texto)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+class TestEmailAdversarial:
+    """
+    Tests de entradas adversarias. Solo comparan tiempos medidos en la misma
+    ejecución (entrada pequeña frente a grande, adversaria frente a texto
+    corriente), sin límites absolutos: los tiempos por máquina los cubre
+    benchmarks/run.py.
+    """
+
+    @pytest.mark.parametrize("construir", [
+        lambda n: '""' * n + '!',
+        lambda n: '"' + '".a"' * (n // 2) + '!',
+        lambda n: 'a.' * n + '!',
+        lambda n: 'a@' + 'a.' * n + '!',
+    ])
+    def test_structure_is_linear(self, construir):
+        """Test que el coste de la validación estructural crece linealmente"""
+        pequena = _medir(_is_email_structure, construir(12500))
+        grande = _medir(_is_email_structure, construir(200000), repeticiones=2)
+        # 16 veces más texto: lineal ~16x, cuadrático ~256x
+        assert grande < 64 * pequena
+
+    @pytest.mark.parametrize("construir", [
+        lambda n: '""' * n + '!',
+        lambda n: '"' + '".a"' * n + '!',
+        lambda n: '"' + '\\"' * n + '!',
+        lambda n: 'a@' + 'a.' * n + '!',
+    ])
+    def test_extractor_is_linear(self, construir):
+        """Test que el coste del extractor crece linealmente con la entrada"""
+        pequena = _medir(extract_all, construir(5000))
+        grande = _medir(extract_all, construir(80000), repeticiones=2)
+        # 16 veces más texto: lineal ~16x, cuadrático ~256x
+        assert grande < 64 * pequena
+
+    @pytest.mark.parametrize("construir", [
+        lambda n: '""' * n + '!',
+        lambda n: '"' + '\\"' * n + '!',
+    ])
+    def test_extractor_cost_per_char(self, construir):
+        """Test que las comillas no multiplican el coste por carácter"""
+        adversaria = construir(40000)
+        corriente = "texto libre " * (len(adversaria) // 12 + 1)
+        # Hoy unas 10-20 veces el texto corriente; una ventana de 247
+        # posiciones por comilla lo llevaba a varios cientos
+        assert _medir(extract_all, adversaria) < 100 * _medir(extract_all, corriente)
@@ -0,0 +1,101 @@
+"""
+Tests unitarios para la extracción con Server-Sent Events.
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.events import iter_events, sse_event
+from app.services.extractor import extract_all
+
+
+TEXTO = "Escribe a juan@empresa.com o llama al +573001234567 (ñandú) 12/03/1990 " * 300
+
+
+def _parse(payload):
+    """Convierte el flujo SSE en una lista de (evento, datos)."""
+    events = []
+    for block in payload.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _collect(text, **kwargs):
+    """Ejecuta iter_events y retorna los eventos decodificados."""
+    async def run():
+        return b"".join([chunk async for chunk in iter_events(text, **kwargs)])
+    return _parse(asyncio.run(run()).decode("utf-8"))
+
+
+def _entities(events):
+    """Entidades de todos los eventos `entities`, en orden."""
+    return [entity for name, data in events if name == "entities" for entity in data]
+
+
+class TestSseEvent:
+    """Tests para el formato de los eventos"""
+
+    def test_format(self):
+        """Test que el evento termina en línea en blanco y lleva JSON"""
+        assert sse_event("progress", {"scanned": 1, "total": 2}) == \
+            b'event: progress\ndata: {"scanned": 1, "total": 2}\n\n'
+
+
+class TestIterEvents:
+    """Tests para iter_events"""
+
+    @pytest.mark.parametrize("slice_chars", [100, 1000, 1 << 16])
+    def test_same_entities_as_extract_all(self, slice_chars):
+        """Test que las entidades coinciden con extract_all en cualquier tramo"""
+        events = _collect(TEXTO, slice_chars=slice_chars)
+        assert _entities(events) == extract_all(TEXTO)["entities"]
+
+    def test_progress(self):
+        """Test que el progreso avanza hasta el total"""
+        events = _collect(TEXTO, slice_chars=5000)
+        progress = [data for name, data in events if name == "progress"]
+        assert [data["scanned"] for data in progress] == \
+            list(range(5000, len(TEXTO), 5000)) + [len(TEXTO)]
+        assert all(data["total"] == len(TEXTO) for data in progress)
+
+    def test_batch_size(self):
+        """Test que ningún evento supera el tamaño de tanda"""
+        events = _collect(TEXTO, batch_size=7)
+        assert max(len(data) for name, data in events if name == "entities") == 7
+
+    def test_first_results_before_end(self):
+        """Test que las primeras entidades llegan tras unos pocos tramos"""
+        events = _collect(TEXTO, slice_chars=1000)
+        names = [name for name, _ in events]
+        progress = [index for index, name in enumerate(names) if name == "progress"]
+        # Se retienen las entidades de los últimos STREAM_OVERLAP caracteres
+        assert names.index("entities") < progress[5]
+
+    def test_done(self):
+        """Test que el último evento es el resumen"""
+        events = _collect(TEXTO)
+        assert events[-1] == ("done", {"status": "ok", "input_length": len(TEXTO),
+                                       "count": extract_all(TEXTO)["count"]})
+
+    def test_empty_text(self):
+        """Test con texto vacío"""
+        assert _collect("") == [("done", {"status": "ok", "input_length": 0, "count": 0})]
+
+
+class TestEventsEndpoint:
+    """Tests para POST /api/v1/extract/events"""
+
+    def test_endpoint(self):
+        """Test que el endpoint responde text/event-stream"""
+        with TestClient(app) as client:
+            response = client.post("/api/v1/extract/events", json={"text": TEXTO})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.headers["cache-control"] == "no-cache"
+        events = _parse(response.text)
+        assert _entities(events) == extract_all(TEXTO)["entities"]
+        assert events[-1][0] == "done"
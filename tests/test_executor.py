@@ -0,0 +1,65 @@
+"""
+Tests unitarios para el ejecutor de extracción (hilos y procesos).
+"""
+import asyncio
+
+import pytest
+from app.services.executor import ExtractionExecutor, MODE_PROCESS, MODE_THREAD
+from app.services.extractor import extract_all
+
+
+TEXTO = "Escribe a juan@empresa.com o llama al +573001234567 (ñandú) " * 50
+
+
+@pytest.fixture(scope="module")
+def process_executor():
+    executor = ExtractionExecutor(MODE_PROCESS, workers=2, shared_memory_threshold=1024)
+    executor.start()
+    yield executor
+    executor.shutdown()
+
+
+class TestExtractionExecutor:
+    """Tests para la clase ExtractionExecutor"""
+
+    def test_thread_mode(self):
+        """Test que el modo hilo produce el mismo resultado que extract_all"""
+        executor = ExtractionExecutor(MODE_THREAD)
+        executor.start()
+        assert not executor.started
+        assert asyncio.run(executor.extract(TEXTO)) == extract_all(TEXTO)
+
+    def test_process_mode_small_text(self, process_executor):
+        """Test modo proceso con texto pequeño (serializado)"""
+        texto = "contacto: a@b.co"
+        assert asyncio.run(process_executor.extract(texto)) == extract_all(texto)
+
+    def test_process_mode_shared_memory(self, process_executor):
+        """Test modo proceso con texto grande (memoria compartida)"""
+        assert len(TEXTO) > process_executor.shared_memory_threshold
+        assert asyncio.run(process_executor.extract(TEXTO)) == extract_all(TEXTO)
+
+    def test_threshold_in_bytes(self):
+        """Test que el umbral de memoria compartida se mide en bytes UTF-8"""
+        executor = ExtractionExecutor(MODE_PROCESS, shared_memory_threshold=500)
+        with executor._payload("a" * 300) as payload:
+            assert payload == "a" * 300
+        with executor._payload("ñ" * 300) as payload:
+            assert payload[1] == 600
+
+    def test_process_mode_empty_text(self, process_executor):
+        """Test modo proceso con texto vacío"""
+        assert asyncio.run(process_executor.extract(""))["count"] == 0
+
+    def test_invalid_mode(self):
+        """Test modo desconocido"""
+        with pytest.raises(ValueError):
+            ExtractionExecutor("gpu")
+
+    def test_call_thread_mode(self):
+        """Test que call ejecuta la función en el hilo actual sin pool"""
+        assert ExtractionExecutor(MODE_THREAD).call(extract_all, TEXTO) == extract_all(TEXTO)
+
+    def test_call_process_mode(self, process_executor):
+        """Test que call usa el pool de procesos y la memoria compartida"""
+        assert process_executor.call(extract_all, TEXTO) == extract_all(TEXTO)
@@ -0,0 +1,90 @@
+"""
+Tests unitarios para el servicio de extracción de entidades.
+Cubre el escáner combinado y la función extract_all.
+"""
+import re
+
+import pytest
+from app.services.extractor import (
+    ENTITY_PATTERNS,
+    SCANNER,
+    extract_all,
+    iter_entities,
+    unanchored,
+)
+
+
+TEXTO_MIXTO = (
+    "Contacto: juan@empresa.com, tel +573001234567, nació 15/08/2000, "
+    "DNI 12345678A, CP 630001, web https://github.com/usuario/proyecto."
+)
+
+
+class TestExtractAll:
+    """Tests para la función extract_all"""
+
+    def test_extract_all_every_type(self):
+        """Test que extrae un ejemplo de cada tipo de entidad"""
+        result = extract_all(TEXTO_MIXTO)
+        tipos = [entity["type"] for entity in result["entities"]]
+        assert tipos == ["email", "phone", "date", "dni", "postal_code", "url"]
+        assert result["count"] == 6
+        assert result["status"] == "ok"
+        assert result["input_length"] == len(TEXTO_MIXTO)
+
+    def test_extract_all_spans(self):
+        """Test que las posiciones corresponden al valor extraído"""
+        result = extract_all(TEXTO_MIXTO)
+        for entity in result["entities"]:
+            assert TEXTO_MIXTO[entity["start"]:entity["end"]] == entity["value"]
+
+    def test_extract_all_values(self):
+        """Test que los valores extraídos son los esperados"""
+        result = extract_all(TEXTO_MIXTO)
+        valores = {entity["type"]: entity["value"] for entity in result["entities"]}
+        assert valores["email"] == "juan@empresa.com"
+        assert valores["phone"] == "+573001234567"
+        assert valores["url"] == "https://github.com/usuario/proyecto."
+
+    def test_extract_all_no_partial_tokens(self):
+        """Test que no extrae fragmentos pegados a otros caracteres alfanuméricos"""
+        result = extract_all("codigo ABC12345xyz y ref12345")
+        assert result["entities"] == []
+
+    def test_extract_all_empty(self):
+        """Test extracción en texto vacío"""
+        result = extract_all("")
+        assert result["count"] == 0
+        assert result["entities"] == []
+        assert result["input_length"] == 0
+
+    def test_extract_all_none(self):
+        """Test extracción con None"""
+        result = extract_all(None)
+        assert result["count"] == 0
+        assert result["input_length"] == 0
+
+
+class TestScanner:
+    """Tests para el escáner combinado"""
+
+    def test_scanner_has_group_per_type(self):
+        """Test que el escáner tiene un grupo con nombre por tipo"""
+        assert set(SCANNER.groupindex) == {name for name, _ in ENTITY_PATTERNS}
+
+    @pytest.mark.parametrize("name,pattern", ENTITY_PATTERNS)
+    def test_scanner_agrees_with_single_pattern(self, name, pattern):
+        """Test que cada entidad encontrada también la encuentra su patrón individual"""
+        individual = re.compile(unanchored(pattern))
+        for kind, value, start, end in iter_entities(TEXTO_MIXTO):
+            if kind == name:
+                match = individual.match(TEXTO_MIXTO, start)
+                assert match is not None
+                assert match.group() == value
+
+    def test_iter_entities_range(self):
+        """Test que respeta las posiciones de inicio y fin"""
+        start = TEXTO_MIXTO.index("DNI")
+        end = TEXTO_MIXTO.index("CP")
+        found = list(iter_entities(TEXTO_MIXTO, start, end))
+        assert [kind for kind, *_ in found] == ["dni"]
@@ -0,0 +1,101 @@
+"""
+Tests unitarios para la tabla declarativa de campos.
+"""
+from app.validators.fields import FieldSpec, evaluate_fields
+from app.validators.patterns import (
+    FIELD_SPECS,
+    FIELD_VALIDATORS,
+    validate_email,
+    validate_url,
+)
+
+
+VALID_VALUES = {
+    "email": "usuario@ejemplo.com",
+    "phone": "+573001234567",
+    "date": "15/03/1990",
+    "dni": "12345678",
+    "postal_code": "630004",
+    "url": ["https://github.com/usuario"],
+}
+
+
+class TestFieldSpecs:
+    """Tests para la tabla FIELD_SPECS"""
+
+    def test_names_and_order(self):
+        """Test nombres de los campos en orden de presentación"""
+        assert [spec.name for spec in FIELD_SPECS] == [
+            "email", "phone", "date", "dni", "postal_code", "url"
+        ]
+
+    def test_validators_mapping(self):
+        """Test que FIELD_VALIDATORS se deriva de la tabla"""
+        assert FIELD_VALIDATORS == {spec.name: spec.validator for spec in FIELD_SPECS}
+
+    def test_messages(self):
+        """Test mensajes con concordancia de género"""
+        date = next(spec for spec in FIELD_SPECS if spec.name == "date")
+        assert date.messages["missing"] == "Fecha de Nacimiento es obligatoria"
+        assert date.messages["valid"] == "Fecha de Nacimiento es válida"
+        email = FIELD_SPECS[0]
+        assert email.messages["missing"] == "Correo Electrónico es obligatorio"
+
+    def test_item_key(self):
+        """Test nombre de cada valor de un campo múltiple"""
+        assert FIELD_SPECS[-1].item_key(2) == "url_2"
+
+
+class TestEvaluateFields:
+    """Tests para evaluate_fields"""
+
+    def test_all_valid(self):
+        """Test todos los campos válidos"""
+        summary = evaluate_fields(FIELD_SPECS, VALID_VALUES)
+        assert summary["valid"] == 6
+        assert summary["invalid"] == 0
+        assert summary["required_missing"] == 0
+        assert summary["total"] == 6
+        assert list(summary["fields_detail"]) == [spec.name for spec in FIELD_SPECS]
+        assert all(d["status"] == "valid" for d in summary["fields_detail"].values())
+
+    def test_missing_and_invalid(self):
+        """Test campos faltantes e inválidos"""
+        values = dict(VALID_VALUES, email="   ", phone="123", url=["", "  "])
+        summary = evaluate_fields(FIELD_SPECS, values)
+        details = summary["fields_detail"]
+        assert details["email"]["status"] == "missing"
+        assert details["phone"]["status"] == "invalid"
+        assert details["phone"]["message"] == "Teléfono tiene formato inválido"
+        assert details["url"]["status"] == "missing"
+        assert summary["required_missing"] == 2
+        assert summary["invalid"] == 1
+        assert summary["total"] == 6
+
+    def test_multi_valued_counts(self):
+        """Test que cada URL con valor cuenta en el total"""
+        values = dict(VALID_VALUES, url=["https://a.org", "", "no-es-url", "https://b.org"])
+        summary = evaluate_fields(FIELD_SPECS, values)
+        assert summary["total"] == 8
+        assert summary["valid"] == 7
+        assert summary["invalid"] == 1
+        assert summary["fields_detail"]["url"]["message"] == "1 valor(es) inválido(s) de 3 total"
+
+    def test_validate_callback_keys(self):
+        """Test claves pasadas a la función de validación"""
+        seen = []
+
+        def validate(key, value, validator):
+            seen.append(key)
+            return validator(value)
+
+        evaluate_fields(FIELD_SPECS, dict(VALID_VALUES, url=["", "https://a.org"]), validate)
+        assert seen == ["email", "phone", "date", "dni", "postal_code", "url_1"]
+
+    def test_optional_empty_field_omitted(self):
+        """Test que un campo opcional vacío no cuenta"""
+        specs = (FieldSpec("email", "Email", validate_email),
+                 FieldSpec("web", "Web", validate_url, required=False))
+        summary = evaluate_fields(specs, {"email": "a@b.co"})
+        assert summary["total"] == 1
+        assert list(summary["fields_detail"]) == ["email"]
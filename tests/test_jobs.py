@@ -0,0 +1,206 @@
+"""
+Tests unitarios para los trabajos de extracción asíncronos.
+"""
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.formats import COLUMNAR_JSON
+from app.main import app
+from app.services.executor import ExtractionExecutor
+from app.services.extractor import extract_all, extract_columnar
+from app.services.jobs import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    ExtractionJobs,
+    Job,
+    JobQueueClosed,
+    JobQueueFull,
+    JobStore,
+)
+
+
+TEXTO = "Escribe a juan@empresa.com o llama al +573001234567 " * 200
+
+
+class FakeClock:
+    """Reloj controlado por el test."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wait(jobs, job, timeout=5.0):
+    """Espera a que el trabajo termine y lo retorna desde el almacén."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stored = jobs.get(job.id)
+        if stored is not None and stored.status in (STATUS_DONE, STATUS_FAILED):
+            return stored
+        time.sleep(0.01)
+    raise AssertionError("El trabajo no terminó a tiempo")
+
+
+@pytest.fixture
+def jobs():
+    runner = ExtractionJobs(ExtractionExecutor(), workers=2, max_pending=4)
+    yield runner
+    runner.shutdown()
+
+
+class TestJobStore:
+    """Tests para el almacén con caducidad"""
+
+    def test_ttl_counts_from_finish(self):
+        """Test que un trabajo caduca ttl segundos después de terminar"""
+        clock = FakeClock()
+        store = JobStore(ttl=10, clock=clock)
+        job = Job(0)
+        store.add(job)
+        clock.now = 100
+        assert store.get(job.id) is job
+        store.finished(job)
+        clock.now = 109
+        assert store.get(job.id) is job
+        clock.now = 111
+        assert store.get(job.id) is None
+        assert len(store) == 0
+
+    def test_unfinished_jobs_do_not_expire(self):
+        """Test que los trabajos sin terminar no caducan"""
+        clock = FakeClock()
+        store = JobStore(ttl=1, clock=clock)
+        job = Job(0)
+        store.add(job)
+        clock.now = 1000
+        assert store.get(job.id) is job
+
+    def test_max_jobs(self):
+        """Test que se descartan primero los que terminaron antes"""
+        store = JobStore(ttl=600, max_jobs=2, clock=FakeClock())
+        created = [Job(0) for _ in range(3)]
+        for job in created:
+            store.add(job)
+            store.finished(job)
+        assert store.get(created[0].id) is None
+        assert store.get(created[1].id) is created[1]
+        assert store.get(created[2].id) is created[2]
+
+
+class TestExtractionJobs:
+    """Tests para el pool de trabajos"""
+
+    def test_result(self, jobs):
+        """Test que el resultado es el de extract_all"""
+        job = jobs.submit(TEXTO)
+        assert len(job.id) == 32
+        done = _wait(jobs, job)
+        assert done.status == STATUS_DONE
+        assert done.result == extract_all(TEXTO)
+        assert done.to_dict()["result"]["count"] == 400
+        assert jobs.pending == 0
+
+    def test_failure(self, jobs):
+        """Test que un error queda registrado en el trabajo"""
+        def explode(text):
+            raise ValueError("texto inválido")
+
+        done = _wait(jobs, jobs.submit("x", func=explode))
+        assert done.status == STATUS_FAILED
+        assert done.to_dict()["error"] == "texto inválido"
+        assert "result" not in done.to_dict()
+
+    def test_queue_full(self, jobs):
+        """Test que se rechazan trabajos con la cola llena"""
+        release = threading.Event()
+
+        def blocked(text):
+            release.wait(5)
+            return {}
+
+        submitted = [jobs.submit("x", func=blocked) for _ in range(jobs.max_pending)]
+        with pytest.raises(JobQueueFull):
+            jobs.submit("x", func=blocked)
+        release.set()
+        for job in submitted:
+            assert _wait(jobs, job).status == STATUS_DONE
+        assert jobs.pending == 0
+
+
+    def test_shutdown_fails_queued_jobs(self):
+        """Test que al detener el pool los trabajos en cola terminan como fallidos"""
+        store = JobStore(ttl=0)
+        jobs = ExtractionJobs(ExtractionExecutor(), workers=1, max_pending=4, store=store)
+        started, release = threading.Event(), threading.Event()
+
+        def blocked(text):
+            started.set()
+            release.wait(5)
+            return {}
+
+        running = jobs.submit("x", func=blocked)
+        queued = jobs.submit("x", func=blocked)
+        assert started.wait(5)
+        threading.Timer(0.05, release.set).start()
+        jobs.shutdown()
+        assert running.status == STATUS_DONE
+        assert queued.status == STATUS_FAILED
+        assert queued.to_dict()["error"] == "Cancelado al detener el servicio"
+        assert jobs.pending == 0
+        # Ambos terminaron y caducan como cualquier trabajo terminado
+        assert len(store) == 0
+
+    def test_submit_after_shutdown(self, jobs):
+        """Test que no se aceptan trabajos con el pool detenido hasta start"""
+        jobs.shutdown()
+        with pytest.raises(JobQueueClosed):
+            jobs.submit("x")
+        assert jobs.pending == 0
+        done = _wait(jobs, jobs.start().submit(TEXTO))
+        assert done.status == STATUS_DONE
+
+
+class TestJobsEndpoints:
+    """Tests para /api/v1/extract/jobs"""
+
+    def test_create_and_poll(self):
+        """Test que el trabajo se crea con 202 y se consulta hasta terminar"""
+        with TestClient(app) as client:
+            response = client.post("/api/v1/extract/jobs", json={"text": TEXTO})
+            assert response.status_code == 202
+            job_id = response.json()["id"]
+            deadline = time.monotonic() + 5
+            while True:
+                data = client.get(f"/api/v1/extract/jobs/{job_id}").json()
+                if data["status"] == STATUS_DONE or time.monotonic() > deadline:
+                    break
+                time.sleep(0.01)
+        assert data["status"] == STATUS_DONE
+        assert data["input_length"] == len(TEXTO)
+        assert data["result"] == extract_all(TEXTO)
+
+    def test_unknown_job(self):
+        """Test que un id desconocido da 404"""
+        with TestClient(app) as client:
+            response = client.get("/api/v1/extract/jobs/desconocido")
+        assert response.status_code == 404
+
+    def test_columnar_result(self):
+        """Test que el resultado se puede pedir en formato columnar"""
+        with TestClient(app) as client:
+            job_id = client.post("/api/v1/extract/jobs", json={"text": TEXTO}).json()["id"]
+            deadline = time.monotonic() + 5
+            while client.get(f"/api/v1/extract/jobs/{job_id}").json()["status"] != STATUS_DONE:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            response = client.get(f"/api/v1/extract/jobs/{job_id}",
+                                  headers={"Accept": COLUMNAR_JSON})
+        assert response.headers["content-type"].startswith(COLUMNAR_JSON)
+        data = response.json()
+        assert data["status"] == STATUS_DONE
+        assert data["result"] == extract_columnar(TEXTO)
@@ -0,0 +1,105 @@
+"""
+Tests unitarios para la memoización de validadores.
+"""
+import pytest
+from app.validators.memo import ValidationMemo
+from app.validators.patterns import validate_batch, validate_email, validate_url
+
+
+def _counting(result):
+    """Validador de prueba que cuenta sus llamadas."""
+    def validator(value):
+        validator.calls += 1
+        return result
+    validator.calls = 0
+    return validator
+
+
+class TestValidationMemo:
+    """Tests para la clase ValidationMemo"""
+
+    def test_runs_once_per_value(self):
+        """Test que cada valor distinto se valida una sola vez"""
+        memo = ValidationMemo()
+        validator = _counting(True)
+        memoized = memo.wrap(validator)
+        for _ in range(5):
+            assert memoized("a@b.co") == True
+        memoized("c@d.co")
+        assert validator.calls == 2
+        stats = memo.stats()
+        assert stats["hits"] == 4
+        assert stats["misses"] == 2
+        assert stats["hit_rate"] == pytest.approx(4 / 6)
+
+    def test_caches_false_results(self):
+        """Test que también se cachean los resultados inválidos"""
+        memo = ValidationMemo()
+        validator = _counting(False)
+        memoized = memo.wrap(validator)
+        assert memoized("x") == False
+        assert memoized("x") == False
+        assert validator.calls == 1
+
+    def test_keyed_by_validator(self):
+        """Test que el mismo valor se cachea por separado en cada validador"""
+        memo = ValidationMemo()
+        email = memo.wrap(validate_email)
+        url = memo.wrap(validate_url)
+        assert email("usuario@ejemplo.com") == True
+        assert url("usuario@ejemplo.com") == False
+        assert memo.stats()["size"] == 2
+
+    def test_long_values_not_cached(self):
+        """Test que los valores largos se validan sin cachearse"""
+        memo = ValidationMemo(max_value_length=10)
+        validator = _counting(True)
+        memoized = memo.wrap(validator)
+        memoized("a" * 11)
+        memoized("a" * 11)
+        assert validator.calls == 2
+        assert memo.stats()["size"] == 0
+        assert memo.stats()["skipped"] == 2
+
+    def test_non_string_values(self):
+        """Test que None se valida sin cachearse"""
+        memo = ValidationMemo()
+        memoized = memo.wrap(validate_email)
+        assert memoized(None) == False
+        assert memo.stats()["skipped"] == 1
+
+    def test_bounded_size(self):
+        """Test que la caché no supera su tamaño máximo"""
+        memo = ValidationMemo(maxsize=3)
+        memoized = memo.wrap(validate_email)
+        for n in range(10):
+            memoized(f"u{n}@ejemplo.com")
+        assert memo.stats()["size"] == 3
+
+    def test_wraps_metadata(self):
+        """Test que conserva el nombre del validador"""
+        memoized = ValidationMemo().wrap(validate_email)
+        assert memoized.__name__ == "validate_email"
+        assert memoized.__wrapped__ is validate_email
+
+    def test_clear(self):
+        """Test vaciar la caché"""
+        memo = ValidationMemo()
+        memo.wrap(validate_email)("a@b.co")
+        memo.clear()
+        assert memo.stats()["size"] == 0
+        assert memo.stats()["misses"] == 0
+
+
+class TestValidateBatchMemo:
+    """Tests de validate_batch con caché compartida"""
+
+    def test_memo_shared_between_batches(self):
+        """Test que un segundo lote reutiliza los resultados del primero"""
+        memo = ValidationMemo()
+        records = [{"email": "a@b.co", "phone": "123"}, {"email": "a@b.co"}]
+        first = validate_batch(records, memo=memo)
+        second = validate_batch(records, memo=memo)
+        assert first == second == validate_batch(records)
+        assert memo.stats()["hits"] == 2
+        assert memo.stats()["misses"] == 2
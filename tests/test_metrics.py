@@ -0,0 +1,186 @@
+"""
+Tests unitarios para las métricas de validadores y extractores.
+"""
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import app
+from app.metrics import CONTENT_TYPE, Metrics, instrumented, metrics
+from app.services.extractor import extract_all
+from app.validators.patterns import find_patterns, validate_email
+
+
+@pytest.fixture
+def enabled_metrics():
+    """Activa las métricas del proceso durante el test y las restaura."""
+    previous = metrics.enabled
+    metrics.reset()
+    metrics.enabled = True
+    yield metrics
+    metrics.enabled = previous
+    metrics.reset()
+
+
+class TestMetrics:
+    """Tests para la clase Metrics"""
+
+    def test_observe_buckets(self):
+        """Test que cada llamada cae en el intervalo correspondiente"""
+        registry = Metrics(enabled=True)
+        registry.observe("validate_email", 0.000003, 10, 1)
+        registry.observe("validate_email", 0.2, 5000, 0)
+        series = registry.snapshot()["validate_email"]
+        calls, seconds, matches, durations, lengths = series
+        assert calls == 2
+        assert matches == 1
+        assert seconds == pytest.approx(0.200003)
+        assert sum(durations) == 2
+        assert sum(lengths) == 2
+
+    def test_render_format(self):
+        """Test que la exposición sigue el formato de texto de Prometheus"""
+        registry = Metrics(enabled=True)
+        registry.observe("validate_email", 0.000003, 10, 1)
+        registry.observe("validate_email", 0.2, 5000, 0)
+        text = registry.render()
+        assert "# TYPE patrones_call_duration_seconds histogram" in text
+        assert "# TYPE patrones_matches_total counter" in text
+        assert 'patrones_call_duration_seconds_bucket{function="validate_email",le="2.5e-06"} 0' in text
+        assert 'patrones_call_duration_seconds_bucket{function="validate_email",le="5e-06"} 1' in text
+        assert 'patrones_call_duration_seconds_bucket{function="validate_email",le="+Inf"} 2' in text
+        assert 'patrones_call_duration_seconds_count{function="validate_email"} 2' in text
+        assert 'patrones_input_length_chars_bucket{function="validate_email",le="16"} 1' in text
+        assert 'patrones_input_length_chars_bucket{function="validate_email",le="4096"} 1' in text
+        assert 'patrones_input_length_chars_bucket{function="validate_email",le="16384"} 2' in text
+        assert 'patrones_matches_total{function="validate_email"} 1' in text
+        assert text.endswith("\n")
+
+    def test_threads_are_summed(self):
+        """Test que las llamadas de varios hilos se suman al exportar"""
+        registry = Metrics(enabled=True)
+
+        def work():
+            for _ in range(1000):
+                registry.observe("find_patterns", 0.00001, 100, 2)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        series = registry.snapshot()["find_patterns"]
+        assert series[0] == 4000
+        assert series[2] == 8000
+
+    def test_finished_threads_are_retired(self):
+        """Test que los fragmentos de los hilos terminados se suman y se descartan"""
+        registry = Metrics(enabled=True)
+        registry.observe("find_patterns", 0.00001, 100, 2)
+
+        def work():
+            registry.observe("find_patterns", 0.00001, 100, 2)
+            registry.observe("validate_url", 0.00001, 20, 1)
+
+        for _ in range(20):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        assert len(registry._shards) == 1
+        snapshot = registry.snapshot()
+        assert snapshot["find_patterns"][0] == 21
+        assert snapshot["find_patterns"][2] == 42
+        assert snapshot["validate_url"][0] == 20
+        registry.reset()
+        assert registry.snapshot() == {}
+
+    def test_reset(self):
+        """Test que reset pone los contadores a cero"""
+        registry = Metrics(enabled=True)
+        registry.observe("validate_url", 0.00001, 20, 1)
+        registry.reset()
+        assert registry.snapshot() == {}
+
+
+class TestInstrumented:
+    """Tests para el decorador instrumented"""
+
+    def test_disabled_records_nothing(self):
+        """Test que con las métricas desactivadas no se registra nada"""
+        previous = metrics.enabled
+        metrics.enabled = False
+        metrics.reset()
+        try:
+            assert validate_email("usuario@example.com") == True
+            assert metrics.snapshot() == {}
+        finally:
+            metrics.enabled = previous
+
+    def test_disabled_setting_binds_function(self, monkeypatch):
+        """Test que con las métricas desactivadas en la configuración no hay envoltorio"""
+        monkeypatch.setattr("app.metrics.get_settings", lambda: Settings(metrics_enabled=False))
+
+        def doble(value):
+            return value * 2
+
+        assert instrumented("doble")(doble) is doble
+
+    def test_reset_keeps_recording(self, enabled_metrics):
+        """Test que tras reset los hilos siguen registrando en sus series"""
+        validate_email("usuario@example.com")
+        enabled_metrics.reset()
+        assert enabled_metrics.snapshot() == {}
+        validate_email("usuario@example.com")
+        assert enabled_metrics.snapshot()["validate_email"][0] == 1
+
+    def test_length_buckets(self):
+        """Test que cada longitud cae en el intervalo correcto, incluidos los límites"""
+        registry = Metrics(enabled=True)
+        for length in (0, 8, 9, 1024, 1025, 4096, 4097, 10 ** 9):
+            registry.observe("f", 0.00001, length, 0)
+        lengths = registry.snapshot()["f"][4]
+        assert lengths == [2, 1, 0, 0, 0, 0, 0, 1, 2, 1, 0, 0, 0, 0, 0, 1]
+
+    def test_validator_calls(self, enabled_metrics):
+        """Test que los validadores registran llamadas y aceptados"""
+        validate_email("usuario@example.com")
+        validate_email("no-es-un-email")
+        series = enabled_metrics.snapshot()["validate_email"]
+        assert series[0] == 2
+        assert series[2] == 1
+
+    def test_extractor_matches(self, enabled_metrics):
+        """Test que los extractores registran el número de coincidencias"""
+        extract_all("Escriba a ana@example.com o llame al +57 3001234567")
+        find_patterns("a1 b2 c3", r"[a-z][0-9]")
+        snapshot = enabled_metrics.snapshot()
+        assert snapshot["extract_all"][2] == 2
+        assert snapshot["find_patterns"][2] == 3
+
+    def test_preserves_metadata(self):
+        """Test que el decorador conserva el nombre de la función"""
+        @instrumented("doble")
+        def doble(value):
+            """Documentación"""
+            return value * 2
+
+        assert doble.__name__ == "doble"
+        assert doble.__doc__ == "Documentación"
+        assert validate_email.__name__ == "validate_email"
+
+
+class TestMetricsEndpoint:
+    """Tests para el endpoint /metrics"""
+
+    def test_metrics_endpoint(self):
+        """Test que /metrics expone las llamadas hechas a la API"""
+        with TestClient(app) as client:
+            metrics.reset()
+            response = client.post("/api/v1/extract", json={"text": "correo a@b.co"})
+            assert response.status_code == 200
+            response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == CONTENT_TYPE
+        assert 'patrones_call_duration_seconds_count{function="extract_all"}' in response.text
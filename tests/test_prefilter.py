@@ -0,0 +1,236 @@
+"""
+Tests unitarios para el prefiltrado por literales obligatorios.
+"""
+import random
+import re
+import time
+
+import pytest
+
+from app.services.extractor import (
+    ENTITY_PATTERNS,
+    ENTITY_SCANNER,
+    SCANNER,
+    EntityScanner,
+    build_scanner_pattern,
+)
+from app.validators.patterns import PATTERN_EMAIL_BUSQUEDA, find_patterns
+from app.validators.prefilter import DENSE_HITS, build_prefilter, prefilter_for
+
+
+def _spans(matches):
+    """Tipo y posición de cada coincidencia."""
+    return [(match.lastgroup, match.span()) for match in matches]
+
+
+def _random_text(seed, items=3000):
+    """Texto aleatorio con entidades, fragmentos parecidos y ruido."""
+    words = ["ana@example.com", '"a@b"@x.co', "+573001234567", "12/03/1990", "28001",
+             "12345678A", "https://github.com/u/r?tab=1", "http://a.co:80/x", "a.a.a.a",
+             "x/y", "@", "+", "://", "ñandú", "ABC12", "2024", "-", ".", ""]
+    rng = random.Random(seed)
+    return "".join(rng.choice(words) + rng.choice(" ,;\n\"") for _ in range(items))
+
+
+class TestBuildPrefilter:
+    """Tests para la derivación de los literales"""
+
+    @pytest.mark.parametrize("kind, literals", [
+        ("url", ["://"]),
+        ("email", ["@", '"']),
+        ("phone", ["+"]),
+        ("date", ["/"]),
+    ])
+    def test_entity_literals(self, kind, literals):
+        """Test que cada patrón de entidad tiene su literal obligatorio"""
+        pattern = dict(ENTITY_PATTERNS)[kind]
+        prefilter = build_prefilter(re.compile(pattern))
+        assert prefilter is not None
+        assert prefilter.literals == literals
+
+    @pytest.mark.parametrize("kind", ["dni", "postal_code"])
+    def test_patterns_without_literal(self, kind):
+        """Test que los patrones sin literal no se prefiltran"""
+        assert build_prefilter(re.compile(dict(ENTITY_PATTERNS)[kind])) is None
+
+    def test_ignorecase_not_prefiltered(self):
+        """Test que los patrones con IGNORECASE no se prefiltran"""
+        assert build_prefilter(re.compile(r"[a-z]+@[a-z]+", re.IGNORECASE)) is None
+
+    def test_longest_literal(self):
+        """Test que se elige el literal más largo"""
+        prefilter = build_prefilter(re.compile(r"[0-9]+-x[a-z]+=abc[0-9]"))
+        assert prefilter.literals == ["=abc"]
+
+    def test_bytes_pattern(self):
+        """Test que un patrón en bytes produce literales en bytes"""
+        prefilter = build_prefilter(re.compile(rb"[a-z]+@[a-z]+"))
+        assert prefilter.literals == [b"@"]
+
+    def test_cached(self):
+        """Test que el prefiltro se guarda por patrón compilado"""
+        pattern = re.compile(r"[a-z]+@[a-z]+")
+        assert prefilter_for(pattern) is prefilter_for(pattern)
+
+
+class TestPrefilterFinditer:
+    """Tests de equivalencia con re.finditer"""
+
+    @pytest.mark.parametrize("pattern", [
+        r"[a-z]+@[a-z]+\.[a-z]{2,}",
+        r"[0-9]{2}/[0-9]{2}",
+        r"\+[0-9]{8,15}",
+        r"(?:ab|c)d+x",
+        r"a.{0,3}b@",
+        r"([a-z]+)=([0-9]+)?;",
+        r'"[^"]*"|[a-z]+@x',
+    ] + [pattern for kind, pattern in ENTITY_PATTERNS if kind not in ("dni", "postal_code")])
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_same_matches(self, pattern, seed):
+        """Test que las coincidencias son idénticas a las de re.finditer"""
+        compiled = re.compile(pattern)
+        prefilter = build_prefilter(compiled)
+        text = _random_text(seed, items=500)
+        expected = [match.span() for match in compiled.finditer(text)]
+        assert [match.span() for match in prefilter.finditer(text)] == expected
+
+    def test_dense_then_sparse(self):
+        """Test que tras un tramo denso se vuelve a los prefiltros sin perder entidades"""
+        text = (_random_text(7, 400) + "palabra " * 3000 + "ana@example.com "
+                + "a-a." * 2000 + _random_text(8, 400) + "http://a.co/x")
+        assert _spans(ENTITY_SCANNER.finditer(text)) == _spans(SCANNER.finditer(text))
+
+    def test_pos_endpos(self):
+        """Test que se respetan pos y endpos"""
+        compiled = re.compile(r"[a-z]+@[a-z]+")
+        prefilter = build_prefilter(compiled)
+        text = "ab@cd xy@zw mn@op"
+        for pos, endpos in [(0, 17), (1, 10), (4, 17), (6, 8), (12, 100)]:
+            expected = [match.span() for match in compiled.finditer(text, pos, endpos)]
+            assert [match.span() for match in prefilter.finditer(text, pos, endpos)] == expected
+
+    def test_search(self):
+        """Test que search equivale a re.search"""
+        compiled = re.compile(r"[0-9]+/[0-9]+")
+        prefilter = build_prefilter(compiled)
+        assert prefilter.search("fecha 12/03").span() == compiled.search("fecha 12/03").span()
+        assert prefilter.search("sin fecha") is None
+
+    def test_search_until_with_cache(self):
+        """Test que las búsquedas sucesivas con caché dan las mismas coincidencias"""
+        compiled = re.compile(build_scanner_pattern((("email", PATTERN_EMAIL_BUSQUEDA),)))
+        prefilter = build_prefilter(compiled)
+        text = _random_text(7, items=800)
+        cache = prefilter.hit_cache()
+        found = []
+        pos = 0
+        while True:
+            match, _ = prefilter.search_until(text, pos, len(text), cache=cache)
+            if match is None:
+                break
+            found.append(match.span())
+            pos = max(match.end(), match.start() + 1)
+        assert found == [match.span() for match in compiled.finditer(text)]
+
+    def test_dense_fallback(self):
+        """Test que un literal muy frecuente da el mismo resultado"""
+        compiled = re.compile(r"[a-z]+@[a-z]+")
+        prefilter = build_prefilter(compiled)
+        text = "a@b @ " * (DENSE_HITS * 4)
+        expected = [match.span() for match in compiled.finditer(text)]
+        assert [match.span() for match in prefilter.finditer(text)] == expected
+
+    def test_dense_then_sparse(self):
+        """Test que tras un tramo denso se vuelve a buscar el literal"""
+        compiled = re.compile(r"[a-z]+@[a-z]+")
+        prefilter = build_prefilter(compiled)
+        text = ("a@b " * (DENSE_HITS * 4) + "x " * 20000 + "c@d ") * 3
+        expected = [match.span() for match in compiled.finditer(text)]
+        assert [match.span() for match in prefilter.finditer(text)] == expected
+
+
+class TestEntityScanner:
+    """Tests de equivalencia del escáner con prefiltro"""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3, 4])
+    def test_random_text(self, seed):
+        """Test que las entidades son idénticas a las del escáner combinado"""
+        text = _random_text(seed)
+        assert _spans(ENTITY_SCANNER.finditer(text)) == _spans(SCANNER.finditer(text))
+
+    def test_sparse_text(self):
+        """Test con pocas entidades en mucho texto"""
+        text = ("palabra " * 2000 + "ana@example.com 28001 ") * 5
+        assert _spans(ENTITY_SCANNER.finditer(text)) == _spans(SCANNER.finditer(text))
+
+    def test_dotted_run(self):
+        """Test con una secuencia larga de puntos y letras sin arroba"""
+        text = "a." * 3000 + " x@y.co"
+        assert _spans(ENTITY_SCANNER.finditer(text)) == _spans(SCANNER.finditer(text))
+
+    def test_dense_then_sparse(self):
+        """Test que tras un tramo denso se vuelve a los prefiltros sin perder entidades"""
+        text = (_random_text(7, 400) + "palabra " * 3000 + "ana@example.com "
+                + "a-a." * 2000 + _random_text(8, 400) + "http://a.co/x")
+        assert _spans(ENTITY_SCANNER.finditer(text)) == _spans(SCANNER.finditer(text))
+
+    def test_pos_endpos(self):
+        """Test que se respetan pos y endpos"""
+        text = _random_text(5)
+        for pos, endpos in [(0, len(text)), (7, 9000), (150, 151), (200, len(text) + 10)]:
+            assert _spans(ENTITY_SCANNER.finditer(text, pos, endpos)) == \
+                _spans(SCANNER.finditer(text, pos, endpos))
+
+    def test_short_text(self):
+        """Test que un texto corto se recorre con el escáner combinado"""
+        text = "escribe a a@b.co o llama al +573001234567"
+        assert _spans(ENTITY_SCANNER.finditer(text)) == _spans(SCANNER.finditer(text))
+
+    def test_bytes(self):
+        """Test que la versión en bytes equivale al escáner sobre bytes"""
+        scanner = EntityScanner(as_bytes=True)
+        data = _random_text(6).encode("utf-8")
+        assert _spans(scanner.finditer(data)) == _spans(scanner.scanner.finditer(data))
+
+
+class TestFindPatternsPrefilter:
+    """Tests de find_patterns con patrones prefiltrados"""
+
+    @pytest.mark.parametrize("pattern", [
+        r"[a-z]+@[a-z]+",
+        r"([a-z]+)@[a-z]+",
+        r"([a-z]+)@([a-z]+)?x?",
+        r"(x)?[a-z]*@",
+    ])
+    def test_same_as_findall(self, pattern):
+        """Test que el resultado coincide con re.findall"""
+        text = "ab@cd @x ef@ q@ zz@yyx"
+        result = find_patterns(text, pattern)
+        assert result["matches"] == re.findall(pattern, text)
+        assert result["count"] == len(re.findall(pattern, text))
+
+
+class TestAdversarialScans:
+    """Tests de coste lineal con entradas diseñadas para provocar retroceso"""
+
+    @pytest.mark.parametrize("construir", [
+        lambda n: "12345 " * 40 + "x@" + "a-a." * n + "1",
+        lambda n: "x@" + "a-a." * n + "1",
+        lambda n: "a.b+c-" * n + "://",
+        lambda n: "a://" * n,
+    ])
+    def test_entity_scanner_is_linear(self, construir):
+        """Test que el escáner (con y sin prefiltro) crece linealmente"""
+        def medir(scan, n):
+            text = construir(n)
+            inicio = time.perf_counter()
+            for _ in scan(text):
+                pass
+            return time.perf_counter() - inicio
+
+        for scan in (ENTITY_SCANNER.finditer, SCANNER.finditer):
+            pequena = min(medir(scan, 2500) for _ in range(3))
+            grande = min(medir(scan, 20000) for _ in range(2))
+            # 8 veces más texto: lineal ~8x, cuadrático ~64x
+            assert grande < 20 * pequena + 0.05
+            assert grande / len(construir(20000)) < 5e-6
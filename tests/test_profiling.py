@@ -0,0 +1,154 @@
+"""
+Tests unitarios para el perfilado bajo demanda de peticiones.
+"""
+import os
+import pstats
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.profiling import (
+    PROFILE_ID_HEADER,
+    ProfilingMiddleware,
+    RequestProfile,
+    active_profile,
+    run_profiled,
+    write_profile,
+)
+from app.validators.patterns import validate_email
+
+
+def _function_names(path):
+    """Nombres de las funciones registradas en un fichero de perfil."""
+    return {name for _, _, name in pstats.Stats(path).stats}
+
+
+TOKEN = "token-de-prueba"
+
+
+def _client(tmp_path, **options):
+    """Cliente de la API envuelta en el middleware de perfilado."""
+    options.setdefault("token", TOKEN)
+    return TestClient(ProfilingMiddleware(app, directory=str(tmp_path), **options))
+
+
+class TestRequestProfile:
+    """Tests para la clase RequestProfile"""
+
+    def test_call_records_stats(self):
+        """Test que las llamadas perfiladas aparecen en las estadísticas"""
+        profile = RequestProfile()
+        assert profile.stats() is None
+        assert profile.call(validate_email, "usuario@example.com") == True
+        profile.call(validate_email, "otro@example.com")
+        names = {name for _, _, name in profile.stats().stats}
+        assert "validate_email" in names
+
+    def test_concurrent_calls_are_serialized(self):
+        """Test que los perfiles de varios hilos no se activan a la vez"""
+        profile = RequestProfile()
+        state = {"active": 0, "max": 0}
+        lock = threading.Lock()
+
+        def work():
+            with lock:
+                state["active"] += 1
+                state["max"] = max(state["max"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+
+        threads = [threading.Thread(target=profile.call, args=(work,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert state["max"] == 1
+        assert len(profile._profiles) == 4
+
+    def test_nested_call(self):
+        """Test que una llamada perfilada dentro de otra no activa otro perfilador"""
+        profile = RequestProfile()
+        assert profile.call(profile.call, validate_email, "usuario@example.com") == True
+        assert len(profile._profiles) == 1
+
+    def test_run_profiled_without_profile(self):
+        """Test que fuera de una petición perfilada se llama directamente"""
+        assert active_profile() is None
+        assert run_profiled(validate_email, "usuario@example.com") == True
+
+    def test_write_profile_retention(self, tmp_path):
+        """Test que solo se conservan los perfiles más recientes"""
+        profile = RequestProfile()
+        profile.call(validate_email, "usuario@example.com")
+        stats = profile.stats()
+        for index in range(5):
+            write_profile(stats, str(tmp_path), f"{index:03d}.prof", retention=3)
+        assert sorted(os.listdir(tmp_path)) == ["002.prof", "003.prof", "004.prof"]
+
+
+class TestProfilingMiddleware:
+    """Tests para el middleware ProfilingMiddleware"""
+
+    def test_header_profiles_request(self, tmp_path):
+        """Test que la cabecera X-Profile genera un perfil de la extracción"""
+        with _client(tmp_path) as client:
+            response = client.post("/api/v1/extract", headers={"X-Profile": TOKEN},
+                                   json={"text": "correo a@b.co"})
+        assert response.status_code == 200
+        name = response.headers[PROFILE_ID_HEADER]
+        path = tmp_path / name
+        assert path.exists()
+        names = _function_names(str(path))
+        assert "extract_all" in names
+        assert "iter_entities" in names
+
+    def test_batch_validation_profile(self, tmp_path):
+        """Test que el perfil incluye la validación por columnas con regex"""
+        records = [{"email": "a@b.co", "phone": "+573001234567"}]
+        with _client(tmp_path) as client:
+            response = client.post("/api/v1/validate/batch", headers={"X-Profile": TOKEN},
+                                   json={"records": records})
+        assert response.status_code == 200
+        names = _function_names(str(tmp_path / response.headers[PROFILE_ID_HEADER]))
+        assert "validate_batch" in names
+        assert "_match_column" in names
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test que sin cabecera ni muestreo no se perfila"""
+        with _client(tmp_path) as client:
+            response = client.post("/api/v1/extract", json={"text": "correo a@b.co"})
+            rejected = client.post("/api/v1/extract", headers={"X-Profile": "1"},
+                                   json={"text": "correo a@b.co"})
+        assert PROFILE_ID_HEADER not in response.headers
+        assert PROFILE_ID_HEADER not in rejected.headers
+        assert os.listdir(tmp_path) == []
+
+    def test_header_requires_token(self, tmp_path):
+        """Test que sin token configurado la cabecera se ignora"""
+        with _client(tmp_path, token="") as client:
+            for value in ("1", "true", ""):
+                response = client.post("/api/v1/extract", headers={"X-Profile": value},
+                                       json={"text": "correo a@b.co"})
+                assert PROFILE_ID_HEADER not in response.headers
+        assert os.listdir(tmp_path) == []
+
+    def test_sample_rate(self, tmp_path):
+        """Test que con muestreo total se perfilan todas las peticiones"""
+        with _client(tmp_path, sample_rate=1.0, retention=2) as client:
+            for _ in range(3):
+                response = client.post("/api/v1/extract", json={"text": "correo a@b.co"})
+                assert PROFILE_ID_HEADER in response.headers
+        assert len(os.listdir(tmp_path)) == 2
+
+    def test_stream_profile(self, tmp_path):
+        """Test que se perfila el escaneo por bloques"""
+        with _client(tmp_path) as client:
+            response = client.post("/api/v1/extract/stream", headers={"X-Profile": TOKEN},
+                                   content=b"correo a@b.co")
+        assert response.status_code == 200
+        names = _function_names(str(tmp_path / response.headers[PROFILE_ID_HEADER]))
+        assert "_scan" in names
@@ -0,0 +1,109 @@
+"""
+Tests unitarios para el registro de patrones precompilados.
+"""
+import pytest
+from app.validators.registry import PatternRegistry
+from app.validators.patterns import (
+    registry,
+    validate_phone,
+    validate_url,
+    PATTERN_PHONE,
+)
+
+
+class TestPatternRegistry:
+    """Tests para la clase PatternRegistry"""
+
+    def test_register_and_fullmatch(self):
+        """Test registro y fullmatch por nombre"""
+        reg = PatternRegistry()
+        reg.register("digits", r"[0-9]+")
+        assert reg.fullmatch("digits", "123")
+        assert not reg.fullmatch("digits", "123a")
+
+    def test_fullmatch_returns_bool(self):
+        """Test que fullmatch retorna un booleano con re y admite pos y endpos"""
+        reg = PatternRegistry()
+        entry = reg.register("digits", r"[0-9]+")
+        assert reg.fullmatch("digits", "123") is True
+        assert reg.fullmatch("digits", "12a") is False
+        assert entry.fullmatch("a123b", 1, 4) is True
+        assert entry.fullmatch("a123b", 1) is False
+
+    def test_search_and_finditer(self):
+        """Test search y finditer precompilados"""
+        reg = PatternRegistry()
+        entry = reg.register("digits", r"[0-9]+")
+        assert entry.search("abc42").group() == "42"
+        assert [m.group() for m in entry.finditer("1 a 22")] == ["1", "22"]
+
+    def test_eager_compilation(self):
+        """Test que por defecto compila al registrar"""
+        reg = PatternRegistry()
+        assert reg.register("digits", r"[0-9]+").is_compiled
+
+    def test_lazy_compilation(self):
+        """Test que en modo diferido compila en el primer uso"""
+        reg = PatternRegistry(lazy=True)
+        entry = reg.register("digits", r"[0-9]+")
+        assert not entry.is_compiled
+        assert entry.fullmatch("7")
+        assert entry.is_compiled
+
+    def test_compile_all(self):
+        """Test que compile_all compila los patrones diferidos"""
+        reg = PatternRegistry(lazy=True)
+        reg.register("a", r"a")
+        reg.register("b", r"b")
+        reg.compile_all()
+        assert all(reg[name].is_compiled for name in reg)
+
+    def test_call_counters(self):
+        """Test contadores de llamadas por patrón y método"""
+        reg = PatternRegistry(count_calls=True)
+        reg.register("digits", r"[0-9]+")
+        reg.fullmatch("digits", "1")
+        reg.fullmatch("digits", "2")
+        reg.search("digits", "x3")
+        counts = reg.call_counts()["digits"]
+        assert counts["fullmatch"] == 2
+        assert counts["search"] == 1
+        reg.reset_counts()
+        assert reg.call_counts()["digits"]["fullmatch"] == 0
+
+    def test_toggle_call_counting(self):
+        """Test activar y desactivar contadores"""
+        reg = PatternRegistry()
+        reg.register("digits", r"[0-9]+")
+        reg.fullmatch("digits", "1")
+        assert reg.call_counts()["digits"]["fullmatch"] == 0
+        reg.set_call_counting(True)
+        reg.fullmatch("digits", "1")
+        assert reg.call_counts()["digits"]["fullmatch"] == 1
+        reg.set_call_counting(False)
+        reg.fullmatch("digits", "1")
+        assert reg.call_counts()["digits"]["fullmatch"] == 1
+
+    def test_unknown_name(self):
+        """Test nombre no registrado"""
+        with pytest.raises(KeyError):
+            PatternRegistry()["missing"]
+
+
+class TestModuleRegistry:
+    """Tests para el registro usado por los validadores"""
+
+    def test_all_patterns_registered(self):
+        """Test que todos los PATTERN_* están registrados"""
+        assert set(registry) >= {"email", "phone", "date", "dni", "postal_code", "url"}
+        assert registry["phone"].pattern == PATTERN_PHONE
+
+    def test_fullmatch_rejects_trailing_newline(self):
+        """Test que fullmatch no acepta un salto de línea final"""
+        assert validate_phone("+1234567890") == True
+        assert validate_phone("+1234567890\n") == False
+
+    def test_url_requires_full_match(self):
+        """Test que la URL debe coincidir completa"""
+        assert validate_url("https://example.com") == True
+        assert validate_url("https://example.com otra cosa") == False
@@ -0,0 +1,154 @@
+"""
+Tests unitarios para el servidor con workers preforkados.
+"""
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+from app import serve
+from app.serve import available_cores, bind_socket, resolve_http, resolve_loop
+
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requiere fork")
+
+
+def _missing(name):
+    """find_spec que da por no instalado el paquete `name`."""
+    find_spec = serve.importlib.util.find_spec
+    return lambda module: None if module == name else find_spec(module)
+
+
+class TestOptions:
+    """Tests para la elección de workers, bucle y protocolo"""
+
+    def test_available_cores(self):
+        """Test que hay al menos un núcleo disponible"""
+        assert available_cores() >= 1
+
+    def test_auto_without_packages(self, monkeypatch):
+        """Test que "auto" usa asyncio y h11 sin uvloop ni httptools"""
+        monkeypatch.setattr(serve.importlib.util, "find_spec", _missing("uvloop"))
+        assert resolve_loop("auto") == "asyncio"
+        monkeypatch.setattr(serve.importlib.util, "find_spec", _missing("httptools"))
+        assert resolve_http("auto") == "h11"
+
+    def test_explicit_missing_package(self, monkeypatch):
+        """Test que pedir uvloop sin instalarlo es un error"""
+        monkeypatch.setattr(serve.importlib.util, "find_spec", _missing("uvloop"))
+        with pytest.raises(ValueError):
+            resolve_loop("uvloop")
+
+    def test_unknown_values(self):
+        """Test que se rechazan bucles y protocolos desconocidos"""
+        with pytest.raises(ValueError):
+            resolve_loop("tokio")
+        with pytest.raises(ValueError):
+            resolve_http("h3")
+        assert resolve_http("h11") == "h11"
+
+    def test_bind_socket(self):
+        """Test que el socket queda escuchando y es heredable"""
+        sock = bind_socket("127.0.0.1", 0)
+        try:
+            assert sock.getsockname()[1] > 0
+            assert sock.get_inheritable()
+        finally:
+            sock.close()
+
+
+class TestRespawn:
+    """Tests de la sustitución de workers con espera creciente"""
+
+    def _server(self, monkeypatch, ready_after=None):
+        """Maestro cuyos workers fallan al arrancar salvo a partir del intento ready_after."""
+        server = serve.PreforkServer(None, None, 1, backoff=0.01, max_startup_failures=3)
+        attempts = []
+        pauses = []
+        spawn = server.spawn
+
+        def counting_spawn():
+            attempts.append(len(attempts) + 1)
+            return spawn()
+
+        def run_worker(ready_fd):
+            # Se ejecuta en el hijo, con la lista tal como estaba al hacer fork
+            if ready_after is not None and len(attempts) >= ready_after:
+                os.write(ready_fd, b"1")
+                return
+            raise RuntimeError("arranque fallido")
+
+        monkeypatch.setattr(server, "spawn", counting_spawn)
+        monkeypatch.setattr(server, "_run_worker", run_worker)
+        monkeypatch.setattr(server, "_pause", pauses.append)
+        monkeypatch.setattr(serve.logger, "disabled", True)
+        return server, attempts, pauses
+
+    def test_gives_up_after_consecutive_failures(self, monkeypatch):
+        """Test que tras max_startup_failures fallos seguidos se rinde con espera creciente"""
+        server, attempts, pauses = self._server(monkeypatch)
+        assert server.respawn() == False
+        assert len(attempts) == 3
+        assert pauses == [0.01, 0.02]
+        assert server.children == {}
+
+    def test_success_resets_failures(self, monkeypatch):
+        """Test que un arranque correcto pone a cero los fallos seguidos"""
+        server, attempts, pauses = self._server(monkeypatch, ready_after=3)
+        assert server.respawn() == True
+        assert len(attempts) == 3
+        assert pauses == [0.01, 0.02]
+        assert server.startup_failures == 0
+        server._wait_exit(list(server.children), 10)
+        assert server.children == {}
+
+
+class TestPreforkServer:
+    """Tests del maestro con workers reales"""
+
+    def _start(self):
+        env = dict(os.environ, PATRONES_DATABASE_URL="sqlite://", PATRONES_DEDUP_CAPACITY="1000")
+        process = subprocess.Popen(
+            [sys.executable, "-m", "app.serve", "--port", "0", "--workers", "2"],
+            stderr=subprocess.PIPE, text=True, env=env,
+        )
+        port = None
+        for line in process.stderr:
+            match = re.search(r"Sirviendo en http://127\.0\.0\.1:(\d+)", line)
+            if match:
+                port = int(match.group(1))
+            if "Maestro" in line:
+                break
+        return process, port
+
+    def _wait_line(self, process, text, timeout=60.0):
+        deadline = time.monotonic() + timeout
+        for line in process.stderr:
+            if text in line:
+                return True
+            if time.monotonic() > deadline:
+                break
+        return False
+
+    def test_serves_restarts_and_stops(self):
+        """Test que los workers atienden, se reinician con SIGHUP y paran con SIGTERM"""
+        process, port = self._start()
+        try:
+            assert port is not None
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health/ready") as response:
+                assert response.status == 200
+            process.send_signal(signal.SIGHUP)
+            assert self._wait_line(process, "Reinicio escalonado completado: 2 workers")
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health/live") as response:
+                assert response.status == 200
+            process.send_signal(signal.SIGTERM)
+            assert process.wait(timeout=30) == 0
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
@@ -0,0 +1,109 @@
+"""
+Tests unitarios para el arranque medido y el precalentamiento.
+"""
+from dataclasses import replace
+
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.main import app, create_app
+from app.startup import StartupReport, import_times, warm_patterns, warm_up
+
+
+class TestStartupReport:
+    """Tests para el informe de arranque"""
+
+    def test_phases(self):
+        """Test que cada fase queda registrada en orden con su duración"""
+        report = StartupReport()
+        with report.phase("a"):
+            pass
+        with report.phase("b"):
+            pass
+        data = report.to_dict()
+        assert list(data["phases_ms"]) == ["a", "b"]
+        assert data["ready"] is False
+        assert data["total_ms"] >= 0
+
+    def test_phase_recorded_on_error(self):
+        """Test que la fase se registra aunque el bloque falle"""
+        report = StartupReport()
+        try:
+            with report.phase("falla"):
+                raise ValueError
+        except ValueError:
+            pass
+        assert [name for name, _ in report.phases] == ["falla"]
+
+
+class TestWarmUp:
+    """Tests para el precalentamiento"""
+
+    def test_disabled(self):
+        """Test que sin precalentamiento no se ejecuta ninguna fase"""
+        report = StartupReport()
+        warm_up(report, replace(get_settings(), warmup_enabled=False))
+        assert report.phases == []
+
+    def test_enabled(self):
+        """Test que el precalentamiento recorre todas sus fases"""
+        report = StartupReport()
+        warm_up(report, replace(get_settings(), warmup_enabled=True))
+        assert [name for name, _ in report.phases] == [
+            "compile_patterns", "select_matchers", "validators", "registration_index"]
+
+    def test_patterns_already_warm(self):
+        """Test que tras warm_patterns (maestro de app.serve) solo falta el índice"""
+        report = StartupReport()
+        warm_patterns(report)
+        warm_up(report, replace(get_settings(), warmup_enabled=True))
+        assert [name for name, _ in report.phases] == [
+            "compile_patterns", "select_matchers", "validators", "registration_index"]
+
+
+class TestHealth:
+    """Tests para los endpoints de salud"""
+
+    def test_ready_after_startup(self):
+        """Test que la readiness responde 200 con las fases tras el lifespan"""
+        with TestClient(app) as client:
+            response = client.get("/health/ready")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert {"import", "create_app", "validators", "extraction_executor"} <= set(data["phases_ms"])
+
+    def test_not_ready_without_lifespan(self):
+        """Test que la readiness responde 503 antes del precalentamiento"""
+        client = TestClient(create_app())
+        assert client.get("/health/ready").status_code == 503
+        assert client.get("/health/live").status_code == 200
+
+    def test_create_app_returns_new_app(self):
+        """Test que cada llamada a la fábrica crea una aplicación distinta"""
+        other = create_app()
+        assert other is not app
+        assert other.state.startup is not app.state.startup
+
+
+class TestImportTimes:
+    """Tests para el informe de importación"""
+
+    def test_import_times(self):
+        """Test que el informe incluye el módulo importado"""
+        times = import_times("app.config")
+        names = {name for name, _, _, _ in times}
+        assert "app.config" in names
+        assert any(depth == 0 for _, _, _, depth in times)
+
+    def test_main_import_is_light(self):
+        """Test que importar app.main no carga patrones, perfilado ni base de datos"""
+        names = {name for name, _, _, _ in import_times("app.main")}
+        assert "app.main" in names
+        assert not names & {"app.startup", "app.validators.patterns", "app.profiling", "sqlalchemy"}
+
+    def test_create_app_without_profiling(self):
+        """Test que crear la aplicación no importa el perfilado"""
+        names = {name for name, _, _, _ in import_times("app.main:app")}
+        assert "app.startup" in names
+        assert "app.profiling" not in names
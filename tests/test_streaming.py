@@ -0,0 +1,121 @@
+"""
+Tests unitarios para la extracción por bloques.
+"""
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.extractor import iter_entities
+from app.services.streaming import StreamingExtractor
+
+
+WORDS = [
+    "a@b.co", "+573001234567", "12/05/1990", "630004", "ABC1234",
+    "https://x.org/p?q=1", "hola", "..", "\n", "é", " ", "-", "x",
+]
+
+
+def _feed_in_chunks(extractor, text, rng):
+    """Entrega el texto en bloques de tamaño aleatorio."""
+    found = []
+    index = 0
+    while index < len(text):
+        size = rng.randint(1, 40)
+        found += extractor.feed(text[index:index + size])
+        index += size
+    return found + extractor.finish()
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class TestStreamingExtractor:
+    """Tests para la clase StreamingExtractor"""
+
+    def test_matches_full_scan(self):
+        """Test que el resultado por bloques coincide con el escaneo completo"""
+        rng = random.Random(7)
+        checked = 0
+        for _ in range(500):
+            text = "".join(rng.choice(WORDS) + rng.choice(["", " "])
+                           for _ in range(rng.randint(0, 300)))
+            expected = list(iter_entities(text))
+            # Solo se garantiza el resultado para entidades más cortas que la ventana
+            if any(end - start >= 60 for _, _, start, end in expected):
+                continue
+            extractor = StreamingExtractor(overlap=60, min_scan_chars=rng.choice([0, 5, 50]))
+            assert _feed_in_chunks(extractor, text, rng) == expected
+            checked += 1
+        assert checked > 100
+
+    def test_entity_split_between_chunks(self):
+        """Test entidad partida entre dos bloques"""
+        extractor = StreamingExtractor(overlap=20, min_scan_chars=0)
+        found = extractor.feed("x" * 30 + " usuario@ejem")
+        found += extractor.feed("plo.com fin")
+        found += extractor.finish()
+        assert found == [("email", "usuario@ejemplo.com", 31, 50)]
+
+    def test_boundary_across_chunks(self):
+        """Test que el delimitador inicial considera el bloque anterior"""
+        extractor = StreamingExtractor(overlap=5, min_scan_chars=0)
+        found = extractor.feed("texto ABC")
+        found += extractor.feed("12345 " + " " * 20)
+        found += extractor.feed("x630004 ")
+        found += extractor.finish()
+        assert found == [("dni", "ABC12345", 6, 14)]
+
+    def test_bounded_buffer(self):
+        """Test que la ventana retenida no crece con el documento"""
+        extractor = StreamingExtractor(overlap=100, min_scan_chars=1000)
+        for _ in range(200):
+            extractor.feed("tel +573001234567 correo a@b.co " * 20)
+        assert len(extractor._buffer) < 100 + 1000 + 700
+        assert extractor.count + len(extractor.finish()) == 200 * 40
+
+    def test_counters(self):
+        """Test longitud y conteo acumulados"""
+        extractor = StreamingExtractor()
+        extractor.feed("a@b.co ")
+        extractor.feed("630004")
+        extractor.finish()
+        assert extractor.input_length == 13
+        assert extractor.count == 2
+
+
+class TestExtractStreamEndpoint:
+    """Tests para POST /api/v1/extract/stream"""
+
+    def test_stream_ndjson(self, client):
+        """Test respuesta NDJSON con resumen final"""
+        def body():
+            for _ in range(20):
+                yield "mail a@b.co tel +573001234567 ".encode() * 500
+
+        response = client.post("/api/v1/extract/stream", content=body())
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0] == {"type": "email", "value": "a@b.co", "start": 5, "end": 11}
+        assert lines[-1] == {"status": "ok", "input_length": 300000, "count": 20000}
+        assert len(lines) == 20001
+
+    def test_multibyte_split(self, client):
+        """Test carácter UTF-8 partido entre dos bloques"""
+        encoded = "año 630004".encode("utf-8")
+        response = client.post("/api/v1/extract/stream", content=iter([encoded[:2], encoded[2:]]))
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0] == {"type": "postal_code", "value": "630004", "start": 4, "end": 10}
+        assert lines[-1]["input_length"] == 10
+
+    def test_empty_body(self, client):
+        """Test cuerpo vacío"""
+        response = client.post("/api/v1/extract/stream", content=b"")
+        assert response.status_code == 200
+        assert json.loads(response.text) == {"status": "ok", "input_length": 0, "count": 0}
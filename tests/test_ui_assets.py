@@ -0,0 +1,65 @@
+"""
+Tests unitarios para los recursos estáticos del formulario.
+"""
+import os
+
+from app.ui import assets
+
+
+class TestPageAssets:
+    """Tests para page_assets_html"""
+
+    def test_contains_styles_and_script(self):
+        """Test que incluye la hoja de estilos y el script"""
+        html = assets.page_assets_html()
+        assert html.startswith("<style>")
+        assert "</style>" in html
+        assert "<script>" in html
+        assert "MutationObserver" in html
+
+    def test_single_cacheable_message(self):
+        """Test que supera el tamaño mínimo que Streamlit guarda en el navegador"""
+        assert len(assets.page_assets_html().encode("utf-8")) >= 10_000
+
+    def test_reused_between_reruns(self):
+        """Test que un rerun sin cambios retorna el mismo objeto"""
+        assert assets.page_assets_html() is assets.page_assets_html()
+
+    def test_reloads_on_mtime_change(self, tmp_path):
+        """Test que se vuelve a leer el fichero cuando cambia su fecha"""
+        stylesheet = tmp_path / "estilos.css"
+        stylesheet.write_text("a { color: red; }\n", encoding="utf-8")
+        os.utime(stylesheet, ns=(1_000_000_000, 1_000_000_000))
+        first = assets.page_assets_html(str(stylesheet), str(tmp_path / "no_existe.js"))
+        assert first == "<style>\na { color: red; }\n</style>"
+
+        stylesheet.write_text("a { color: blue; }\n", encoding="utf-8")
+        os.utime(stylesheet, ns=(2_000_000_000, 2_000_000_000))
+        second = assets.page_assets_html(str(stylesheet), str(tmp_path / "no_existe.js"))
+        assert "blue" in second
+
+
+class TestLogo:
+    """Tests para la ubicación y publicación del logo"""
+
+    def test_file_version_missing(self, tmp_path):
+        """Test fichero inexistente"""
+        assert assets.file_version(str(tmp_path / "nada.png")) is None
+
+    def test_find_logo(self):
+        """Test que encuentra el logo en static/images"""
+        path, version = assets.find_logo()
+        assert path.endswith("laborauq_logo.png")
+        assert version == assets.file_version(path)
+
+    def test_versioned_static_url(self):
+        """Test URL estática con la versión en el parámetro v"""
+        _, version = assets.find_logo()
+        src = assets.logo_src(static_serving=True)
+        assert src == f"app/static/images/laborauq_logo.png?v={version}"
+
+    def test_data_uri_fallback(self):
+        """Test URI data: cuando el servicio estático está desactivado"""
+        src = assets.logo_src(static_serving=False)
+        assert src.startswith("data:image/png;base64,")
+        assert src is assets.logo_src(static_serving=False)
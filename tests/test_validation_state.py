@@ -0,0 +1,75 @@
+"""
+Tests unitarios para la validación incremental del formulario.
+"""
+from app.ui.validation_state import STATE_KEY, IncrementalValidator, fingerprint
+from app.validators.memo import ValidationMemo
+from app.validators.patterns import validate_email, validate_url
+
+
+def _counting(validator):
+    """Envuelve un validador contando sus ejecuciones."""
+    def counted(value):
+        counted.calls += 1
+        return validator(value)
+    counted.calls = 0
+    return counted
+
+
+class TestIncrementalValidator:
+    """Tests para la clase IncrementalValidator"""
+
+    def test_revalidates_only_changed_fields(self):
+        """Test que solo se ejecuta el validador cuando cambia el valor"""
+        state = {}
+        email = _counting(validate_email)
+        validator = IncrementalValidator(state)
+        assert validator.validate("email", "a@b.co", email) == True
+        assert validator.validate("email", "a@b.co", email) == True
+        assert email.calls == 1
+        assert validator.validate("email", "a@b", email) == False
+        assert email.calls == 2
+
+    def test_results_persist_between_reruns(self):
+        """Test que los resultados sobreviven a un nuevo rerun (nueva instancia)"""
+        state = {}
+        IncrementalValidator(state).validate("email", "a@b.co", validate_email)
+        rerun = IncrementalValidator(state)
+        url = _counting(validate_url)
+        rerun.validate("url_0", "https://x.org", url)
+        rerun.validate("email", "a@b.co", validate_email)
+        assert rerun.runs == 1
+        assert rerun.result("email") == True
+        assert STATE_KEY in state
+
+    def test_constant_cost_with_many_fields(self):
+        """Test que un rerun sin cambios no ejecuta ningún validador"""
+        state = {}
+        urls = [f"https://ejemplo.com/{n}" for n in range(200)]
+        first = IncrementalValidator(state)
+        for n, url in enumerate(urls):
+            first.validate(f"url_{n}", url, validate_url)
+        assert first.runs == 200
+        rerun = IncrementalValidator(state)
+        for n, url in enumerate(urls):
+            rerun.validate(f"url_{n}", url, validate_url)
+        assert rerun.runs == 0
+
+    def test_validator_change_invalidates(self):
+        """Test que cambiar el validador de un campo lo revalida"""
+        validator = IncrementalValidator({})
+        assert validator.validate("campo", "https://x.org", validate_url) == True
+        assert validator.validate("campo", "https://x.org", validate_email) == False
+        assert validator.runs == 2
+
+    def test_memoized_validator_keeps_fingerprint(self):
+        """Test que un validador memoizado de nuevo en cada rerun conserva la huella"""
+        assert fingerprint("x", ValidationMemo().wrap(validate_email)) == fingerprint("x", validate_email)
+
+    def test_retain(self):
+        """Test que descarta los campos eliminados"""
+        validator = IncrementalValidator({})
+        validator.validate("url_0", "https://a.org", validate_url)
+        validator.validate("url_1", "https://b.org", validate_url)
+        validator.retain(["url_0"])
+        assert len(validator) == 1
+        assert validator.result("url_1") is None
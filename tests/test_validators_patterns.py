@@ -13,7 +13,8 @@ from app.validators.patterns import (
     extract_numbers,
     clean_text,
     find_patterns,
-    validate_all_fields
+    validate_all_fields,
+    validate_batch
 )
 
 
@@ -520,3 +521,100 @@ class TestValidateAllFields:
         assert result["email"]["value"] == "test@example.com"
         assert result["phone"]["value"] == "+1234567890"
 
+
+
+class TestValidateBatch:
+    """Tests para la función validate_batch"""
+    
+    def test_validate_batch_all_valid(self):
+        """Test lote con todos los registros válidos"""
+        records = [
+            {"email": "test@example.com", "phone": "+1234567890"},
+            {"dni": "12345678A", "postal_code": "28001"}
+        ]
+        result = validate_batch(records)
+        
+        assert result["total"] == 2
+        assert result["valid"] == 2
+        assert result["invalid"] == 0
+        assert result["results"] == [{"valid": True}, {"valid": True}]
+    
+    def test_validate_batch_errors_per_record(self):
+        """Test que reporta los campos inválidos de cada registro"""
+        records = [
+            {"email": "invalid-email", "phone": "+1234567890"},
+            {"email": "test@example.com", "phone": "123", "url": "invalid-url"}
+        ]
+        result = validate_batch(records)
+        
+        assert result["invalid"] == 2
+        assert result["results"][0] == {"valid": False, "errors": ["email"]}
+        assert result["results"][1] == {"valid": False, "errors": ["phone", "url"]}
+    
+    def test_validate_batch_field_counts(self):
+        """Test totales agregados por campo"""
+        records = [
+            {"email": "test@example.com"},
+            {"email": "test@example.com"},
+            {"email": "invalid"},
+            {"phone": "+1234567890"}
+        ]
+        result = validate_batch(records)
+        
+        assert result["fields"]["email"] == {"checked": 3, "valid": 2, "invalid": 1}
+        assert result["fields"]["phone"] == {"checked": 1, "valid": 1, "invalid": 0}
+        assert "url" not in result["fields"]
+    
+    def test_validate_batch_none_and_unknown(self):
+        """Test valores None y campos desconocidos"""
+        result = validate_batch([{"email": None, "unknown_field": "value"}])
+        
+        assert result["results"][0] == {"valid": False, "errors": ["email"]}
+        assert "unknown_field" not in result["fields"]
+    
+    def test_validate_batch_matches_single_record(self):
+        """Test que coincide con validate_all_fields registro a registro"""
+        records = [
+            {"email": "test@example.com", "date": "01/01/2024", "dni": "abc"},
+            {"postal_code": "12", "url": "https://example.com"}
+        ]
+        result = validate_batch(records)
+        
+        for record, record_result in zip(records, result["results"]):
+            single = validate_all_fields(record)
+            invalid = [field for field, detail in single.items() if detail["valid"] is False]
+            assert record_result.get("errors", []) == invalid
+    
+    def test_validate_batch_columns_match_validators(self):
+        """Test que la validación por columnas coincide con cada validador"""
+        values = {
+            "email": ["test@example.com", '"a@b"@example.com', '"x".y@example.com',
+                      "a@b.co\n", "", "a" * 250 + "@b.co", "a" * 240 + "@b.co",
+                      '""""""""@', "A@EXAMPLE.COM", "a@b@c.co"],
+            "phone": ["+573001234567", "+12345678", "+57 300", "3001234567\n", ""],
+            "date": ["15/03/1990", "01/01/-500", "1/1/2020", ""],
+            "dni": ["12345678A", "abc123", "A1B2C3D4E5F6G7H8I9", "123"],
+            "postal_code": ["630004", "12", "1234567890"],
+            "url": ["https://example.com/a?b=c", "invalid-url", "ftp://user@host:21", ""],
+        }
+        records = [
+            {field: column[index % len(column)] for field, column in values.items()}
+            for index in range(12)
+        ]
+        result = validate_batch(records)
+        
+        for record, record_result in zip(records, result["results"]):
+            single = validate_all_fields(record)
+            invalid = [field for field, detail in single.items() if not detail["valid"]]
+            assert record_result.get("errors", []) == invalid
+    
+    def test_validate_batch_results_not_shared(self):
+        """Test que cada registro válido tiene su propio resultado"""
+        result = validate_batch([{"phone": "+1234567890"}, {"phone": "+1234567890"}])
+        result["results"][0]["note"] = "revisado"
+        assert result["results"][1] == {"valid": True}
+    
+    def test_validate_batch_empty(self):
+        """Test lote vacío"""
+        result = validate_batch([])
+        assert result == {"total": 0, "valid": 0, "invalid": 0, "fields": {}, "results": []}